@@ -0,0 +1,173 @@
+"""
+ASGI middleware. Written against the raw ASGI interface rather than
+BaseHTTPMiddleware, which adds a task and a memory stream per request.
+"""
+import asyncio
+import hmac
+import random
+import re
+import time
+import uuid
+
+from ..core.logs import request_id
+from ..core.metrics import MetricsRegistry, metrics
+from ..core.profiler import ProfileStore, StackSampler
+
+# Accepted from callers as-is; anything else is replaced with a fresh id
+REQUEST_ID = re.compile(rb"^[\w.:-]{1,128}$")
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. /api/drift/{drift_id}/accept.
+    Routes of an included router may carry only their own path; the
+    include prefix is then the leading part of the request path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    extra = scope["path"].count("/") - template.count("/")
+    if extra > 0:
+        template = "/".join(scope["path"].split("/")[:extra + 1]) + template
+    return template
+
+
+class RequestIdMiddleware:
+    """
+    Gives every request an id — the caller's X-Request-ID when it is a
+    plausible id, a fresh one otherwise — exposed to logging through the
+    request_id context variable and echoed in the X-Request-ID response
+    header. Thread-pool work started by the handler inherits the context.
+    """
+
+    HEADER = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = None
+        for name, value in scope["headers"]:
+            if name == self.HEADER:
+                if REQUEST_ID.match(value):
+                    rid = value
+                break
+        rid = rid or uuid.uuid4().hex.encode()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (self.HEADER, rid)]}
+            await send(message)
+
+        token = request_id.set(rid.decode())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Per-route request latency histogram and status-code counter. Requests
+    are labelled with the matched route template (e.g. /api/drift/{drift_id}/accept),
+    never the raw path, so label cardinality stays bounded. Latency runs to
+    the end of the response body, which includes streamed responses.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.latency = registry.histogram(
+            "karm_http_request_duration_seconds", "HTTP request latency by route.", ["method", "route"]
+        )
+        self.requests = registry.counter(
+            "karm_http_requests_total", "HTTP requests by route and status code.", ["method", "route", "status"]
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500  # an exception before the response started
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_template(scope)
+            method = scope["method"]
+            self.latency.observe(time.perf_counter() - started, method, route)
+            self.requests.inc(method, route, str(status))
+
+
+class ProfilingMiddleware:
+    """
+    CPU-profiles a sample of requests (sample_rate) plus any request whose
+    X-Karm-Profile header carries the admin token, one at a time. The
+    profile id is returned in X-Profile-Id and the collapsed stacks are
+    written to the ProfileStore ring after the response has been sent.
+
+    Samples are of the whole event loop: work for other requests that
+    runs while a profiled request is in flight lands in its profile too.
+    """
+
+    HEADER = b"x-karm-profile"
+
+    def __init__(self, app, sampler: StackSampler, store: ProfileStore, sample_rate: float = 0.0, token: str = ""):
+        self.app = app
+        self.sampler = sampler
+        self.store = store
+        self.sample_rate = sample_rate
+        self.token = token.encode()
+
+    def _requested(self, scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == self.HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested(scope)
+        if not (requested or random.random() < self.sample_rate) or not self.sampler.start():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            stacks = self.sampler.stop()
+            meta = {
+                "method": scope["method"],
+                "route": route_template(scope),
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "trigger": "header" if requested else "sampled",
+                "request_id": request_id.get(),
+                "interval_ms": self.sampler.interval * 1000,
+            }
+            await asyncio.to_thread(self.store.save, profile_id, stacks, meta)
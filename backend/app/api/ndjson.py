@@ -0,0 +1,111 @@
+"""
+Streaming NDJSON request bodies for bulk imports. Lines are parsed and
+validated as they arrive and handed out in fixed-size chunks, so an import
+holds one chunk of records (and at most one partial line) at a time.
+"""
+from typing import AsyncIterator, Dict, Generic, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound=BaseModel)
+
+CHUNK_SIZE = 1000
+MAX_LINE_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportReport:
+    """Counters plus the first MAX_REPORTED_ERRORS per-line errors of one import."""
+
+    def __init__(self):
+        self.received = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def fail(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self) -> Dict:
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors(include_url=False)[0]
+    loc = ".".join(str(part) for part in first["loc"])
+    more = f" (+{error.error_count() - 1} more)" if error.error_count() > 1 else ""
+    return f"{loc}: {first['msg']}{more}" if loc else f"{first['msg']}{more}"
+
+
+class NDJSONReader(Generic[T]):
+    """
+    Validate each non-empty line of `body` as `model`. Invalid lines are
+    recorded on `report` by 1-based line number; valid records come out as
+    (line, record) chunks of up to chunk_size.
+    """
+
+    def __init__(self, model: Type[T], report: ImportReport, chunk_size: int = CHUNK_SIZE):
+        self.model = model
+        self.report = report
+        self.chunk_size = chunk_size
+
+    async def chunks(self, body: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[int, T]]]:
+        chunk: List[Tuple[int, T]] = []
+        pending = bytearray()
+        line_no = 0
+        oversized = False  # dropping the rest of a line that exceeded MAX_LINE_BYTES
+
+        async for data in body:
+            start = 0
+            while True:
+                end = data.find(b"\n", start)
+                if end < 0:
+                    if not oversized:
+                        pending += data[start:]
+                        if len(pending) > MAX_LINE_BYTES:
+                            oversized = True
+                            pending.clear()
+                    break
+                line_no += 1
+                if oversized:
+                    self.report.received += 1
+                    self.report.fail(line_no, f"line longer than {MAX_LINE_BYTES} bytes")
+                    oversized = False
+                elif pending:
+                    pending += data[start:end]
+                    self._parse(line_no, bytes(pending), chunk)
+                    pending.clear()
+                else:
+                    self._parse(line_no, data[start:end], chunk)
+                start = end + 1
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+
+        if oversized:
+            self.report.received += 1
+            self.report.fail(line_no + 1, f"line longer than {MAX_LINE_BYTES} bytes")
+        elif pending:
+            self._parse(line_no + 1, bytes(pending), chunk)
+        if chunk:
+            yield chunk
+
+    def _parse(self, line_no: int, line: bytes, chunk: List[Tuple[int, T]]):
+        if not line.strip():
+            return
+        self.report.received += 1
+        if len(line) > MAX_LINE_BYTES:
+            self.report.fail(line_no, f"line longer than {MAX_LINE_BYTES} bytes")
+            return
+        try:
+            chunk.append((line_no, self.model.model_validate_json(line)))
+        except ValidationError as e:
+            self.report.fail(line_no, _describe(e))
@@ -0,0 +1,115 @@
+"""
+Admin routes — operator diagnostics (request profiles, memory accounting)
+behind X-Admin-Token. The whole router answers 404 unless KARM_ADMIN_TOKEN
+is set.
+"""
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+from typing import Dict, Optional
+
+from . import chat, discovery_slots, events
+from ...core.bandit import drift_bandit
+from ...core.campus_stats import campus_bubble
+from ...core.candidate_pool import candidate_pools
+from ...core.complement_index import complement_index
+from ...core.feature_store import feature_store
+from ...core.memory import DEFAULT_SAMPLE, memory_report, tracemalloc_session
+from ...core.profiler import profile_store
+from ...core.prompt_builder import prompt_builder
+from ...core.sketches import live_metrics
+from ...db.database import db
+
+ADMIN_TOKEN = os.environ.get("KARM_ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """Stored request profiles, newest first (see KARM_PROFILING)."""
+    return {"profiles": profile_store.list()}
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """Collapsed stacks of one profile, for flamegraph.pl or speedscope."""
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+
+def _caches() -> Dict[str, object]:
+    # feature_store before complement_index, which references it
+    return {
+        "response_cache": chat.response_cache,
+        "prompt_builder": prompt_builder,
+        "events_pages": events.pages,
+        "discovery_slots_pages": discovery_slots.pages,
+        "campus_bubble": campus_bubble,
+        "candidate_pools": candidate_pools,
+        "feature_store": feature_store,
+        "complement_index": complement_index,
+        "drift_bandit": drift_bandit,
+        "live_metrics": live_metrics,
+    }
+
+
+@router.get("/memory")
+async def memory(sample: int = Query(DEFAULT_SAMPLE, ge=16, le=100_000, description="Members sized per container before extrapolating")):
+    """
+    Approximate deep size of each db collection and in-process cache. An
+    object shared by two entries is counted under the first (db before
+    caches). Runs on the event loop so collections cannot change mid-walk;
+    a sample near the collection sizes makes it an exact walk that blocks
+    this worker for seconds on a large campus.
+    """
+    return memory_report({"db": db.memory_collections(), "caches": _caches()}, sample)
+
+
+@router.get("/memory/tracemalloc")
+async def tracemalloc_status():
+    return tracemalloc_session.status()
+
+
+@router.post("/memory/tracemalloc/start")
+async def tracemalloc_start(frames: int = Query(1, ge=1, le=50, description="Traceback depth per allocation")):
+    """Start tracing allocations and take the baseline snapshot."""
+    return tracemalloc_session.start(frames)
+
+
+@router.post("/memory/tracemalloc/snapshot")
+async def tracemalloc_snapshot():
+    """Move the baseline to the current state."""
+    try:
+        return tracemalloc_session.snapshot()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/tracemalloc/diff")
+async def tracemalloc_diff(
+    limit: int = Query(25, ge=1, le=500),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$")
+):
+    """Allocation sites that grew most since the baseline."""
+    try:
+        return tracemalloc_session.diff(limit, key_type)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/memory/tracemalloc/stop")
+async def tracemalloc_stop():
+    return tracemalloc_session.stop()
@@ -4,7 +4,10 @@ Bubble routes — campus bubble percentage + unexplored areas.
 from fastapi import APIRouter, HTTPException
 from typing import List
 
+from ..serialization import FastJSONResponse
 from ...core.attractor_mapper import AttractorMapper
+from ...core.campus_stats import campus_bubble
+from ...core.feature_store import feature_store
 from ...models.student import AttractorState
 from ...db.database import db
 
@@ -13,16 +16,22 @@ router = APIRouter(prefix="/bubble", tags=["bubble"])
 mapper = AttractorMapper()
 
 
+@router.get("/campus/stats", response_class=FastJSONResponse)
+async def get_campus_stats():
+    """Campus-wide bubble % distribution: percentiles, histogram, by department and year."""
+    campus_bubble.sync(db)
+    return campus_bubble.stats()
+
+
 @router.get("/{student_id}")
 async def get_bubble(student_id: str):
-    attractor = db.attractors.get(student_id)
+    attractor = db.get_attractor(student_id)
     if not attractor:
         raise HTTPException(404, "Attractor state not found")
 
-    bubble = mapper.compute_bubble_percentage(attractor)
     return {
         "student_id": student_id,
-        "bubble_percentage": bubble,
+        "bubble_percentage": attractor.bubble_percentage,
         "departments_visited": attractor.departments_visited,
         "counters_used": attractor.canteen_counters_used,
         "event_types": attractor.event_types_attended
@@ -31,11 +40,14 @@ async def get_bubble(student_id: str):
 
 @router.get("/{student_id}/unexplored")
 async def get_unexplored(student_id: str):
-    attractor = db.attractors.get(student_id)
+    attractor = db.get_attractor(student_id)
     if not attractor:
         raise HTTPException(404, "Attractor state not found")
 
-    unexplored = mapper.get_unexplored_areas(attractor)
+    student = db.get_student(student_id)
+    feature_store.sync(db)
+    features = feature_store.get(student, attractor) if student else None
+    unexplored = mapper.get_unexplored_areas(attractor, features)
     return {
         "student_id": student_id,
         "unexplored_areas": unexplored
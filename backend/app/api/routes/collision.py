@@ -0,0 +1,103 @@
+"""
+Collision routes — top-k complementary partner search (exact and approximate).
+"""
+import logging
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Tuple
+
+from ...models.drift import CollisionPartner, CollisionScore
+from ...core.collision_engine import CollisionEngine
+from ...core.complement_index import complement_index
+from ...core.feature_store import feature_store
+from ...db.database import db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/collision", tags=["collision"])
+
+engine = CollisionEngine()
+
+
+def _sync_features():
+    """Drop features (and index entries) of students written by any worker since the last call."""
+    changed = feature_store.sync(db)
+    if changed is None:
+        complement_index.clear()
+        return
+    for student_id in changed:
+        student = db.get_student(student_id) if student_id in complement_index else None
+        if student is not None:
+            complement_index.insert(student, db.get_attractor(student_id))
+
+
+def _ensure_fitted():
+    _sync_features()
+    if engine.is_stale(db.count_students()):
+        engine.fit(db.list_students(), db.list_attractors())
+
+
+def _ensure_indexed():
+    _sync_features()
+    if len(complement_index) == db.count_students():
+        return
+    attractors = db.list_attractors()
+    added = 0
+    for student in db.list_students():
+        if student.id not in complement_index:
+            complement_index.insert(student, attractors.get(student.id))
+            added += 1
+    logger.info("collision index caught up", extra={"added": added, "indexed": len(complement_index)})
+
+
+def _to_partners(results: List[Tuple[str, CollisionScore]]) -> List[CollisionPartner]:
+    partners = []
+    for partner_id, score in results:
+        partner = db.get_student(partner_id)
+        partners.append(CollisionPartner(
+            student_id=partner_id,
+            name=partner.name,
+            department=partner.department,
+            score=score
+        ))
+    return partners
+
+
+@router.get("/index/recall")
+async def get_index_recall(
+    k: int = Query(10, ge=1, le=100),
+    sample: int = Query(50, ge=1, le=1000, description="Number of students to query")
+):
+    """Recall@k of the LSH index against the exact batch engine."""
+    _ensure_fitted()
+    _ensure_indexed()
+    sample_ids = engine.student_ids[:sample]
+    return complement_index.recall(
+        sample_ids, k, engine.top_k_partners, db.get_student, db.get_attractor
+    )
+
+
+@router.get("/{student_id}/partners", response_model=List[CollisionPartner])
+async def get_top_partners(
+    student_id: str,
+    k: int = Query(10, ge=1, le=100, description="Number of partners to return")
+):
+    if not db.get_student(student_id):
+        raise HTTPException(404, "Student not found")
+
+    _ensure_fitted()
+    return _to_partners(engine.top_k_partners(student_id, k))
+
+
+@router.get("/{student_id}/partners/approx", response_model=List[CollisionPartner])
+async def get_approx_partners(
+    student_id: str,
+    k: int = Query(10, ge=1, le=100, description="Number of partners to return")
+):
+    student = db.get_student(student_id)
+    if not student:
+        raise HTTPException(404, "Student not found")
+
+    _ensure_indexed()
+    return _to_partners(
+        complement_index.top_k_partners(student, k, db.get_student, db.get_attractor)
+    )
@@ -1,19 +1,38 @@
 """
 Discovery Slots routes — list and create discovery slots.
 """
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from datetime import datetime, timedelta
+from typing import List, Optional
 import uuid
 
+from ..serialization import SerializedCache
 from ...models.event import DiscoverySlot, DiscoverySlotCreate
 from ...db.database import db
 
 router = APIRouter(prefix="/discovery-slots", tags=["discovery-slots"])
 
+# Encoded results keyed by filters, valid while the slot index version is unchanged
+pages = SerializedCache(DiscoverySlot, name="discovery_slots")
+
 
 @router.get("/active", response_model=List[DiscoverySlot])
-async def get_active_slots():
-    return db.discovery_slots
+async def get_active_slots(
+    tag: Optional[List[str]] = Query(None, description="Repeatable; slots must carry every tag"),
+    location: Optional[str] = Query(None, description="Every word must appear in the slot's location"),
+    within: Optional[int] = Query(None, ge=1, description="Only slots with a time in the next N minutes"),
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """Slots with an upcoming time (or no fixed times), soonest first."""
+    now = datetime.utcnow()
+    index = db.slot_index
+    if within:
+        # The window moves with the clock: not cacheable
+        return index.active(now, tag or (), location, now + timedelta(minutes=within), limit)
+
+    index.expire(now)  # expiry bumps the version, so cached pages never include past slots
+    key = (tuple(sorted(tag or ())), location, limit)
+    return pages.respond(key, index.version, lambda: (index.active(now, tag or (), location, None, limit), None))
 
 
 @router.post("/create", response_model=DiscoverySlot)
@@ -28,5 +47,5 @@ async def create_slot(req: DiscoverySlotCreate):
         description=req.description,
         tags=req.tags or []
     )
-    db.discovery_slots.append(slot)
+    db.save_slot(slot)
     return slot
@@ -1,17 +1,28 @@
 """
 Drift routes — generate, accept, skip, log outcome.
 """
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from datetime import date, datetime
+from typing import Dict, List, Optional
+import os
 import uuid
 
+from ..serialization import FastJSONResponse
+from .admin import require_admin
 from ...models.drift import (
     DriftNudge, DriftReasoning, DriftOutcome, DriftOutcomeRequest,
-    CollisionScore, DriftGenerateRequest
+    CollisionScore, DriftGenerateRequest, DriftBatchRequest
 )
 from ...core.nudge_engine import NudgeEngine
 from ...core.collision_scorer import CollisionScorer
 from ...core.fingerprint_builder import FingerprintBuilder
+from ...core.sketches import LiveMetrics, live_metrics
+from ...core.bandit import drift_bandit
+from ...core.candidate_pool import candidate_pools
+from ...core.feature_store import feature_store
+from ...models.fingerprint import SerendipityFingerprint
+from ...jobs.pregenerate_drifts import pregenerate
 from ...db.database import db
 
 router = APIRouter(prefix="/drift", tags=["drift"])
@@ -20,80 +31,160 @@ nudge_engine = NudgeEngine()
 collision_scorer = CollisionScorer()
 fingerprint_builder = FingerprintBuilder()
 
+# Each worker is a spawned process holding a copy of the campus
+MAX_PREGENERATE_WORKERS = os.cpu_count() or 1
+# One state per worker or shard
+MAX_MERGE_STATES = 256
+
+
+def _update_fingerprint(drift: DriftNudge, before=None, fingerprint=None):
+    """Apply a saved drift change to its owner's fingerprint in O(1)."""
+    sid = drift.student_id
+    fingerprint = fingerprint or db.get_fingerprint(sid) or SerendipityFingerprint(student_id=sid)
+    fingerprint = fingerprint_builder.apply(
+        fingerprint, before, drift, lambda: db.get_student_drifts(sid)
+    )
+    db.save_fingerprint(fingerprint)
+    return fingerprint
+
+
+def _observe(drift: DriftNudge, student, accepted_now: bool = False):
+    """Feed the live metric sketches from one drift interaction (point reads only)."""
+    live_metrics.observe("drift_score", student.drift_score)
+    live_metrics.observe("collision_potential", drift.collision_potential_score)
+    attractor = db.get_attractor(student.id)
+    if attractor:
+        live_metrics.observe("bubble_percentage", attractor.bubble_percentage)
+    if accepted_now:
+        latency = (datetime.utcnow() - drift.created_at).total_seconds()
+        live_metrics.observe("acceptance_latency_seconds", max(latency, 0.0))
+
 
 @router.post("/generate", response_model=DriftNudge)
 async def generate_drift(req: DriftGenerateRequest):
-    student = db.students.get(req.student_id)
+    student = db.get_student(req.student_id)
     if not student:
         raise HTTPException(404, "Student not found")
 
-    attractor = db.attractors.get(req.student_id)
+    attractor = db.get_attractor(req.student_id)
     if not attractor:
         raise HTTPException(404, "Attractor state not found")
 
-    fingerprint = db.fingerprints.get(req.student_id)
+    fingerprint = db.get_fingerprint(req.student_id)
     if not fingerprint:
-        fingerprint = fingerprint_builder._default_fingerprint(req.student_id)
-
-    drift = nudge_engine.generate_daily_drift(student, attractor, fingerprint)
-    drift.id = f"drift-{uuid.uuid4().hex[:8]}"
+        fingerprint = SerendipityFingerprint(student_id=req.student_id)
+
+    # Serve the nightly batch result if there is one; generate on demand otherwise
+    today = datetime.utcnow().date()
+    drift = db.pop_pregenerated(req.student_id, today)
+    if drift is not None:
+        drift.created_at = datetime.utcnow()
+    else:
+        feature_store.sync(db)
+        drift = nudge_engine.generate_daily_drift(
+            student, attractor, fingerprint,
+            load_history=db.get_student_drifts,
+            pool=candidate_pools.get(db, today)
+        )
+        drift.id = f"drift-{uuid.uuid4().hex[:8]}"
+
+    # Bandit pull (before saving: a first-seen student is backfilled from history)
+    drift_bandit.pull(drift.student_id, drift.type, drift.created_at, db.get_student_drifts)
 
     # Store
-    db.drifts[drift.id] = drift
-    if req.student_id not in db.student_drifts:
-        db.student_drifts[req.student_id] = []
-    db.student_drifts[req.student_id].append(drift.id)
+    db.save_drift(drift)
+    _update_fingerprint(drift, fingerprint=fingerprint)
 
     return drift
 
 
+@router.post("/batch/pregenerate", dependencies=[Depends(require_admin)])
+async def pregenerate_drifts(req: DriftBatchRequest):
+    """
+    Internal: pre-generate the day's drifts for every student (or one
+    shard). Admin-only; workers is capped at the server's CPU count.
+    """
+    if req.shard >= req.shards:
+        raise HTTPException(422, "shard must be < shards")
+    day = req.date or datetime.utcnow().date()
+    workers = min(req.workers or MAX_PREGENERATE_WORKERS, MAX_PREGENERATE_WORKERS)
+    return await run_in_threadpool(
+        pregenerate, db, day, req.shard, req.shards, workers
+    )
+
+
+@router.get("/batch/status")
+async def pregenerate_status(day: Optional[date] = Query(None, description="Default: today (UTC)")):
+    day = day or datetime.utcnow().date()
+    return {"date": day.isoformat(), "pending": db.count_pregenerated(day)}
+
+
 @router.post("/{drift_id}/accept")
 async def accept_drift(drift_id: str, student_id: str):
-    drift = db.drifts.get(drift_id)
+    drift = db.get_drift(drift_id)
     if not drift:
         raise HTTPException(404, "Drift not found")
 
-    student = db.students.get(student_id)
+    student = db.get_student(student_id)
     if not student:
         raise HTTPException(404, "Student not found")
 
+    before = fingerprint_builder.contribution(drift)
+    accepted_now = drift.status == "pending"
     drift.status = "accepted"
     # drift accepted
 
     # Increment streak + score
     student.drift_streak += 1
     student.drift_score += 10
+    db.save_drift(drift)
+    db.save_student(student)
+    _update_fingerprint(drift, before)
+    _observe(drift, student, accepted_now)
 
     return {"status": "accepted", "drift_id": drift_id, "new_score": student.drift_score, "new_streak": student.drift_streak}
 
 
 @router.post("/{drift_id}/skip")
 async def skip_drift(drift_id: str, student_id: str):
-    drift = db.drifts.get(drift_id)
+    drift = db.get_drift(drift_id)
     if not drift:
         raise HTTPException(404, "Drift not found")
 
-    student = db.students.get(student_id)
+    student = db.get_student(student_id)
     if not student:
         raise HTTPException(404, "Student not found")
 
+    before = fingerprint_builder.contribution(drift)
     drift.status = "skipped"
     student.drift_streak = 0
+    db.save_drift(drift)
+    db.save_student(student)
+    _update_fingerprint(drift, before)
+    _observe(drift, student)
 
     return {"status": "skipped", "drift_id": drift_id, "streak_reset": True}
 
 
 @router.post("/{drift_id}/outcome")
 async def log_outcome(drift_id: str, req: DriftOutcomeRequest, student_id: str = ""):
-    drift = db.drifts.get(drift_id)
+    drift = db.get_drift(drift_id)
     if not drift:
         raise HTTPException(404, "Drift not found")
 
     sid = student_id or drift.student_id
-    student = db.students.get(sid)
+    student = db.get_student(sid)
     if not student:
         raise HTTPException(404, "Student not found")
 
+    before = fingerprint_builder.contribution(drift)
+    accepted_now = drift.status == "pending"
+    if drift.outcome is None:
+        # Bandit reward, recorded before the outcome is saved (see DriftBandit)
+        drift_bandit.reward(
+            drift.student_id, drift.type, drift.created_at,
+            1.0 if req.was_interesting else 0.0, db.get_student_drifts
+        )
     drift.outcome = DriftOutcome(
         drift_id=drift_id,
         was_interesting=req.was_interesting,
@@ -103,11 +194,12 @@ async def log_outcome(drift_id: str, req: DriftOutcomeRequest, student_id: str =
 
     if req.was_interesting:
         student.drift_score += 25
+    db.save_drift(drift)
+    db.save_student(student)
 
-    # Rebuild fingerprint
-    history = [db.drifts[did] for did in db.student_drifts.get(sid, []) if did in db.drifts]
-    fp = fingerprint_builder.build(sid, history)
-    db.fingerprints[sid] = fp
+    # Incremental fingerprint update (no history scan)
+    _update_fingerprint(drift, before)
+    _observe(drift, student, accepted_now)
 
     return {
         "status": "completed",
@@ -115,3 +207,35 @@ async def log_outcome(drift_id: str, req: DriftOutcomeRequest, student_id: str =
         "was_interesting": req.was_interesting,
         "new_score": student.drift_score
     }
+
+
+@router.get("/bandit/{student_id}")
+async def bandit_stats(student_id: str):
+    """Per-context pulls/rewards for each drift type."""
+    if not db.get_student(student_id):
+        raise HTTPException(404, "Student not found")
+    drift_bandit.select([student_id], load_history=db.get_student_drifts)  # backfill if unseen
+    return {"student_id": student_id, "arms": drift_bandit.arm_stats(student_id)}
+
+
+@router.get("/stats/live", response_class=FastJSONResponse)
+async def live_stats(raw: bool = Query(False, description="Include mergeable sketch state")):
+    """Streaming percentiles/histograms of bubble %, drift score, collision potential and acceptance latency."""
+    summary = live_metrics.summary()
+    if raw:
+        return {"summary": summary, "sketches": live_metrics.export()}
+    return summary
+
+
+@router.post("/stats/live/merge", dependencies=[Depends(require_admin)])
+async def merge_live_stats(states: List[Dict]):
+    """
+    Combine raw sketch states from several workers/shards into one summary.
+    Admin-only, and at most MAX_MERGE_STATES states per call.
+    """
+    if len(states) > MAX_MERGE_STATES:
+        raise HTTPException(413, f"At most {MAX_MERGE_STATES} sketch states per merge")
+    try:
+        return LiveMetrics.merged(states).summary()
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(422, f"Invalid sketch state: {e}")
@@ -1,28 +1,46 @@
 """
 Events routes — campus events browsing.
 """
-from fastapi import APIRouter, Query
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 
-from ...models.event import CampusEvent
+from ..serialization import SerializedCache
+from ...models.event import CampusEvent, naive_utc
 from ...db.database import db
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Encoded pages keyed by query, valid while the event store version is unchanged
+pages = SerializedCache(CampusEvent, name="events")
+
 
 @router.get("/", response_model=List[CampusEvent])
 async def get_events(
     event_type: Optional[str] = Query(None, description="Filter by type: workshop, social, performance, talk"),
     department: Optional[str] = Query(None, description="Filter by department"),
-    free_only: bool = Query(False, description="Only show free events")
+    free_only: bool = Query(False, description="Only show free events"),
+    start: Optional[datetime] = Query(None, description="Only events starting at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only events starting before this time"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
-    events = db.events
+    start, end = naive_utc(start), naive_utc(end)
 
-    if event_type:
-        events = [e for e in events if e.type == event_type]
-    if department:
-        events = [e for e in events if e.department.lower() == department.lower()]
-    if free_only:
-        events = [e for e in events if e.is_free]
+    def build():
+        try:
+            events, next_cursor = db.event_store.query(
+                event_type=event_type,
+                department=department,
+                free_only=free_only,
+                start=start,
+                end=end,
+                limit=limit,
+                cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+        return events, {"X-Next-Cursor": next_cursor} if next_cursor else None
 
-    return events
+    key = (event_type, department, free_only, start, end, limit, cursor)
+    return pages.respond(key, db.event_store.version, build)
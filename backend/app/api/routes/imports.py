@@ -0,0 +1,147 @@
+"""
+Bulk import routes — students, events and attendance as streamed NDJSON
+(one JSON object per line). Lines are validated as they arrive and written
+in chunks through the repository's batch save_* calls; the response
+reports per-line errors by line number.
+
+    curl -X POST --data-binary @students.ndjson \
+         -H 'Content-Type: application/x-ndjson' localhost:8000/api/import/students
+"""
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Dict
+
+from fastapi import APIRouter, Request
+
+from ..ndjson import ImportReport, NDJSONReader
+from .profile import initial_attractor
+from ...models.student import StudentProfile, StudentImport, AttractorState
+from ...models.event import CampusEvent, AttendanceRecord
+from ...core.feature_store import feature_store
+from ...core.complement_index import complement_index
+from ...db.database import db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+def _finish(kind: str, report: ImportReport, started: float) -> Dict:
+    seconds = time.perf_counter() - started
+    result = {
+        **report.to_dict(),
+        "seconds": round(seconds, 3),
+        "records_per_second": round(report.received / seconds) if seconds > 0 else None,
+    }
+    logger.info("import finished", extra={
+        "kind": kind, "received": report.received, "imported": report.imported,
+        "failed": report.failed, "seconds": result["seconds"]
+    })
+    return result
+
+
+@router.post("/students")
+async def import_students(request: Request):
+    """
+    Create or update students. A line without an id (or with an unknown
+    one) creates the student with a fresh attractor, as POST
+    /api/profile/create does; a known id updates the profile fields.
+    Fingerprints are not written: a missing one is created on the first
+    drift (backfilling from an empty history gives the same state), and new
+    students join the collision index lazily on the next collision query.
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    async for chunk in NDJSONReader(StudentImport, report).chunks(request.stream()):
+        # One lookup per chunk for the ids that may already exist
+        known = db.get_students(record.id for _, record in chunk if record.id)
+        students, attractors, updated = [], [], []
+        for _, record in chunk:
+            fields = dict(record)
+            del fields["id"]
+            existing = known.get(record.id) if record.id else None
+            if existing is not None:
+                student = existing.model_copy(update=fields)
+                updated.append(student)
+            else:
+                student = StudentProfile(
+                    id=record.id or f"stu-{uuid.uuid4().hex[:12]}",
+                    drift_score=0,
+                    drift_streak=0,
+                    **fields
+                )
+                attractors.append(initial_attractor(student))
+            known[student.id] = student  # a repeated id later in the chunk updates this one
+            students.append(student)
+
+        db.save_students(students)
+        db.save_attractors(attractors)
+        for student in students:
+            feature_store.invalidate(student.id)
+        for student in updated:
+            if student.id in complement_index:
+                complement_index.insert(student, db.get_attractor(student.id))
+        report.imported += len(students)
+
+    return _finish("students", report, started)
+
+
+@router.post("/events")
+async def import_events(request: Request):
+    """
+    Create or replace campus events (same id replaces). Start times with an
+    offset are converted to naive UTC. Each chunk is saved and indexed as a
+    unit: if that fails, every line of the chunk is reported and neither
+    the stored events nor the index change.
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    async for chunk in NDJSONReader(CampusEvent, report).chunks(request.stream()):
+        try:
+            db.save_events(event for _, event in chunk)
+        except ValueError as e:
+            for line, _ in chunk:
+                report.fail(line, f"chunk not saved: {e}")
+            continue
+        report.imported += len(chunk)
+
+    return _finish("events", report, started)
+
+
+@router.post("/attendance")
+async def import_attendance(request: Request):
+    """
+    Record event attendance: the event's department and type are added to
+    the student's attractor state. Unknown students or events fail the line.
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    events = db.event_store
+    async for chunk in NDJSONReader(AttendanceRecord, report).chunks(request.stream()):
+        touched: Dict[str, AttractorState] = {}
+        for line, record in chunk:
+            event = events.get(record.event_id)
+            if event is None:
+                report.fail(line, f"unknown event: {record.event_id}")
+                continue
+            attractor = touched.get(record.student_id) or db.get_attractor(record.student_id)
+            if attractor is None:
+                report.fail(line, f"unknown student: {record.student_id}")
+                continue
+            if event.department not in attractor.departments_visited:
+                attractor.departments_visited.append(event.department)
+            if event.type not in attractor.event_types_attended:
+                attractor.event_types_attended.append(event.type)
+            attractor.last_updated = record.attended_at or datetime.utcnow()
+            touched[record.student_id] = attractor
+            report.imported += 1
+
+        db.save_attractors(touched.values())
+        for student_id, attractor in touched.items():
+            feature_store.invalidate(student_id)
+            if student_id in complement_index:
+                complement_index.insert(db.get_student(student_id), attractor)
+
+    return _finish("attendance", report, started)
@@ -4,12 +4,26 @@ Profile routes — create, read, update student profile.
 from fastapi import APIRouter, HTTPException
 
 from ...models.student import StudentProfile, StudentProfileCreate, StudentProfileUpdate, AttractorState
-from ...models.fingerprint import SerendipityFingerprint, FingerprintAxes
+from ...models.fingerprint import SerendipityFingerprint, FingerprintAxes, FingerprintCounters
+from ...core.feature_store import feature_store
+from ...core.complement_index import complement_index
 from ...db.database import db
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
+def initial_attractor(student: StudentProfile) -> AttractorState:
+    """A new student's attractor: only their own department visited."""
+    return AttractorState(
+        student_id=student.id,
+        departments_visited=[student.department],
+        canteen_counters_used=[],
+        event_types_attended=[],
+        new_connections_count=0,
+        content_domains_explored=[]
+    )
+
+
 @router.post("/create", response_model=StudentProfile)
 async def create_profile(req: StudentProfileCreate):
     import uuid
@@ -27,37 +41,31 @@ async def create_profile(req: StudentProfileCreate):
         drift_score=0,
         drift_streak=0
     )
-    db.students[student_id] = student
+    db.save_student(student)
 
     # Init attractor
-    db.attractors[student_id] = AttractorState(
-        student_id=student_id,
-        departments_visited=[req.department],
-        canteen_counters_used=[],
-        event_types_attended=[],
-        new_connections_count=0,
-        content_domains_explored=[]
-    )
+    attractor = initial_attractor(student)
+    db.save_attractor(attractor)
 
     # Init fingerprint
-    db.fingerprints[student_id] = SerendipityFingerprint(
+    db.save_fingerprint(SerendipityFingerprint(
         student_id=student_id,
         axes=FingerprintAxes(),
         total_drifts=0,
         meaningful_drifts=0,
         meaningful_rate=0.0,
-        best_drift_type=None,
-        best_time_of_day=None
-    )
+        counters=FingerprintCounters()
+    ))
 
-    db.student_drifts[student_id] = []
+    feature_store.invalidate(student_id)
+    complement_index.insert(student, attractor)
 
     return student
 
 
 @router.get("/{student_id}", response_model=StudentProfile)
 async def get_profile(student_id: str):
-    student = db.students.get(student_id)
+    student = db.get_student(student_id)
     if not student:
         raise HTTPException(404, "Student not found")
     return student
@@ -65,12 +73,16 @@ async def get_profile(student_id: str):
 
 @router.patch("/{student_id}", response_model=StudentProfile)
 async def update_profile(student_id: str, req: StudentProfileUpdate):
-    student = db.students.get(student_id)
+    student = db.get_student(student_id)
     if not student:
         raise HTTPException(404, "Student not found")
 
     update_data = req.model_dump(exclude_unset=True)
     for key, val in update_data.items():
         setattr(student, key, val)
+    db.save_student(student)
+    feature_store.invalidate(student_id)
+    if student_id in complement_index:
+        complement_index.insert(student, db.get_attractor(student_id))
 
     return student
@@ -0,0 +1,81 @@
+"""
+Fast JSON paths for hot routes: an orjson-backed response class (stdlib
+fallback when orjson isn't installed) and a cache of pre-serialized list
+bodies keyed by the version of the data they were rendered from.
+"""
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from ..core.metrics import Sample, metrics
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SerializedCache:
+    """
+    LRU of encoded JSON list bodies (plus response headers). An entry is
+    served only while the caller's data version matches the one it was
+    rendered at, so an unchanged page is a bytes copy instead of N model
+    validations and dumps. Misses serialize the whole list in one
+    TypeAdapter.dump_json call.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, item_type: Type[BaseModel], max_entries: int = MAX_ENTRIES, name: Optional[str] = None):
+        self.adapter = TypeAdapter(List[item_type])
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes, Dict[str, str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if name:
+            metrics.collector(lambda: self._samples(name))
+
+    def respond(
+        self,
+        key: Hashable,
+        version: int,
+        build: Callable[[], Tuple[List[BaseModel], Optional[Dict[str, str]]]]
+    ) -> Response:
+        """Cached body for `key` at `version`, or build() -> (items, headers), encode and store."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            _, body, headers = entry
+        else:
+            self.misses += 1
+            items, headers = build()
+            headers = headers or {}
+            body = self.adapter.dump_json(items)
+            self._entries[key] = (version, body, headers)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _samples(self, name: str) -> Iterable[Sample]:
+        labels = {"cache": name}
+        yield Sample("karm_serialized_cache_hits_total", "counter", "Pre-serialized page cache hits.", labels, self.hits)
+        yield Sample("karm_serialized_cache_misses_total", "counter", "Pre-serialized page cache misses.", labels, self.misses)
+        yield Sample("karm_serialized_cache_entries", "gauge", "Pre-serialized page cache entries.", labels, len(self._entries))
@@ -2,3 +2,15 @@ from .collision_scorer import CollisionScorer
 from .attractor_mapper import AttractorMapper
 from .nudge_engine import NudgeEngine
 from .fingerprint_builder import FingerprintBuilder
+from .collision_engine import CollisionEngine
+from .feature_store import FeatureStore, StudentFeatures, feature_store
+from .complement_index import ComplementIndex, complement_index
+from .prompt_builder import PromptBuilder, prompt_builder
+from .campus_stats import CampusBubbleStats, campus_bubble
+from .sketches import KLLSketch, LiveMetrics, live_metrics
+from .bandit import DriftBandit, drift_bandit
+from .candidate_pool import CandidatePool, candidate_pools
+from .metrics import MetricsRegistry, metrics
+from .profiler import StackSampler, ProfileStore, profile_store, stack_sampler
+from .memory import SizeEstimator, TracemallocSession, memory_report, tracemalloc_session
+from .logs import LogPipeline, log_pipeline, request_id
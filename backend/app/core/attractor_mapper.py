@@ -1,5 +1,9 @@
+from functools import lru_cache
 from typing import List, Dict
-from ..models.student import AttractorState
+import numpy as np
+from ..models.student import AttractorState, AttractorMetrics
+from .feature_store import StudentFeatures, feature_store
+from .metrics import metrics
 
 
 class AttractorMapper:
@@ -16,6 +20,10 @@ class AttractorMapper:
     TOTAL_EVENT_TYPES = 8
     TOTAL_CONTENT_DOMAINS = 22
 
+    # Dimension order shared by the scalar and vectorized forms:
+    # departments, canteen counters, event types, content domains
+    WEIGHTS = (0.35, 0.20, 0.30, 0.15)
+
     ALL_DEPARTMENTS = [
         'Design & Architecture', 'Performing Arts', 'Philosophy',
         'Literature', 'Economics', 'Psychology', 'Sports Science',
@@ -23,31 +31,75 @@ class AttractorMapper:
         'Civil Engineering', 'Biotech'
     ]
 
+    @metrics.timed("attractor_mapper.compute_bubble_percentage")
     def compute_bubble_percentage(self, attractor: AttractorState) -> float:
+        """Cached on the attractor; recomputed only when its collections change size."""
+        return attractor.metrics.bubble_percentage
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def bubble_from_counts(departments: int, counters: int, event_types: int, domains: int) -> float:
         """
         Product complement formulation: a student who explores nothing
         in any single dimension pulls the entire score toward zero.
         B(s,t) = 1 - ∏(1 - V_k/U_k)^w_k
         """
-        dept_ratio = len(attractor.departments_visited) / self.TOTAL_DEPARTMENTS
-        canteen_ratio = len(attractor.canteen_counters_used) / self.TOTAL_CANTEEN_COUNTERS
-        event_ratio = len(attractor.event_types_attended) / self.TOTAL_EVENT_TYPES
-        content_ratio = len(attractor.content_domains_explored) / self.TOTAL_CONTENT_DOMAINS
+        dept_ratio = departments / AttractorMapper.TOTAL_DEPARTMENTS
+        canteen_ratio = counters / AttractorMapper.TOTAL_CANTEEN_COUNTERS
+        event_ratio = event_types / AttractorMapper.TOTAL_EVENT_TYPES
+        content_ratio = domains / AttractorMapper.TOTAL_CONTENT_DOMAINS
 
-        weights = [0.35, 0.20, 0.30, 0.15]
+        weights = AttractorMapper.WEIGHTS
         ratios = [dept_ratio, canteen_ratio, event_ratio, content_ratio]
 
-        # Product complement formulation
+        # Product complement formulation (ratios clamped: visits outside the
+        # known universe would otherwise raise a negative base to a fractional power)
         product = 1.0
         for ratio, weight in zip(ratios, weights):
-            product *= (1 - ratio) ** weight
+            product *= (1 - min(ratio, 1.0)) ** weight
 
         bubble = 1 - product
         return round(bubble * 100, 1)
 
-    def get_unexplored_areas(self, attractor: AttractorState) -> List[Dict]:
-        visited = set(attractor.departments_visited)
-        unexplored = [d for d in self.ALL_DEPARTMENTS if d not in visited]
+    @staticmethod
+    def bubble_from_count_arrays(counts: np.ndarray) -> np.ndarray:
+        """
+        Vectorized B(s,t) over an (n, 4) array of visited counts, one row
+        per student, in WEIGHTS order. Matches bubble_from_counts row-wise.
+        """
+        totals = np.array([
+            AttractorMapper.TOTAL_DEPARTMENTS,
+            AttractorMapper.TOTAL_CANTEEN_COUNTERS,
+            AttractorMapper.TOTAL_EVENT_TYPES,
+            AttractorMapper.TOTAL_CONTENT_DOMAINS,
+        ], dtype=np.float64)
+        ratios = np.minimum(counts / totals, 1.0)
+        product = np.prod((1.0 - ratios) ** np.array(AttractorMapper.WEIGHTS), axis=1)
+        return np.round((1.0 - product) * 100, 1)
+
+    @staticmethod
+    def metrics_from_counts(departments: int, counters: int, event_types: int, domains: int) -> AttractorMetrics:
+        return AttractorMetrics(
+            bubble_percentage=AttractorMapper.bubble_from_counts(departments, counters, event_types, domains),
+            departments_ratio=f"{departments} of {AttractorMapper.TOTAL_DEPARTMENTS}",
+            canteen_variety_score=round(counters / AttractorMapper.TOTAL_CANTEEN_COUNTERS * 100, 1),
+            event_diversity_score=round(event_types / AttractorMapper.TOTAL_EVENT_TYPES * 100, 1),
+        )
+
+    def get_unexplored_areas(
+        self,
+        attractor: AttractorState,
+        features: StudentFeatures = None
+    ) -> List[Dict]:
+        if features is not None:
+            visited = features.visited
+            unexplored = [
+                d for d in self.ALL_DEPARTMENTS
+                if feature_store.department_id(d) not in visited
+            ]
+        else:
+            visited = set(attractor.departments_visited)
+            unexplored = [d for d in self.ALL_DEPARTMENTS if d not in visited]
         return [
             {'name': dept, 'drift_cta': f'Drift to {dept} →'}
             for dept in unexplored[:5]
@@ -0,0 +1,167 @@
+import os
+from datetime import datetime, timezone, tzinfo
+from typing import Callable, Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from ..models.drift import DriftNudge
+
+HistoryLoader = Callable[[str], List[DriftNudge]]
+
+# IANA zone the time-of-day contexts are read in (times are stored as naive UTC)
+CAMPUS_TIMEZONE = ZoneInfo(os.environ.get("KARM_CAMPUS_TZ", "UTC"))
+
+
+class DriftBandit:
+    """
+    Contextual Bernoulli bandit over drift types, one per student.
+
+    Arm statistics live in two float32 tables of shape
+    (students, contexts, arms): pulls (drifts served) and rewards
+    (outcomes logged as interesting). A context is the time-of-day bucket
+    the drift was served in, on the campus clock (KARM_CAMPUS_TZ). Sparse
+    contexts borrow strength from the student's other buckets:
+
+        α = 1 + r_c + λ·(r_all − r_c)
+        β = 1 + (n_c − r_c) + λ·((n_all − n_c) − (r_all − r_c))
+
+    select() draws θ ~ Beta(α, β) (Thompson) or scores mean + √(2 ln N / n)
+    (UCB) for a whole batch of students in one vectorized call.
+
+    Students are backfilled from their drift history the first time they
+    are seen — record pulls/rewards *before* saving the drift they refer to.
+    """
+
+    ARMS = ('canteen', 'event', 'route', 'space')
+    CONTEXTS = ('morning', 'afternoon', 'evening', 'night')
+    POOL_WEIGHT = 0.5
+    PREFERRED_BOOST = 1.0  # cold-start nudge toward the fingerprint's best type
+
+    def __init__(self, capacity: int = 1024, seed: Optional[int] = None, tz: tzinfo = None):
+        self.tz = tz or CAMPUS_TIMEZONE
+        self._row_of: Dict[str, int] = {}
+        self._pulls = np.zeros((capacity, len(self.CONTEXTS), len(self.ARMS)), dtype=np.float32)
+        self._rewards = np.zeros_like(self._pulls)
+        self._arm_of = {arm: i for i, arm in enumerate(self.ARMS)}
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def context_of(self, when: datetime) -> int:
+        """Time-of-day bucket of `when` (naive UTC, or aware) on the campus clock."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        hour = when.astimezone(self.tz).hour
+        if 5 <= hour < 12:
+            return 0
+        if 12 <= hour < 17:
+            return 1
+        if 17 <= hour < 22:
+            return 2
+        return 3
+
+    # ── Table ──
+
+    def _row(self, student_id: str, load_history: HistoryLoader = None) -> int:
+        row = self._row_of.get(student_id)
+        if row is not None:
+            return row
+        row = len(self._row_of)
+        if row == len(self._pulls):
+            self._pulls = np.concatenate([self._pulls, np.zeros_like(self._pulls)])
+            self._rewards = np.concatenate([self._rewards, np.zeros_like(self._rewards)])
+        self._row_of[student_id] = row
+        for drift in (load_history(student_id) if load_history else ()):
+            self._record(row, drift.type, drift.created_at, 1.0, 0.0)
+            if drift.outcome is not None:
+                self._record(row, drift.type, drift.created_at, 0.0, float(drift.outcome.was_interesting))
+        return row
+
+    def _record(self, row: int, drift_type: str, when: datetime, pulls: float, reward: float):
+        arm = self._arm_of.get(drift_type)
+        if arm is None:
+            return
+        ctx = self.context_of(when)
+        self._pulls[row, ctx, arm] += pulls
+        self._rewards[row, ctx, arm] += reward
+
+    def pull(self, student_id: str, drift_type: str, when: datetime, load_history: HistoryLoader = None):
+        """A drift of `drift_type` was served to the student."""
+        self._record(self._row(student_id, load_history), drift_type, when, 1.0, 0.0)
+
+    def reward(self, student_id: str, drift_type: str, when: datetime, reward: float,
+               load_history: HistoryLoader = None):
+        """Outcome for a served drift (`when` = the drift's created_at)."""
+        self._record(self._row(student_id, load_history), drift_type, when, 0.0, reward)
+
+    # ── Selection ──
+
+    def _posterior(self, rows: np.ndarray, when: Optional[datetime]):
+        pulls, rewards = self._pulls[rows], self._rewards[rows]
+        pulls_all, rewards_all = pulls.sum(axis=1), rewards.sum(axis=1)
+        if when is None:
+            # Context-free: pooled over all buckets
+            return 1.0 + rewards_all, 1.0 + pulls_all - rewards_all
+        ctx = self.context_of(when)
+        n_c, r_c = pulls[:, ctx], rewards[:, ctx]
+        alpha = 1.0 + r_c + self.POOL_WEIGHT * (rewards_all - r_c)
+        beta = 1.0 + (n_c - r_c) + self.POOL_WEIGHT * ((pulls_all - n_c) - (rewards_all - r_c))
+        return alpha, beta
+
+    def select(
+        self,
+        student_ids: Sequence[str],
+        when: Optional[datetime] = None,
+        strategy: str = "thompson",
+        preferred: Sequence[Optional[str]] = None,
+        available: Optional[np.ndarray] = None,
+        load_history: HistoryLoader = None
+    ) -> List[str]:
+        """
+        One arm per student. `when` picks the context bucket (None = pooled),
+        `preferred` gives optional per-student cold-start favourites, and
+        `available` is an (arms,) or (n, arms) bool mask of arms that have
+        candidates.
+        """
+        if not len(student_ids):
+            return []
+        rows = np.fromiter((self._row(sid, load_history) for sid in student_ids),
+                           dtype=np.int64, count=len(student_ids))
+        alpha, beta = self._posterior(rows, when)
+        if preferred is not None:
+            arms = np.array([self._arm_of.get(p, -1) if p else -1 for p in preferred])
+            hit = np.flatnonzero(arms >= 0)
+            alpha[hit, arms[hit]] += self.PREFERRED_BOOST
+
+        if strategy == "thompson":
+            scores = self.rng.beta(alpha, beta)
+        elif strategy == "ucb":
+            n = alpha + beta
+            scores = alpha / n + np.sqrt(2.0 * np.log(n.sum(axis=1, keepdims=True)) / n)
+        else:
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        if available is not None:
+            scores = np.where(available, scores, -np.inf)
+        return [self.ARMS[i] for i in np.argmax(scores, axis=1)]
+
+    def arm_stats(self, student_id: str) -> Dict:
+        row = self._row_of.get(student_id)
+        if row is None:
+            return {}
+        return {
+            context: {
+                arm: {
+                    "pulls": int(self._pulls[row, c, a]),
+                    "rewards": int(self._rewards[row, c, a]),
+                }
+                for a, arm in enumerate(self.ARMS)
+            }
+            for c, context in enumerate(self.CONTEXTS)
+        }
+
+
+# Singleton instance
+drift_bandit = DriftBandit()
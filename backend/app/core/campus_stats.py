@@ -0,0 +1,154 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..models.student import StudentProfile, AttractorState
+from .attractor_mapper import AttractorMapper
+
+
+class CampusBubbleStats:
+    """
+    Whole-campus distribution of B(s,t).
+
+    Visited counts live in an (n, 4) int array — one row per student — next
+    to department and year codes, and the product-complement formula runs
+    over all rows in one vectorized pass. sync() then re-evaluates only the
+    rows of students whose profile or attractor changed since the last
+    call (Repository.students_changed_since).
+    """
+
+    PERCENTILES = (10, 25, 50, 75, 90, 99)
+    HISTOGRAM_BINS = 10
+
+    def __init__(self):
+        self._row_of: Dict[str, int] = {}
+        self._counts = np.zeros((0, 4), dtype=np.int32)
+        self._department = np.zeros(0, dtype=np.int32)
+        self._year = np.zeros(0, dtype=np.int32)
+        self._bubble = np.zeros(0, dtype=np.float64)
+        self._live = np.zeros(0, dtype=bool)
+        self._departments: Dict[str, int] = {}
+        self._department_names: List[str] = []
+        self._seq: Optional[int] = None
+        self._stats: Optional[Dict] = None
+
+    def __len__(self) -> int:
+        return int(self._live.sum())
+
+    def _department_code(self, name: str) -> int:
+        code = self._departments.get(name)
+        if code is None:
+            code = self._departments[name] = len(self._department_names)
+            self._department_names.append(name)
+        return code
+
+    # ── Sync ──
+
+    def sync(self, repo):
+        if self._seq is not None:
+            changes = repo.students_changed_since(self._seq)
+            if changes is not None:
+                changed, self._seq = changes
+                if changed:
+                    self._apply(repo, changed)
+                return
+        self.rebuild(repo)
+
+    def rebuild(self, repo):
+        """Full load: one pass over students and attractors."""
+        self._seq = repo.change_seq
+        attractors = repo.list_attractors()
+        students = repo.list_students()
+        self._row_of = {s.id: i for i, s in enumerate(students)}
+        self._counts = np.array(
+            [attractors[s.id].counts() if s.id in attractors else (0, 0, 0, 0) for s in students],
+            dtype=np.int32
+        ).reshape(-1, 4)
+        self._department = np.array([self._department_code(s.department) for s in students], dtype=np.int32)
+        self._year = np.array([s.year for s in students], dtype=np.int32)
+        self._live = np.array([s.id in attractors for s in students], dtype=bool)
+        self._bubble = AttractorMapper.bubble_from_count_arrays(self._counts)
+        self._stats = None
+
+    def _apply(self, repo, student_ids: Iterable[str]):
+        new = [sid for sid in student_ids if sid not in self._row_of]
+        if new:
+            start = len(self._live)
+            for i, sid in enumerate(new):
+                self._row_of[sid] = start + i
+            n = len(new)
+            self._counts = np.vstack([self._counts, np.zeros((n, 4), dtype=np.int32)])
+            self._department = np.concatenate([self._department, np.zeros(n, dtype=np.int32)])
+            self._year = np.concatenate([self._year, np.zeros(n, dtype=np.int32)])
+            self._live = np.concatenate([self._live, np.zeros(n, dtype=bool)])
+            self._bubble = np.concatenate([self._bubble, np.zeros(n)])
+
+        rows = []
+        for sid in student_ids:
+            row = self._row_of[sid]
+            rows.append(row)
+            self._set_row(row, repo.get_student(sid), repo.get_attractor(sid))
+        rows = np.array(rows, dtype=np.int64)
+        self._bubble[rows] = AttractorMapper.bubble_from_count_arrays(self._counts[rows])
+        self._stats = None
+
+    def _set_row(self, row: int, student: Optional[StudentProfile], attractor: Optional[AttractorState]):
+        self._live[row] = student is not None and attractor is not None
+        if not self._live[row]:
+            return
+        self._counts[row] = attractor.counts()
+        self._department[row] = self._department_code(student.department)
+        self._year[row] = student.year
+
+    # ── Summaries ──
+
+    def stats(self) -> Dict:
+        if self._stats is None:
+            self._stats = self._summarize()
+        return self._stats
+
+    def _summarize(self) -> Dict:
+        values = self._bubble[self._live]
+        if values.size == 0:
+            return {"students": 0, "mean": None, "percentiles": {}, "histogram": {}, "by_department": {}, "by_year": {}}
+
+        edges = np.linspace(0, 100, self.HISTOGRAM_BINS + 1)
+        hist, _ = np.histogram(values, bins=edges)
+        percentiles = np.percentile(values, self.PERCENTILES)
+        return {
+            "students": int(values.size),
+            "mean": round(float(values.mean()), 2),
+            "percentiles": {f"p{p}": round(float(v), 1) for p, v in zip(self.PERCENTILES, percentiles)},
+            "histogram": {"edges": edges.tolist(), "counts": hist.tolist()},
+            "by_department": self._grouped(values, self._department[self._live], self._department_names),
+            "by_year": self._grouped(values, self._year[self._live], None),
+        }
+
+    @staticmethod
+    def _grouped(values: np.ndarray, codes: np.ndarray, names: Optional[List[str]]) -> Dict:
+        """Count / mean / median per group code without a Python loop over students."""
+        size = int(codes.max()) + 1
+        counts = np.bincount(codes, minlength=size)
+        means = np.bincount(codes, weights=values, minlength=size) / np.maximum(counts, 1)
+
+        order = np.lexsort((values, codes))
+        ordered = values[order]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        lo = starts + np.maximum(counts - 1, 0) // 2
+        hi = starts + counts // 2
+        present = np.flatnonzero(counts)
+        medians = np.zeros(size)
+        medians[present] = (ordered[lo[present]] + ordered[np.minimum(hi[present], len(ordered) - 1)]) / 2
+
+        return {
+            (names[code] if names is not None else str(code)): {
+                "students": int(counts[code]),
+                "mean": round(float(means[code]), 2),
+                "median": round(float(medians[code]), 1),
+            }
+            for code in present
+        }
+
+
+# Singleton instance
+campus_bubble = CampusBubbleStats()
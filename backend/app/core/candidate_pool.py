@@ -0,0 +1,164 @@
+import random
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.event import CampusEvent, DiscoverySlot
+from .bandit import DriftBandit
+
+# Discovery slot organizer -> drift type
+SLOT_DRIFT_TYPES = {'vendor': 'canteen', 'club': 'space', 'event': 'event'}
+
+
+def _clock(dt: datetime) -> str:
+    """7:30 PM"""
+    return f"{dt.hour % 12 or 12}:{dt:%M %p}"
+
+
+class CandidatePool:
+    """
+    A day's drift candidates from live events and discovery slots, from
+    `start` (default: the start of the day) on: earlier events and slot
+    times are left out.
+
+    Candidates are partitioned by (drift type, is_free) and each partition
+    is sorted by duration, so the time-budget filter is a bisect and
+    free_only just skips the paid partition — no per-request scan.
+    """
+
+    DEFAULT_SLOT_MINUTES = 60
+
+    def __init__(self, events: Iterable[CampusEvent] = (), slots: Iterable[DiscoverySlot] = (),
+                 day: Optional[date] = None, start: Optional[datetime] = None):
+        self.day = day
+        self.start = start
+        buckets: Dict[Tuple[str, bool], List[dict]] = {}
+        for event in events:
+            if start is not None and event.start_time < start:
+                continue
+            candidate = self._from_event(event)
+            buckets.setdefault((candidate['type'], candidate['is_free']), []).append(candidate)
+        for slot in slots:
+            candidate = self._from_slot(slot, day, start)
+            if candidate is not None:
+                buckets.setdefault((candidate['type'], True), []).append(candidate)
+
+        self._partitions: Dict[Tuple[str, bool], Tuple[List[int], List[dict]]] = {}
+        for key, items in buckets.items():
+            items.sort(key=lambda c: c['time_required_minutes'])
+            self._partitions[key] = ([c['time_required_minutes'] for c in items], items)
+
+    def __len__(self) -> int:
+        return sum(len(items) for _, items in self._partitions.values())
+
+    @staticmethod
+    def _from_event(event: CampusEvent) -> dict:
+        attendees = ', '.join(event.expected_attendees)
+        description = f"{event.department} {event.type}"
+        if attendees:
+            description += f" — expect people from {attendees}."
+        if event.discovery_slot:
+            description += " Discovery slot open."
+        return {
+            'type': 'event',
+            'title': event.title,
+            'description': description,
+            'location': event.location,
+            'department': event.department,
+            'time': _clock(event.start_time),
+            'time_required_minutes': event.duration_minutes,
+            'is_free': event.is_free,
+            'source_id': event.id,
+        }
+
+    def _from_slot(self, slot: DiscoverySlot, day: Optional[date], start: Optional[datetime]) -> Optional[dict]:
+        times = sorted(
+            t for t in slot.available_times
+            if (day is None or t.date() == day) and (start is None or t >= start)
+        )
+        if (day is not None or start is not None) and not times:
+            return None
+        return {
+            'type': SLOT_DRIFT_TYPES.get(slot.organizer_type, 'space'),
+            'title': slot.name,
+            'description': slot.description,
+            'location': slot.location,
+            'time': _clock(times[0]) if times else 'Anytime',
+            'time_required_minutes': self.DEFAULT_SLOT_MINUTES,
+            'is_free': True,
+            'source_id': slot.id,
+        }
+
+    def eligible(self, drift_type: str, budget_minutes: int, free_only: bool) -> List[Tuple[List[dict], int]]:
+        """
+        (partition, n) pairs whose first n candidates fit the budget: the
+        sorted partitions themselves plus a length, a view rather than a copy.
+        """
+        out = []
+        for is_free in ((True,) if free_only else (True, False)):
+            partition = self._partitions.get((drift_type, is_free))
+            if partition:
+                durations, items = partition
+                n = bisect_right(durations, budget_minutes)
+                if n:
+                    out.append((items, n))
+        return out
+
+    def available(self, budget_minutes: int, free_only: bool) -> Optional[np.ndarray]:
+        """
+        Bool mask over DriftBandit.ARMS of the types with a candidate that
+        fits, for DriftBandit.select; None when no type has one.
+        """
+        mask = np.array([
+            bool(self.eligible(arm, budget_minutes, free_only)) for arm in DriftBandit.ARMS
+        ])
+        return mask if mask.any() else None
+
+    def pick(self, drift_type: str, budget_minutes: int, free_only: bool,
+             rng: random.Random = random) -> Optional[dict]:
+        prefixes = self.eligible(drift_type, budget_minutes, free_only)
+        total = sum(n for _, n in prefixes)
+        if not total:
+            return None
+        i = rng.randrange(total)
+        for items, n in prefixes:
+            if i < n:
+                return items[i]
+            i -= n
+
+
+class CandidatePools:
+    """
+    Per-day CandidatePool cache, rebuilt when Repository.campus_version
+    moves and, for today, every hour: today's pool starts at the current
+    hour, so what started earlier is not offered for more than an hour.
+    """
+
+    KEEP_DAYS = 3
+
+    def __init__(self):
+        self._pools: Dict[date, Tuple[Tuple[int, datetime], CandidatePool]] = {}
+
+    def get(self, repo, day: date, now: Optional[datetime] = None) -> CandidatePool:
+        now = now or datetime.utcnow()
+        start = datetime.combine(day, time.min)
+        if day == now.date():
+            start = now.replace(minute=0, second=0, microsecond=0)
+        key = (repo.campus_version, start)
+        cached = self._pools.get(day)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        end = datetime.combine(day, time.min) + timedelta(days=1)
+        events, _ = repo.event_store.query(start=start, end=end)
+        pool = CandidatePool(events, repo.slot_index.between(start, end), day, start)
+        self._pools[day] = (key, pool)
+        for stale in sorted(self._pools)[:-self.KEEP_DAYS]:
+            del self._pools[stale]
+        return pool
+
+
+# Singleton instance
+candidate_pools = CandidatePools()
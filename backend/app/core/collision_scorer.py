@@ -1,7 +1,8 @@
 import random
-from typing import Set
+from typing import FrozenSet
 from ..models.drift import CollisionScore
 from ..models.student import StudentProfile, AttractorState
+from .metrics import metrics
 
 
 class CollisionScorer:
@@ -14,6 +15,9 @@ class CollisionScorer:
     α=0.35, β=0.30, γ=0.15, δ=0.20
     """
 
+    EXPECTED_TIMING = 0.8          # mean of uniform(0.6, 1.0)
+    EXPECTED_GAP_FALLBACK = 0.725  # mean of uniform(0.5, 0.95)
+
     DOMAIN_MAP = {
         'robotics': 'spatial-mechanical',
         'sculpture': 'spatial-mechanical',
@@ -54,27 +58,43 @@ class CollisionScorer:
         'Drama', 'Economics', 'Psychology', 'Sports', 'Literature'
     }
 
+    def __init__(self, features=None):
+        from .feature_store import feature_store
+        self.features = features or feature_store
+
+    @metrics.timed("collision_scorer.score")
     def score(
         self,
         student_a: StudentProfile,
         student_b: StudentProfile,
         attractor_a: AttractorState = None,
-        attractor_b: AttractorState = None
+        attractor_b: AttractorState = None,
+        expected: bool = False
     ) -> CollisionScore:
-        """Score complementarity between two students."""
+        """
+        Score complementarity between two students.
+        With expected=True the random placeholders (Ω, and Γ without
+        attractors) take their mean values so rankings are deterministic.
+        """
+
+        features_a = self.features.get(student_a, attractor_a)
+        features_b = self.features.get(student_b, attractor_b)
 
         skill_complement = self._skill_complementarity(
-            student_a.skills, student_b.skills
+            features_a.skills, features_b.skills
         )
 
-        hidden_thread = self._find_hidden_thread(
-            student_a.interests, student_b.interests
-        )
+        hidden_thread = self._find_hidden_thread(features_a, features_b)
 
-        timing = self._timing_overlap(student_a, student_b)
+        if expected:
+            timing = self.EXPECTED_TIMING
+        else:
+            timing = self._timing_overlap(student_a, student_b)
 
         if attractor_a and attractor_b:
-            gap_match = self._gap_profile_match(attractor_a, attractor_b)
+            gap_match = self._gap_profile_match(features_a, features_b)
+        elif expected:
+            gap_match = self.EXPECTED_GAP_FALLBACK
         else:
             gap_match = random.uniform(0.5, 0.95)
 
@@ -93,33 +113,28 @@ class CollisionScorer:
             gap_profile_match=round(gap_match, 3)
         )
 
-    def _skill_complementarity(self, skills_a, skills_b):
+    def _skill_complementarity(self, set_a: FrozenSet[int], set_b: FrozenSet[int]):
         """
         Φ(a,b) = |S_a △ S_b| / |S_a ∪ S_b| · (1 - |S_a ∩ S_b| / |S_a ∪ S_b|)
         High complementarity → high score. Penalizes overlap.
+        Takes interned (lowercased) skill ids.
         """
-        set_a, set_b = set(s.lower() for s in skills_a), set(s.lower() for s in skills_b)
-        union = set_a.union(set_b)
+        union = set_a | set_b
         if not union:
             return 0.5
-        symmetric_diff = set_a.symmetric_difference(set_b)
-        intersection = set_a.intersection(set_b)
+        symmetric_diff = set_a ^ set_b
+        intersection = set_a & set_b
         ratio = len(symmetric_diff) / len(union)
         overlap_penalty = 1 - (len(intersection) / len(union))
         return ratio * overlap_penalty
 
-    def _find_hidden_thread(self, interests_a, interests_b):
+    def _find_hidden_thread(self, features_a, features_b):
         """
         Θ(a,b): Rewards pairs who share a deep domain but have different
         surface interests — the "hidden thread."
         """
-        domains_a = {self.DOMAIN_MAP.get(i.lower(), i.lower()) for i in interests_a}
-        domains_b = {self.DOMAIN_MAP.get(i.lower(), i.lower()) for i in interests_b}
-
-        domain_overlap = domains_a.intersection(domains_b)
-        surface_a = set(i.lower() for i in interests_a)
-        surface_b = set(i.lower() for i in interests_b)
-        surface_overlap = surface_a.intersection(surface_b)
+        domain_overlap = features_a.domains & features_b.domains
+        surface_overlap = features_a.interests & features_b.interests
 
         hidden = max(len(domain_overlap) - len(surface_overlap), 0)
         return min(hidden / 3, 1.0)
@@ -131,17 +146,16 @@ class CollisionScorer:
         """
         return random.uniform(0.6, 1.0)
 
-    def _gap_profile_match(self, attractor_a: AttractorState, attractor_b: AttractorState):
+    def _gap_profile_match(self, features_a, features_b):
         """
         Γ(a,b) = |G_a ∩ E_b| / |G_a| · |G_b ∩ E_a| / |G_b|
         Each student fills the other's gap. Both fractions must be high.
         """
-        gap_a = self.CAMPUS_DEPARTMENTS - set(attractor_a.departments_visited)
-        gap_b = self.CAMPUS_DEPARTMENTS - set(attractor_b.departments_visited)
-        explored_a = set(attractor_a.departments_visited)
-        explored_b = set(attractor_b.departments_visited)
+        campus = self.features.campus_departments
+        gap_a = campus - features_a.visited
+        gap_b = campus - features_b.visited
 
-        fill_a = len(gap_a.intersection(explored_b)) / max(len(gap_a), 1)
-        fill_b = len(gap_b.intersection(explored_a)) / max(len(gap_b), 1)
+        fill_a = len(gap_a & features_b.visited) / max(len(gap_a), 1)
+        fill_b = len(gap_b & features_a.visited) / max(len(gap_b), 1)
 
         return fill_a * fill_b
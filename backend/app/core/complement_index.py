@@ -0,0 +1,206 @@
+import heapq
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models.drift import CollisionScore
+from ..models.student import StudentProfile, AttractorState
+from .collision_scorer import CollisionScorer
+from .feature_store import FeatureStore, StudentFeatures, feature_store
+
+
+class ComplementIndex:
+    """
+    Approximate nearest-complement index (MinHash + LSH banding).
+
+    Each student is indexed by what they OFFER — campus departments they
+    have explored plus their interest domains. A query is hashed by what it
+    NEEDS — its unexplored campus departments (gap set) plus its own
+    domains. High Jaccard(need_a, offer_b) means b fills a's gaps (Γ) and
+    shares a deep domain (Θ), so colliding buckets give a sublinear
+    shortlist that CollisionScorer then re-scores exactly.
+
+    Skill complementarity (Φ) rewards DISjoint sets and cannot be hashed
+    this way; it only enters during re-scoring.
+
+    P(candidate) = 1 - (1 - J^r)^b  with b bands of r rows. Shared domains
+    (Θ) separate partners better than departments, so domain tokens count
+    DOMAIN_WEIGHT times. The default 128×64 (r=2) collides with a large
+    part of the campus; candidates are ranked by how many bands they share
+    (an estimate of J) and only the top `shortlist` are re-scored.
+
+    On the seeded synthetic campus (tests/conftest.py), 200 candidates give
+    recall@10 ~0.9 at 2,000 students (10% re-scored) and ~0.8 at 10,000
+    (2%), counting a partner whose score ties the exact 10th as a hit;
+    exact-id recall is ~0.57 and ~0.45, most misses being such ties.
+    128×32 with unweighted tokens, uncapped, reached 0.1 on that campus.
+    """
+
+    NUM_PERM = 128
+    BANDS = 64
+    DOMAIN_WEIGHT = 2
+    SHORTLIST = 200
+    TIE_TOLERANCE = 0.1  # one rounding step of CollisionScore.overall
+    PRIME = (1 << 31) - 1  # Mersenne prime for universal hashing
+
+    def __init__(
+        self,
+        features: FeatureStore = None,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        shortlist: int = SHORTLIST,
+        seed: int = 42
+    ):
+        self.features = features or feature_store
+        self.scorer = CollisionScorer(self.features)
+        self.shortlist = shortlist
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, self.PRIME, self.rows * bands, dtype=np.uint64)
+        self._b = rng.integers(0, self.PRIME, self.rows * bands, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._keys: Dict[str, List[bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._keys
+
+    # ── Token sets ──
+
+    def _domain_tokens(self, features: StudentFeatures) -> List[int]:
+        # Departments on even ids, DOMAIN_WEIGHT copies of each domain on odd ids
+        w = self.DOMAIN_WEIGHT
+        return [(d * w + i) * 2 + 1 for d in features.domains for i in range(w)]
+
+    def _offer_tokens(self, features: StudentFeatures) -> List[int]:
+        return [d * 2 for d in features.campus_visited] + self._domain_tokens(features)
+
+    def _need_tokens(self, features: StudentFeatures) -> List[int]:
+        gaps = self.features.campus_departments - features.visited
+        return [d * 2 for d in gaps] + self._domain_tokens(features)
+
+    def _signature(self, tokens: List[int]) -> np.ndarray:
+        x = np.asarray(tokens, dtype=np.uint64)
+        hashed = (self._a[:, None] * x[None, :] + self._b[:, None]) % np.uint64(self.PRIME)
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    # ── Incremental maintenance ──
+
+    def insert(self, student: StudentProfile, attractor: AttractorState = None):
+        """Index (or re-index) one student."""
+        self.remove(student.id)
+        tokens = self._offer_tokens(self.features.get(student, attractor))
+        if not tokens:
+            return
+        keys = self._band_keys(self._signature(tokens))
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, set()).add(student.id)
+        self._keys[student.id] = keys
+
+    def clear(self):
+        self._buckets = [{} for _ in range(self.bands)]
+        self._keys = {}
+
+    def remove(self, student_id: str):
+        keys = self._keys.pop(student_id, None)
+        if keys is None:
+            return
+        for band, key in enumerate(keys):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(student_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    # ── Queries ──
+
+    def candidates(self, student: StudentProfile, attractor: AttractorState = None) -> List[str]:
+        """
+        Up to `shortlist` students sharing an LSH band with the query's need
+        set, most shared bands first (ties by id, so results are repeatable).
+        """
+        tokens = self._need_tokens(self.features.get(student, attractor))
+        if not tokens:
+            return []
+        shared: Counter = Counter()
+        for band, key in enumerate(self._band_keys(self._signature(tokens))):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                shared.update(bucket)
+        shared.pop(student.id, None)
+        ranked = heapq.nsmallest(self.shortlist, shared.items(), key=lambda item: (-item[1], item[0]))
+        return [sid for sid, _ in ranked]
+
+    def top_k_partners(
+        self,
+        student: StudentProfile,
+        k: int,
+        get_student: Callable[[str], Optional[StudentProfile]],
+        get_attractor: Callable[[str], Optional[AttractorState]]
+    ) -> List[Tuple[str, CollisionScore]]:
+        """Shortlist via LSH, then exact re-scoring with CollisionScorer."""
+        attractor = get_attractor(student.id)
+        scored = []
+        for partner_id in self.candidates(student, attractor):
+            partner = get_student(partner_id)
+            if partner is None:
+                continue
+            score = self.scorer.score(
+                student, partner, attractor, get_attractor(partner_id), expected=True
+            )
+            scored.append((partner_id, score))
+        scored.sort(key=lambda item: item[1].overall, reverse=True)
+        return scored[:k]
+
+    def recall(
+        self,
+        sample_ids: List[str],
+        k: int,
+        exact_top_k: Callable[[str, int], List[Tuple[str, CollisionScore]]],
+        get_student: Callable[[str], Optional[StudentProfile]],
+        get_attractor: Callable[[str], Optional[AttractorState]]
+    ) -> Dict[str, float]:
+        """
+        Recall@k of the approximate search against an exact engine
+        (e.g. CollisionEngine.top_k_partners), plus mean shortlist size.
+        `recall` counts exact ids; `score_recall` also counts a partner that
+        scores at least the exact k-th (scores tie often, and which of the
+        tied partners an engine returns is arbitrary).
+        """
+        hits, tied, total, shortlist = 0, 0, 0, 0
+        for sid in sample_ids:
+            student = get_student(sid)
+            if student is None:
+                continue
+            exact = exact_top_k(sid, k)
+            approx = self.top_k_partners(student, k, get_student, get_attractor)
+            hits += len({pid for pid, _ in exact} & {pid for pid, _ in approx})
+            if exact:
+                kth = exact[-1][1].overall
+                tied += sum(1 for _, score in approx if score.overall >= kth - self.TIE_TOLERANCE)
+            total += len(exact)
+            shortlist += len(self.candidates(student, get_attractor(sid)))
+        queried = max(len(sample_ids), 1)
+        return {
+            'k': k,
+            'queries': len(sample_ids),
+            'recall': round(hits / total, 4) if total else 1.0,
+            'score_recall': round(tied / total, 4) if total else 1.0,
+            'mean_shortlist': round(shortlist / queried, 1),
+            'indexed': len(self),
+        }
+
+
+# Singleton instance
+complement_index = ComplementIndex()
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from ..models.student import StudentProfile, AttractorState
+from .collision_scorer import CollisionScorer
+
+
+class Vocabulary:
+    """Interns string tokens to dense integer ids (0, 1, 2, ...)."""
+
+    def __init__(self, tokens: List[str] = None):
+        self.tokens: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for token in tokens or []:
+            self.intern(token)
+
+    def intern(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self._ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def lookup(self, token: str) -> Optional[int]:
+        """Id of an already-interned token, without growing the vocabulary."""
+        return self._ids.get(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+@dataclass(frozen=True)
+class StudentFeatures:
+    """Encoded scoring features for one student. All sets hold vocabulary ids."""
+    student_id: str
+    skills: FrozenSet[int]
+    interests: FrozenSet[int]
+    domains: FrozenSet[int]
+    visited: FrozenSet[int]
+    campus_visited: FrozenSet[int]
+    has_attractor: bool
+    revision: int
+
+
+class FeatureStore:
+    """
+    Per-student cache of interned scoring features.
+
+    Skills and interests are lowercased, interests are mapped through
+    CollisionScorer.DOMAIN_MAP and visited departments are split against
+    CAMPUS_DEPARTMENTS once per profile revision instead of on every
+    scoring call. Call invalidate() whenever a profile or attractor changes;
+    sync() picks up the changes other worker processes made.
+    """
+
+    def __init__(self):
+        self.skills = Vocabulary()
+        self.interests = Vocabulary()
+        self.domains = Vocabulary()
+        self.departments = Vocabulary(sorted(CollisionScorer.CAMPUS_DEPARTMENTS))
+        self.campus_departments: FrozenSet[int] = frozenset(
+            self.departments.lookup(d) for d in CollisionScorer.CAMPUS_DEPARTMENTS
+        )
+        self.version = 0
+        self._features: Dict[str, StudentFeatures] = {}
+        self._revisions: Dict[str, int] = {}
+        self._seq: Optional[int] = None
+
+    def sync(self, repo) -> Optional[Set[str]]:
+        """
+        Invalidate students written since the last sync, by this process or
+        another (Repository.students_changed_since), and return their ids.
+        On the first call, or when the change log no longer reaches back,
+        every cached feature is dropped and None is returned.
+        """
+        if self._seq is not None:
+            changes = repo.students_changed_since(self._seq)
+            if changes is not None:
+                changed, self._seq = changes
+                for student_id in changed:
+                    self.invalidate(student_id)
+                return changed
+        self._seq = repo.change_seq
+        for student_id in list(self._features):
+            self.invalidate(student_id)
+        self.version += 1
+        return None
+
+    def get(
+        self,
+        student: StudentProfile,
+        attractor: AttractorState = None
+    ) -> StudentFeatures:
+        features = self._features.get(student.id)
+        if features is None or (attractor is not None and not features.has_attractor):
+            features = self._encode(student, attractor)
+            self._features[student.id] = features
+        return features
+
+    def invalidate(self, student_id: str):
+        """Drop cached features after a profile or attractor update."""
+        self._features.pop(student_id, None)
+        self._revisions[student_id] = self._revisions.get(student_id, 0) + 1
+        self.version += 1
+
+    def revision(self, student_id: str) -> int:
+        return self._revisions.get(student_id, 0)
+
+    def department_id(self, name: str) -> Optional[int]:
+        return self.departments.lookup(name)
+
+    def _encode(self, student: StudentProfile, attractor: Optional[AttractorState]) -> StudentFeatures:
+        surface = {i.lower() for i in student.interests}
+        visited = frozenset(
+            self.departments.intern(d) for d in attractor.departments_visited
+        ) if attractor else frozenset()
+        return StudentFeatures(
+            student_id=student.id,
+            skills=frozenset(self.skills.intern(s.lower()) for s in student.skills),
+            interests=frozenset(self.interests.intern(i) for i in surface),
+            domains=frozenset(
+                self.domains.intern(CollisionScorer.DOMAIN_MAP.get(i, i)) for i in surface
+            ),
+            visited=visited,
+            campus_visited=visited & self.campus_departments,
+            has_attractor=attractor is not None,
+            revision=self.revision(student.id)
+        )
+
+
+# Singleton instance
+feature_store = FeatureStore()
@@ -1,6 +1,19 @@
-from typing import List
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
 from ..models.drift import DriftNudge
-from ..models.fingerprint import FingerprintAxes
+from ..models.fingerprint import FingerprintAxes, FingerprintCounters, SerendipityFingerprint
+from .metrics import metrics
+
+
+class DriftContribution(NamedTuple):
+    """What one drift adds to each FingerprintCounters field."""
+    meaningful: int
+    spontaneous: int
+    cross_departmental: int
+    social: int
+    creative: int
+    accepted_type: Optional[str]
+    meaningful_type: Optional[str]
 
 
 class FingerprintBuilder:
@@ -13,10 +26,18 @@ class FingerprintBuilder:
     Fingerprint Axis Score for axis k:
     F_k(s) = Σ(d ∈ H*_s) 1[d ∈ category_k]·o_d / (Σ(d ∈ H_s) 1[d ∈ category_k] + λ)
     λ = 2 (Laplace smoothing for cold start)
+
+    Every axis is a ratio of counts, so apply() keeps the counts on the
+    fingerprint and updates them with a constant-time delta per accept,
+    skip or outcome. build() remains the full rebuild for backfill and
+    verification.
     """
 
     LAPLACE_SMOOTHING = 2  # Cold start fix
+    CROSS_DEPT_TAGS = ('cross-departmental', 'cross-dept')
+    SOCIAL_TAGS = ('connection', 'collaboration', 'social')
 
+    @metrics.timed("fingerprint_builder.build")
     def build(self, drift_history: List[DriftNudge]) -> FingerprintAxes:
         meaningful = [
             d for d in drift_history
@@ -87,3 +108,103 @@ class FingerprintBuilder:
             exploratory=20,
             timing_flexibility=40
         )
+
+    # ── Incremental updates ──
+
+    def contribution(self, drift: DriftNudge) -> DriftContribution:
+        """Snapshot a drift's counter contribution (take it BEFORE mutating)."""
+        tags = drift.outcome.fingerprint_tags if drift.outcome else []
+        meaningful = bool(drift.outcome and drift.outcome.was_interesting)
+        accepted = drift.status == 'accepted'
+        return DriftContribution(
+            meaningful=int(meaningful),
+            spontaneous=int(accepted and drift.time_required_minutes < 30),
+            cross_departmental=int(meaningful and (
+                getattr(drift, 'crossed_department', False)
+                or any(t in tags for t in self.CROSS_DEPT_TAGS)
+            )),
+            social=int(meaningful and any(t in tags for t in self.SOCIAL_TAGS)),
+            creative=int(meaningful and 'creative' in tags),
+            accepted_type=drift.type if accepted else None,
+            meaningful_type=drift.type if meaningful else None
+        )
+
+    def apply(
+        self,
+        fingerprint: SerendipityFingerprint,
+        before: Optional[DriftContribution],
+        drift: DriftNudge,
+        load_history: Callable[[], List[DriftNudge]]
+    ) -> SerendipityFingerprint:
+        """
+        Apply one drift change in O(1). `before` is the drift's contribution
+        prior to the change (None for a newly generated drift). Call after
+        the drift is saved: a fingerprint without counters is backfilled
+        once from load_history(), which already reflects the change.
+        """
+        if fingerprint.counters is None:
+            fingerprint.counters = self.counters_from_history(load_history())
+        else:
+            counters = fingerprint.counters
+            if before is None:
+                counters.total += 1
+            else:
+                self._add(counters, before, -1)
+            self._add(counters, self.contribution(drift), 1)
+        return self._refresh(fingerprint)
+
+    def counters_from_history(self, drift_history: List[DriftNudge]) -> FingerprintCounters:
+        """Full rebuild of the running counters (backfill)."""
+        counters = FingerprintCounters(total=len(drift_history))
+        for drift in drift_history:
+            self._add(counters, self.contribution(drift), 1)
+        return counters
+
+    def axes_from_counters(self, counters: FingerprintCounters) -> FingerprintAxes:
+        """Same formulas as build(), evaluated on running counters."""
+        if counters.total == 0:
+            return self._default_fingerprint()
+
+        meaningful_denominator = max(counters.meaningful + self.LAPLACE_SMOOTHING, 1)
+        unique_types = sum(1 for n in counters.accepted_types.values() if n > 0)
+        return FingerprintAxes(
+            cross_departmental=round(counters.cross_departmental / meaningful_denominator * 100),
+            spontaneous=round(
+                counters.spontaneous / max(counters.total + self.LAPLACE_SMOOTHING, 1) * 100
+            ),
+            social=round(counters.social / meaningful_denominator * 100),
+            creative=round(counters.creative / meaningful_denominator * 100),
+            exploratory=round(min(unique_types / 6, 1.0) * 100),
+            timing_flexibility=round(0.65 * 100)  # simplified for MVP
+        )
+
+    def _add(self, counters: FingerprintCounters, contrib: DriftContribution, sign: int):
+        counters.meaningful += sign * contrib.meaningful
+        counters.spontaneous += sign * contrib.spontaneous
+        counters.cross_departmental += sign * contrib.cross_departmental
+        counters.social += sign * contrib.social
+        counters.creative += sign * contrib.creative
+        for bucket, drift_type in (
+            (counters.accepted_types, contrib.accepted_type),
+            (counters.meaningful_types, contrib.meaningful_type),
+        ):
+            if drift_type is None:
+                continue
+            remaining = bucket.get(drift_type, 0) + sign
+            if remaining > 0:
+                bucket[drift_type] = remaining
+            else:
+                bucket.pop(drift_type, None)
+
+    def _refresh(self, fingerprint: SerendipityFingerprint) -> SerendipityFingerprint:
+        counters = fingerprint.counters
+        fingerprint.axes = self.axes_from_counters(counters)
+        fingerprint.total_drifts = counters.total
+        fingerprint.meaningful_drifts = counters.meaningful
+        fingerprint.meaningful_rate = round(counters.meaningful / max(counters.total, 1), 3)
+        if counters.meaningful_types:
+            fingerprint.best_drift_type = max(
+                counters.meaningful_types, key=counters.meaningful_types.get
+            )
+        fingerprint.last_updated = datetime.utcnow()
+        return fingerprint
@@ -0,0 +1,464 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_SECONDS = metrics.histogram(
+    "karm_upstream_request_duration_seconds",
+    "OpenRouter call latency (to the full response, or to the first token when streaming).",
+    ["model", "mode", "outcome"]
+)
+
+
+class CircuitBreaker:
+    """
+    Per-model breaker. Opens after FAILURE_THRESHOLD consecutive failures
+    (or immediately on a 429) and skips the model for the cool-down; after
+    that a single trial request is let through (half-open).
+    """
+
+    FAILURE_THRESHOLD = 3
+    COOLDOWN_SECONDS = 60.0
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN_SECONDS, name: str = ""):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("circuit closed", extra={"model": self.name})
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self, rate_limited: bool = False):
+        self.failures += 1
+        trial = self._trial_in_flight
+        self._trial_in_flight = False
+        if rate_limited or self.failures >= self.failure_threshold or self.opened_at is not None:
+            if self.opened_at is None or trial:
+                logger.warning("circuit opened", extra={
+                    "model": self.name, "failures": self.failures, "rate_limited": rate_limited
+                })
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Cancelled attempt: neither success nor failure."""
+        self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Sliding window of recent successful latencies for the hedge delay."""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class UpstreamError(Exception):
+    def __init__(self, model: str, status_code: Optional[int] = None, detail: str = ""):
+        super().__init__(f"{model}: {status_code or detail}")
+        self.model = model
+        self.status_code = status_code
+
+
+class ThinkFilter:
+    """
+    Incremental <think>…</think> stripper for streamed text. Tags may be
+    split across chunks, so a possible partial tag at the end of a chunk is
+    held back until the next one arrives.
+
+    An unclosed <think> drops everything after it: the model was cut off
+    mid-reasoning, and a stream can't take back what it already withheld.
+    strip() applies the same rule to a complete (non-streamed) answer.
+    """
+
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self.buffer = ""
+        self.inside = False
+
+    @staticmethod
+    def _partial_suffix(text: str, tag: str) -> int:
+        """Length of the longest suffix of text that is a prefix of tag."""
+        for n in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:n]):
+                return n
+        return 0
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        out = []
+        while self.buffer:
+            tag = self.CLOSE if self.inside else self.OPEN
+            idx = self.buffer.find(tag)
+            if idx >= 0:
+                if not self.inside:
+                    out.append(self.buffer[:idx])
+                self.buffer = self.buffer[idx + len(tag):]
+                self.inside = not self.inside
+                continue
+            keep = self._partial_suffix(self.buffer, tag)
+            if not self.inside:
+                out.append(self.buffer[:len(self.buffer) - keep])
+            self.buffer = self.buffer[len(self.buffer) - keep:]
+            break
+        return "".join(out)
+
+    def flush(self) -> str:
+        tail = "" if self.inside else self.buffer
+        self.buffer = ""
+        return tail
+
+    @classmethod
+    def strip(cls, text: str) -> str:
+        think = cls()
+        return think.feed(text) + think.flush()
+
+
+class CompletionStream:
+    """
+    An open streamed completion that has already produced its first token.
+    Iterate for content deltas; raises UpstreamError if the upstream dies
+    mid-stream. Always aclose() it.
+    """
+
+    def __init__(self, model: str, response: httpx.Response, lines: AsyncIterator[str],
+                 first: str, breaker: "CircuitBreaker"):
+        self.model = model
+        self.response = response
+        self._lines = lines
+        self._first = first
+        self._breaker = breaker
+
+    async def __aiter__(self):
+        yield self._first
+        try:
+            async for delta in _sse_deltas(self.model, self._lines):
+                yield delta
+        except UpstreamError:
+            self._breaker.record_failure()
+            raise
+        except httpx.HTTPError as e:
+            self._breaker.record_failure()
+            raise UpstreamError(self.model, detail=str(e) or type(e).__name__) from e
+        self._breaker.record_success()
+
+    async def aclose(self):
+        await self.response.aclose()
+
+
+async def _sse_deltas(model: str, lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Content deltas from an OpenAI-style SSE stream; ends at [DONE]."""
+    async for line in lines:
+        if not line.startswith("data:"):
+            continue  # blank separators and ": keep-alive" comments
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            chunk = json.loads(data)
+        except ValueError as e:
+            raise UpstreamError(model, detail="malformed stream chunk") from e
+        if "error" in chunk:
+            error = chunk["error"] or {}
+            raise UpstreamError(model, error.get("code"), str(error.get("message", "")))
+        choices = chunk.get("choices") or [{}]
+        delta = (choices[0].get("delta") or {}).get("content")
+        if delta:
+            yield delta
+
+
+class OpenRouterClient:
+    """
+    Shared, connection-pooled OpenRouter client with hedged requests.
+
+    Models are tried in priority order, but instead of waiting out a full
+    timeout the next model is fired once the current attempt has run longer
+    than the observed p95 latency (or immediately when it fails); the first
+    success wins and the rest are cancelled. Models whose breaker is open
+    are skipped entirely.
+    """
+
+    MIN_SAMPLES = 20
+    DEFAULT_HEDGE_DELAY = 4.0
+    MIN_HEDGE_DELAY = 0.5
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str,
+        models: List[str],
+        timeout: float = 30.0,
+        headers: Dict[str, str] = None,
+        transport: httpx.AsyncBaseTransport = None
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.models = models
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.transport = transport
+        self.breakers = {m: CircuitBreaker(name=m) for m in models}
+        self.latency = LatencyTracker()
+        self.first_token = LatencyTracker()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    # ── Lifecycle ──
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                transport=self.transport
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # Used outside the app lifespan (scripts, TestClient without `with`)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=5.0), transport=self.transport
+            )
+        return self._client
+
+    def request_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            **self.headers
+        }
+
+    def hedge_delay(self, tracker: LatencyTracker = None) -> float:
+        tracker = tracker or self.latency
+        if len(tracker.samples) < self.MIN_SAMPLES:
+            return self.DEFAULT_HEDGE_DELAY
+        return max(tracker.percentile(0.95), self.MIN_HEDGE_DELAY)
+
+    # ── Requests ──
+
+    async def _attempt(self, model: str, payload: dict) -> Tuple[str, str]:
+        breaker = self.breakers[model]
+        started = time.perf_counter()
+        try:
+            resp = await self.client.post(self.url, headers=self.request_headers(), json=payload)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            raise UpstreamError(model, detail=str(e) or type(e).__name__) from e
+
+        if resp.status_code != 200:
+            breaker.record_failure(rate_limited=resp.status_code == 429)
+            raise UpstreamError(model, resp.status_code)
+        try:
+            content = resp.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            breaker.record_failure()
+            raise UpstreamError(model, detail="malformed response") from e
+
+        breaker.record_success()
+        self.latency.record(time.perf_counter() - started)
+        return model, content
+
+    async def _open_stream(self, model: str, payload: dict) -> CompletionStream:
+        """Start a streamed completion and wait for its first content token."""
+        breaker = self.breakers[model]
+        started = time.perf_counter()
+        request = self.client.build_request(
+            "POST", self.url, headers=self.request_headers(), json={**payload, "stream": True}
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            raise UpstreamError(model, detail=str(e) or type(e).__name__) from e
+
+        if response.status_code != 200:
+            await response.aclose()
+            breaker.record_failure(rate_limited=response.status_code == 429)
+            raise UpstreamError(model, response.status_code)
+        try:
+            lines = response.aiter_lines()
+            deltas = _sse_deltas(model, lines)
+            first = await deltas.__anext__()
+            await deltas.aclose()
+        except asyncio.CancelledError:
+            breaker.release()
+            await response.aclose()
+            raise
+        except Exception as e:
+            await response.aclose()
+            breaker.record_failure(rate_limited=getattr(e, "status_code", None) == 429)
+            if isinstance(e, UpstreamError):
+                raise
+            if isinstance(e, StopAsyncIteration):
+                raise UpstreamError(model, detail="empty stream") from None
+            raise UpstreamError(model, detail=str(e) or type(e).__name__) from e
+
+        self.first_token.record(time.perf_counter() - started)
+        return CompletionStream(model, response, lines, first, breaker)
+
+    async def complete(
+        self,
+        build_payload: Callable[[str], dict],
+        on_error: Callable[[UpstreamError], None] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Hedged completion across models. Returns (model, content) from the
+        first successful attempt, or None when every available model failed.
+        """
+        return await self._hedged(
+            lambda model: self._observed(model, "complete", self._attempt(model, build_payload(model))),
+            self.latency, on_error
+        )
+
+    async def stream(
+        self,
+        build_payload: Callable[[str], dict],
+        on_error: Callable[[UpstreamError], None] = None
+    ) -> Optional[CompletionStream]:
+        """
+        Hedged streamed completion: models race to their first token (hedged
+        on the observed time-to-first-token) and the winner's stream is
+        returned. None when no model produced a token.
+        """
+        return await self._hedged(
+            lambda model: self._observed(model, "stream", self._open_stream(model, build_payload(model))),
+            self.first_token, on_error, discard=lambda s: s.aclose()
+        )
+
+    @staticmethod
+    async def _observed(model: str, mode: str, call: Awaitable):
+        """Record one upstream call in UPSTREAM_SECONDS (hedge losers show up as cancelled)."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call
+            outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except UpstreamError as e:
+            if e.status_code == 429:
+                outcome = "rate_limited"
+            raise
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started, model, mode, outcome)
+
+    async def _hedged(
+        self,
+        start: Callable[[str], Awaitable],
+        tracker: LatencyTracker,
+        on_error: Callable[[UpstreamError], None] = None,
+        discard: Callable[[object], Awaitable] = None
+    ):
+        queue = list(self.models)
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch():
+            # Breakers are consulted lazily so a half-open trial slot is only
+            # taken by a model that is actually called
+            while queue:
+                model = queue.pop(0)
+                if self.breakers[model].allow():
+                    task = asyncio.ensure_future(start(model))
+                    running[task] = model
+                    return
+
+        launch()
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.hedge_delay(tracker) if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = None
+                for task in done:
+                    running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if winner is None:
+                            winner = task.result()
+                        elif discard:
+                            await discard(task.result())
+                    elif on_error and isinstance(error, UpstreamError):
+                        on_error(error)
+                if winner is not None:
+                    return winner
+                # Nothing succeeded: hedge after the delay, or fall through on failure
+                launch()
+            return None
+        finally:
+            cancelled = []
+            for task in running:
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    # Finished in the same tick as the winner
+                    if discard:
+                        await discard(task.result())
+                else:
+                    task.cancel()
+                    cancelled.append(task)
+            # Let the losers unwind (release connections, record metrics) before returning
+            await asyncio.gather(*cancelled, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            "hedge_delay": round(self.hedge_delay(), 3),
+            "p95_latency": self.latency.percentile(0.95),
+            "stream_hedge_delay": round(self.hedge_delay(self.first_token), 3),
+            "p95_first_token": self.first_token.percentile(0.95),
+            "breakers": {
+                m: {"state": b.state, "failures": b.failures} for m, b in self.breakers.items()
+            },
+        }
@@ -0,0 +1,156 @@
+"""
+Structured logging — JSON lines written by a background thread. Request
+handlers only copy the record onto a bounded queue (a full queue drops the
+record and counts it rather than blocking); a QueueListener thread formats
+and writes. Every record logged under the `app` logger carries the current
+request id, set per request by RequestIdMiddleware.
+
+    KARM_LOG_LEVEL=INFO             # DEBUG to enable (sampled) debug lines
+    KARM_LOG_DEBUG_SAMPLE=0.01      # fraction of requests whose debug lines are kept
+    KARM_LOG_FORMAT=json            # or text, for reading locally
+    KARM_LOG_QUEUE_SIZE=10000       # records buffered before dropping
+
+Modules log with logging.getLogger(__name__) and put structured fields in
+`extra`: logger.info("drift generated", extra={"student_id": sid}).
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .metrics import metrics
+
+ROOT_LOGGER = "app"
+
+request_id: ContextVar[Optional[str]] = ContextVar("karm_request_id", default=None)
+
+DROPPED = metrics.counter(
+    "karm_log_records_dropped_total", "Log records dropped because the log queue was full."
+)
+
+# LogRecord attributes; anything else on a record came from `extra`
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, request_id, extras, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        rid = getattr(record, "request_id", None)
+        if rid is not None:
+            entry["request_id"] = rid
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        text = super().format(record)
+        extras = {k: v for k, v in record.__dict__.items() if k not in _RESERVED}
+        return f"{text} {json.dumps(extras, default=str)}" if extras else text
+
+
+class DebugSampler(logging.Filter):
+    """
+    Passes every INFO-and-above record and a `rate` fraction of DEBUG ones.
+    Inside a request the choice is made per request id (a CRC of it), so a
+    sampled request keeps all of its debug lines and the rest keep none.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self._threshold = int(rate * 2 ** 32)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        rid = request_id.get()
+        if rid is None:
+            return random.random() < self.rate
+        return zlib.crc32(rid.encode()) < self._threshold
+
+
+class _EnqueueHandler(QueueHandler):
+    """
+    Runs on the logging thread: resolves the message, the request id and
+    any traceback (they depend on call-time state), then enqueues without
+    waiting. Formatting proper happens on the listener thread.
+    """
+
+    _traceback = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._traceback.formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED.inc()
+
+
+class LogPipeline:
+    """Queue, enqueueing handler and writer thread for the `app` logger tree."""
+
+    def __init__(self):
+        self.level = os.environ.get("KARM_LOG_LEVEL", "INFO").upper()
+        self.debug_sample = float(os.environ.get("KARM_LOG_DEBUG_SAMPLE", "0.01") or 0.01)
+        self.format = os.environ.get("KARM_LOG_FORMAT", "json")
+        self.queue: queue.Queue = queue.Queue(int(os.environ.get("KARM_LOG_QUEUE_SIZE", "10000") or 10000))
+        self.handler = _EnqueueHandler(self.queue)
+        self.handler.addFilter(DebugSampler(self.debug_sample))
+        self.output = logging.StreamHandler(sys.stderr)
+        self.output.setFormatter(TextFormatter() if self.format == "text" else JSONFormatter())
+        self._listener: Optional[QueueListener] = None
+
+    def start(self):
+        """Attach to the `app` logger and start the writer thread (idempotent)."""
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.setLevel(self.level)
+        logger.propagate = False
+        if self.handler not in logger.handlers:
+            logger.addHandler(self.handler)
+        if self._listener is None:
+            self._listener = QueueListener(self.queue, self.output)
+            self._listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+# Singleton instance
+log_pipeline = LogPipeline()
@@ -0,0 +1,242 @@
+"""
+Memory accounting — approximate deep sizes of the db collections and the
+in-process caches, and on-demand tracemalloc snapshot diffs for leak
+hunting. Both back the /api/admin/memory endpoints.
+
+Sizes are sys.getsizeof summed over everything reachable, so they include
+interpreter overhead (dict slots, object headers) that a serialized size
+would not. Containers larger than the sample size are extrapolated from a
+random sample of their members, which keeps a report over millions of
+drifts under a tenth of a second. Sampled figures lean high: an object
+shared by a few members (copies of one template) or already counted under
+another entry is charged to every sampled member that reaches it. Pass a
+sample larger than the biggest collection for an exact, slow walk.
+"""
+import gc
+import random
+import sys
+import tracemalloc
+from collections import deque
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+DEFAULT_SAMPLE = 256
+
+# Shared with the rest of the process, not owned by any one structure
+_SKIP = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+_LEAVES = (str, bytes, bytearray, int, float, complex, bool, type(None), np.ndarray, np.generic)
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    names: List[str] = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in ("__dict__", "__weakref__"))
+
+
+class _SampleFrame:
+    """Bookkeeping for one sampled container: who first reached each object."""
+
+    def __init__(self):
+        self.member = 0
+        self.first: Dict[int, Tuple[int, int]] = {}  # id -> (member, shallow size)
+        self.shared: Set[int] = set()
+
+
+class SizeEstimator:
+    """
+    Deep sizes that share one `seen` set, so an object reachable from two
+    measured roots is counted once, under the first. `items` counts the
+    top-level members of a root container.
+
+    When a container is sampled, bytes reached from one sampled member are
+    scaled up to the container's length, but objects reached from two or
+    more (interned field names, shared defaults) are counted once: scaling
+    those would multiply a single object by the scale factor.
+    """
+
+    def __init__(self, sample: int = DEFAULT_SAMPLE, seed: int = 0):
+        self.sample = sample
+        self.rng = random.Random(seed)
+        self._seen: Set[int] = set()
+        self._frames: List[_SampleFrame] = []
+
+    def measure(self, root: object) -> Dict:
+        size, sampled = self._size(root)
+        items = len(root) if isinstance(root, (dict, list, tuple, set, frozenset, deque)) else None
+        return {"items": items, "bytes": int(size), "sampled": sampled}
+
+    def _size(self, obj: object) -> Tuple[float, bool]:
+        if isinstance(obj, _SKIP):
+            return 0, False
+        frame = self._frames[-1] if self._frames else None
+        if id(obj) in self._seen:
+            if frame is not None and id(obj) in frame.first and frame.first[id(obj)][0] != frame.member:
+                frame.shared.add(id(obj))
+            return 0, False
+        self._seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if frame is not None:
+            frame.first[id(obj)] = (frame.member, size)
+        if isinstance(obj, _LEAVES):
+            return size, False  # an ndarray's getsizeof includes the buffer it owns
+
+        if isinstance(obj, dict):
+            members = list(obj)  # keys; no per-item tuples on a dict of millions
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            members = list(obj)
+        else:
+            members = [getattr(obj, name) for name in _slot_names(type(obj)) if hasattr(obj, name)]
+            attrs = getattr(obj, "__dict__", None)
+            if attrs is not None:
+                members.append(attrs)
+        pairs = obj if isinstance(obj, dict) else None
+
+        if len(members) <= self.sample:
+            subtotal, sampled = 0.0, False
+            for member in members:
+                for part in ((member, pairs[member]) if pairs is not None else (member,)):
+                    part_size, part_sampled = self._size(part)
+                    subtotal += part_size
+                    sampled = sampled or part_sampled
+            return size + subtotal, sampled
+
+        scale = len(members) / self.sample
+        frame = _SampleFrame()
+        self._frames.append(frame)
+        subtotal = 0.0
+        try:
+            for index, member in enumerate(self.rng.sample(members, self.sample)):
+                frame.member = index
+                for part in ((member, pairs[member]) if pairs is not None else (member,)):
+                    subtotal += self._size(part)[0]
+        finally:
+            self._frames.pop()
+        shared = sum(frame.first[i][1] for i in frame.shared)
+        return size + (subtotal - shared) * scale + shared, True
+
+
+def memory_report(groups: Dict[str, Dict[str, object]], sample: int = DEFAULT_SAMPLE) -> Dict:
+    """
+    {group: {name: {items, bytes, sampled}}} for the given roots, measured in
+    order with shared objects counted once, plus per-group totals.
+    """
+    estimator = SizeEstimator(sample)
+    report: Dict = {"sample": sample, "groups": {}}
+    # The walk only reads, but its temporaries would trigger full
+    # collections over a heap of millions of tracked objects
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for group, roots in groups.items():
+            sizes = {name: estimator.measure(root) for name, root in roots.items()}
+            report["groups"][group] = {
+                "total_bytes": sum(entry["bytes"] for entry in sizes.values()),
+                "entries": sizes,
+            }
+    finally:
+        if collecting:
+            gc.enable()
+    report["total_bytes"] = sum(group["total_bytes"] for group in report["groups"].values())
+    report["process"] = process_memory()
+    return report
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident set size now and at peak (bytes), where the platform reports them."""
+    rss = peak = None
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    value = int(line.split()[1]) * 1024
+                    if line.startswith("VmRSS:"):
+                        rss = value
+                    else:
+                        peak = value
+    except OSError:
+        pass
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+class TracemallocSession:
+    """
+    start() begins tracing and takes a baseline snapshot; diff() compares a
+    fresh snapshot against it (largest growth first); snapshot() moves the
+    baseline forward. Tracing slows allocation-heavy code several-fold, so
+    it stays off until an operator starts it and should be stopped after.
+    """
+
+    IGNORED = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.IGNORED)
+
+    def status(self) -> Dict:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit() if self.tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if self.tracing else 0,
+        }
+
+    def start(self, frames: int = 1) -> Dict:
+        if not self.tracing:
+            tracemalloc.start(frames)
+        self._baseline = self._take()
+        return self.status()
+
+    def snapshot(self) -> Dict:
+        """Make the current state the new baseline."""
+        if not self.tracing:
+            raise RuntimeError("tracemalloc is not tracing")
+        self._baseline = self._take()
+        return self.status()
+
+    def diff(self, limit: int = 25, key_type: str = "lineno") -> Dict:
+        """Top allocation sites by growth since the baseline."""
+        if not self.tracing or self._baseline is None:
+            raise RuntimeError("tracemalloc is not tracing")
+        stats = self._take().compare_to(self._baseline, key_type)
+        return {
+            **self.status(),
+            "key_type": key_type,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_stat_dict(stat) for stat in stats[:limit]],
+        }
+
+    def stop(self) -> Dict:
+        self._baseline = None
+        tracemalloc.stop()
+        return self.status()
+
+
+def _stat_dict(stat: tracemalloc.StatisticDiff) -> Dict:
+    return {
+        "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_bytes": stat.size,
+        "size_diff_bytes": stat.size_diff,
+        "count": stat.count,
+        "count_diff": stat.count_diff,
+    }
+
+
+# Singleton instance
+tracemalloc_session = TracemallocSession()
@@ -0,0 +1,193 @@
+"""
+In-process metrics — labelled counters and fixed-bucket histograms, timing
+spans for the engines, and Prometheus text exposition for GET /metrics.
+
+Recording is a dict lookup, a bisect and two adds; series are created on
+first use. There are no locks: handlers run on one event loop, and a lost
+update from a worker thread would only skew a count by one.
+"""
+import time
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+# Seconds; covers sub-millisecond engine spans up to slow upstream calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Sample(NamedTuple):
+    """One value reported by a collector at scrape time."""
+    name: str
+    kind: str  # 'counter' | 'gauge'
+    help: str
+    labels: Dict[str, str]
+    value: float
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for values, total in sorted(self._values.items()):
+            labels = _label_text(self.labels, values)
+            lines.append(f"{self.name}{{{labels}}} {_number(total)}" if labels else f"{self.name} {_number(total)}")
+        return lines
+
+
+class Histogram:
+    """
+    Per series: one non-cumulative count per bucket (plus +Inf) and the sum,
+    in a single list; render() accumulates the counts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+        for values, series in sorted(self._series.items()):
+            labels = _label_text(self.labels, values)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms plus collectors — callables polled at
+    scrape time that turn existing stats() dicts (caches, breakers) into
+    samples, so those components don't have to record anything twice.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self.spans = self.histogram(
+            "karm_span_duration_seconds", "Time spent in instrumented engine calls.", ["span"]
+        )
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help, labels)
+        return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help, labels, buckets)
+        return self._metrics[name]
+
+    def collector(self, collect: Callable[[], Iterable[Sample]]):
+        """Register a scrape-time collector (usable as a decorator)."""
+        self._collectors.append(collect)
+        return collect
+
+    def timed(self, span: str):
+        """Decorator recording each call's duration as karm_span_duration_seconds{span=...}."""
+        def decorate(fn):
+            observe = self.spans.observe
+            if iscoroutinefunction(fn):
+                @wraps(fn)
+                async def timed_async(*args, **kwargs):
+                    started = time.perf_counter()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        observe(time.perf_counter() - started, span)
+                return timed_async
+
+            @wraps(fn)
+            def timed_sync(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - started, span)
+            return timed_sync
+        return decorate
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        grouped: Dict[str, Tuple[str, str, List[Sample]]] = {}
+        for collect in self._collectors:
+            for sample in collect():
+                grouped.setdefault(sample.name, (sample.kind, sample.help, []))[2].append(sample)
+        for name, (kind, help, samples) in grouped.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels = _label_text(sample.labels.keys(), sample.labels.values())
+                lines.append(f"{name}{{{labels}}} {_number(sample.value)}" if labels else f"{name} {_number(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+metrics = MetricsRegistry()
@@ -1,3 +1,4 @@
+import logging
 import random
 import uuid
 from datetime import datetime
@@ -7,21 +8,27 @@ from ..models.student import StudentProfile, AttractorState
 from ..models.drift import DriftNudge, DriftReasoning
 from ..models.event import CampusEvent, DiscoverySlot
 from ..models.fingerprint import SerendipityFingerprint
+from .bandit import DriftBandit, HistoryLoader, drift_bandit
+from .candidate_pool import CandidatePool
 from .collision_scorer import CollisionScorer
+from .feature_store import feature_store
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 
 class NudgeEngine:
     """
-    Multi-Armed Bandit (Epsilon-Greedy) nudge selector.
-    Balances exploitation (known good drift types)
-    vs exploration (trying new drift types).
+    Multi-Armed Bandit nudge selector. The drift type is chosen by
+    per-student contextual Thompson sampling (DriftBandit), which balances
+    exploitation (types that led to interesting outcomes) against
+    exploration (types with few pulls) without a fixed epsilon.
 
     Uses Minimum Effective Drift (MED) formulation:
     MED(s) = argmin_d ||d||_friction  s.t.  ΔB(s,d) ≥ ε
     """
 
-    EPSILON = 0.2  # 20% pure exploration
-    DRIFT_TYPES = ['canteen', 'event', 'route', 'space']
+    DRIFT_TYPES = list(DriftBandit.ARMS)
 
     SAMPLE_DRIFTS = [
         {
@@ -74,34 +81,52 @@ class NudgeEngine:
         }
     ]
 
-    def __init__(self):
+    def __init__(self, bandit: DriftBandit = None):
         self.scorer = CollisionScorer()
+        self.features = feature_store
+        self.bandit = bandit or drift_bandit
 
+    @metrics.timed("nudge_engine.generate_daily_drift")
     def generate_daily_drift(
         self,
         student: StudentProfile,
         attractor: AttractorState,
         fingerprint: SerendipityFingerprint,
         available_events: List[CampusEvent] = None,
-        available_slots: List[DiscoverySlot] = None
+        available_slots: List[DiscoverySlot] = None,
+        drift_type: Optional[str] = None,
+        load_history: HistoryLoader = None,
+        pool: CandidatePool = None
     ) -> DriftNudge:
-        """Generate a single drift nudge for today."""
-
-        # Filter candidates by constraints
-        candidates = self._apply_constraints(
-            student, available_events or [], available_slots or []
-        )
-
-        # Epsilon-greedy selection
-        if random.random() < self.EPSILON:
-            drift_data = self._explore(student, attractor)
-        else:
-            drift_data = self._exploit(fingerprint, attractor)
+        """
+        Generate a single drift nudge for today. Candidates come from `pool`
+        (the day's cached CandidatePool) or are indexed from
+        available_events/available_slots; SAMPLE_DRIFTS is the fallback when
+        no live candidate of the chosen type fits. `drift_type` skips the
+        bandit (batch jobs select arms for all students up front).
+        """
+        if pool is None and (available_events or available_slots):
+            pool = CandidatePool(available_events or [], available_slots or [])
+
+        # Thompson-sampled drift type for the current time of day
+        if drift_type is None:
+            drift_type = self.bandit.select(
+                [student.id],
+                when=datetime.utcnow(),
+                preferred=[fingerprint.best_drift_type if fingerprint else None],
+                available=pool.available(student.time_budget_minutes, student.free_only) if pool else None,
+                load_history=load_history
+            )[0]
+        drift_data = self._pick(drift_type, student, pool)
 
         # Build reasoning
-        reasoning = self._build_reasoning(student, attractor, drift_data)
+        features = self.features.get(student, attractor)
+        reasoning = self._build_reasoning(features, drift_data)
 
         collision_score = random.uniform(65, 98)
+        logger.debug("drift generated", extra={
+            "student_id": student.id, "drift_type": drift_type, "drift_title": drift_data['title']
+        })
 
         return DriftNudge(
             id=str(uuid.uuid4()),
@@ -113,41 +138,25 @@ class NudgeEngine:
             time=drift_data['time'],
             collision_potential_score=round(collision_score, 1),
             reasoning=reasoning,
-            is_free=True,
+            is_free=drift_data.get('is_free', True),
             time_required_minutes=drift_data['time_required_minutes'],
             created_at=datetime.utcnow(),
             status='pending'
         )
 
-    def _apply_constraints(self, student, events, slots):
-        filtered = []
-        for event in events:
-            if student.free_only and not event.is_free:
-                continue
-            if event.duration_minutes > student.time_budget_minutes:
-                continue
-            filtered.append(event)
-        return filtered
-
-    def _explore(self, student, attractor):
-        """Pick from categories student has NEVER tried."""
-        tried_types = set()
-        # Simplified: pick a random type that fills a gap
-        untried = [t for t in self.DRIFT_TYPES if t not in tried_types]
-        target_type = random.choice(untried if untried else self.DRIFT_TYPES)
-        candidates = [d for d in self.SAMPLE_DRIFTS if d['type'] == target_type]
-        return random.choice(candidates) if candidates else random.choice(self.SAMPLE_DRIFTS)
-
-    def _exploit(self, fingerprint, attractor):
-        """Pick best known drift type for this fingerprint."""
-        best_type = fingerprint.best_drift_type if fingerprint else 'canteen'
-        candidates = [d for d in self.SAMPLE_DRIFTS if d['type'] == best_type]
+    def _pick(self, drift_type: str, student: StudentProfile, pool: Optional[CandidatePool]):
+        """A concrete drift of the bandit's chosen type that fits the student's constraints."""
+        if pool is not None:
+            candidate = pool.pick(drift_type, student.time_budget_minutes, student.free_only)
+            if candidate is not None:
+                return candidate
+        candidates = [d for d in self.SAMPLE_DRIFTS if d['type'] == drift_type]
         return random.choice(candidates) if candidates else random.choice(self.SAMPLE_DRIFTS)
 
-    def _build_reasoning(self, student, attractor, drift_data) -> DriftReasoning:
-        dept = drift_data.get('location', 'this area').split('—')[0].strip()
-        visited = attractor.departments_visited if attractor else []
-        days = 47 if dept not in visited else random.randint(3, 15)
+    def _build_reasoning(self, features, drift_data) -> DriftReasoning:
+        dept = drift_data.get('department') or drift_data.get('location', 'this area').split('—')[0].strip()
+        dept_id = self.features.department_id(dept)
+        days = 47 if dept_id not in features.visited else random.randint(3, 15)
 
         return DriftReasoning(
             gap_description=f"Your profile hasn't intersected with {dept} in {days} days",
@@ -0,0 +1,161 @@
+"""
+Opt-in request profiling — a SIGPROF stack sampler and a bounded on-disk
+ring of collapsed-stack profiles (the input format of flamegraph.pl and
+speedscope). Used by ProfilingMiddleware, which is only installed when
+KARM_PROFILING=1, so a disabled profiler costs nothing per request.
+
+    KARM_PROFILING=1                # install the middleware
+    KARM_PROFILE_SAMPLE_RATE=0.01   # profile 1% of requests (default 0)
+    KARM_ADMIN_TOKEN=...            # X-Karm-Profile: <token> profiles one request
+    KARM_PROFILE_DIR=profiles       # ring directory
+    KARM_PROFILE_KEEP=50            # profiles kept
+    KARM_PROFILE_INTERVAL_MS=2      # CPU time between samples
+"""
+import json
+import os
+import re
+import signal
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+PROFILE_ID = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+
+
+class StackSampler:
+    """
+    Samples the main thread's Python stack every `interval` seconds of
+    process CPU time (ITIMER_PROF). Stacks are kept as tuples of code
+    objects and only formatted on stop(), so a sample is one frame walk
+    and a Counter update. One sampler runs at a time per process (the
+    timer is process-wide); it is unavailable off the main thread and on
+    platforms without setitimer.
+    """
+
+    MAX_DEPTH = 128
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._installed = False
+        self.active = False
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def start(self) -> bool:
+        """Begin sampling; False when another profile is running or sampling is unavailable."""
+        if not self.available() or not self._lock.acquire(blocking=False):
+            return False
+        self._samples = Counter()
+        self.active = True
+        if not self._installed:
+            # Installed once and left in place: a SIGPROF still in flight
+            # after stop() must not hit the default action (terminate)
+            signal.signal(signal.SIGPROF, self._sample)
+            self._installed = True
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return True
+
+    def stop(self) -> Dict[str, int]:
+        """Stop sampling and return {collapsed stack: samples}."""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        self.active = False
+        samples, self._samples = self._samples, Counter()
+        self._lock.release()
+        return {
+            ";".join(_frame_label(code) for code in reversed(stack)): count
+            for stack, count in samples.items()
+        }
+
+    def _sample(self, signum: int, frame: Optional[FrameType]):
+        if not self.active:
+            return
+        stack: List[CodeType] = []
+        while frame is not None and len(stack) < self.MAX_DEPTH:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self._samples[tuple(stack)] += 1
+
+
+def _frame_label(code: CodeType) -> str:
+    path = code.co_filename
+    for marker in ("site-packages/", "backend/"):
+        cut = path.rfind(marker)
+        if cut >= 0:
+            path = path[cut + len(marker):]
+            break
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({path}:{code.co_firstlineno})"
+
+
+class ProfileStore:
+    """
+    Ring of the newest `keep` profiles in `directory`: <id>.collapsed holds
+    the stacks, <id>.json the request metadata. Ids start with a millisecond
+    timestamp, so name order is age order.
+    """
+
+    def __init__(self, directory: str, keep: int = 50):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, stacks: Dict[str, int], meta: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1])]
+        (self.directory / f"{profile_id}.collapsed").write_text("\n".join(lines) + "\n")
+        meta = {**meta, "id": profile_id, "samples": sum(stacks.values())}
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(meta))
+        self._prune()
+
+    def _ids(self) -> List[str]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(p.stem for p in self.directory.glob("*.json") if PROFILE_ID.match(p.stem))
+
+    def _prune(self):
+        ids = self._ids()
+        for profile_id in ids[:max(len(ids) - self.keep, 0)]:
+            for suffix in (".collapsed", ".json"):
+                (self.directory / f"{profile_id}{suffix}").unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        """Metadata of the stored profiles, newest first."""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                profiles.append(json.loads((self.directory / f"{profile_id}.json").read_text()))
+            except (OSError, ValueError):
+                continue  # pruned or half-written meanwhile
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        """The collapsed-stack file of a stored profile (None for unknown or malformed ids)."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.collapsed"
+        return path if path.is_file() else None
+
+
+class ProfilingSettings:
+    def __init__(self):
+        self.enabled = os.environ.get("KARM_PROFILING", "") == "1"
+        self.sample_rate = float(os.environ.get("KARM_PROFILE_SAMPLE_RATE", "0") or 0)
+        self.interval = float(os.environ.get("KARM_PROFILE_INTERVAL_MS", "2") or 2) / 1000
+        self.directory = os.environ.get("KARM_PROFILE_DIR", "profiles")
+        self.keep = int(os.environ.get("KARM_PROFILE_KEEP", "50") or 50)
+
+
+# Singleton instances
+profiling_settings = ProfilingSettings()
+profile_store = ProfileStore(profiling_settings.directory, profiling_settings.keep)
+stack_sampler = StackSampler(profiling_settings.interval)
@@ -0,0 +1,112 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-, punctuation- and spacing-insensitive form: "What's on tonight?" -> "whats on tonight"."""
+    return WHITESPACE.sub(" ", PUNCTUATION.sub("", query.lower())).strip()
+
+
+def fingerprint(parts: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for chat answers, bounded by entry count and by the
+    total size of the stored text.
+
+    Entries are tagged with the campus data version they were computed
+    against; the first lookup under a newer version drops everything, so
+    answers never outlive the events/slots they describe.
+    """
+
+    MAX_ENTRIES = 1024
+    MAX_BYTES = 2 * 1024 * 1024
+    TTL_SECONDS = 600.0
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES,
+                 ttl_seconds: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, size in bytes, value), oldest use first
+        self._bytes = 0
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(query: str, context: str, history: Iterable[str] = ()) -> str:
+        return fingerprint([normalize_query(query), context, *history])
+
+    def _sync_version(self, version: int):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    def get(self, key: str, version: int) -> Optional[str]:
+        self._sync_version(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, version: int, value: str):
+        self._sync_version(version)
+        size = len(value.encode())
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "campus_version": self.version,
+        }
@@ -0,0 +1,199 @@
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty): constant memory, ~1/k
+    rank error, mergeable.
+
+    Level h is a compactor holding items of weight 2^h. When the sketch is
+    full, the lowest over-capacity level is sorted and every other item
+    (random offset) is promoted one level up. Capacities shrink by C per
+    level below the top, so the footprint stays O(k) however many values
+    are added.
+    """
+
+    C = 2 / 3
+    DEFAULT_K = 200
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None):
+        self.k = k
+        self.levels: List[List[float]] = [[]]
+        self.n = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.C ** depth)))
+
+    def _grow(self):
+        self.levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    # ── Writes ──
+
+    def update(self, value: float):
+        value = float(value)
+        self.levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for h in range(len(self.levels)):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 >= len(self.levels):
+                    self._grow()
+                items = sorted(self.levels[h])
+                # An odd item out stays behind at this level
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[h + 1].extend(items[self._rng.randint(0, 1)::2])
+                self.levels[h] = keep
+                self._size = sum(len(level) for level in self.levels)
+                if self._size < self._max_size:
+                    break
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold `other` into this sketch (in place); both must share k."""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._size = sum(len(level) for level in self.levels)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    # ── Reads ──
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted((v, 1 << h) for h, level in enumerate(self.levels) for v in level)
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        qs = list(qs)
+        items = self._weighted()
+        if not items:
+            return [None] * len(qs)
+        total = sum(w for _, w in items)
+        out = []
+        for q in qs:
+            target, cumulative = q * total, 0
+            value = items[-1][0]
+            for v, w in items:
+                cumulative += w
+                if cumulative >= target:
+                    value = v
+                    break
+            out.append(value)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def histogram(self, edges: List[float]) -> List[int]:
+        """Estimated counts per [edges[i], edges[i+1]) bin (last bin closed)."""
+        counts = [0] * (len(edges) - 1)
+        for v, w in self._weighted():
+            if v < edges[0] or v > edges[-1]:
+                continue
+            i = min(self._bisect(edges, v), len(counts) - 1)
+            counts[i] += w
+        return counts
+
+    @staticmethod
+    def _bisect(edges: List[float], v: float) -> int:
+        lo, hi = 0, len(edges) - 1
+        while lo < hi - 1:
+            mid = (lo + hi) // 2
+            if v >= edges[mid]:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    # ── Serialization (cross-worker merge) ──
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "n": self.n, "min": self.min, "max": self.max, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        sketch = cls(k=data["k"])
+        sketch.levels = [[float(v) for v in level] for level in data["levels"]] or [[]]
+        sketch.n = data["n"]
+        sketch.min, sketch.max = data["min"], data["max"]
+        sketch._size = sum(len(level) for level in sketch.levels)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.levels)))
+        return sketch
+
+
+class LiveMetrics:
+    """
+    Named KLL sketches for dashboard metrics, fed by the drift routes one
+    observation at a time (no scans). export() / merged() combine the
+    state of several workers or shards.
+    """
+
+    METRICS = ("bubble_percentage", "drift_score", "collision_potential", "acceptance_latency_seconds")
+    QUANTILES = (0.5, 0.9, 0.95, 0.99)
+    HISTOGRAM_BINS = 10
+
+    def __init__(self, k: int = KLLSketch.DEFAULT_K):
+        self.k = k
+        self.sketches: Dict[str, KLLSketch] = {name: KLLSketch(k) for name in self.METRICS}
+
+    def observe(self, metric: str, value: float):
+        self.sketches[metric].update(value)
+
+    def summary(self) -> Dict:
+        return {name: self._summarize(sketch) for name, sketch in self.sketches.items()}
+
+    def _summarize(self, sketch: KLLSketch) -> Dict:
+        if not sketch.n:
+            return {"count": 0}
+        lo, hi = sketch.min, sketch.max
+        step = (hi - lo) / self.HISTOGRAM_BINS or 1.0
+        edges = [lo + i * step for i in range(self.HISTOGRAM_BINS + 1)]
+        edges[-1] = max(hi, edges[-1])  # lo + n·step can round below max, which would drop it
+        return {
+            "count": sketch.n,
+            "min": lo,
+            "max": hi,
+            **{f"p{round(q * 100)}": v for q, v in zip(self.QUANTILES, sketch.quantiles(self.QUANTILES))},
+            "histogram": {"edges": [round(e, 3) for e in edges], "counts": sketch.histogram(edges)},
+        }
+
+    def export(self) -> Dict:
+        return {name: sketch.to_dict() for name, sketch in self.sketches.items()}
+
+    @classmethod
+    def merged(cls, states: Iterable[Dict]) -> "LiveMetrics":
+        """Combine exported states (e.g. one per worker) into one LiveMetrics."""
+        combined = cls()
+        for state in states:
+            for name, data in state.items():
+                if name in combined.sketches:
+                    combined.sketches[name].merge(KLLSketch.from_dict(data))
+        return combined
+
+
+# Singleton instance
+live_metrics = LiveMetrics()
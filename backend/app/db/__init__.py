@@ -1 +1,2 @@
-from .database import db
+from .database import db, InMemoryDB, create_db
+from .repository import Repository
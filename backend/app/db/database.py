@@ -1,15 +1,18 @@
 """
-In-memory database for MVP/demo. Replace with SQLite + SQLModel in production.
+In-memory database for tests/demo. Set KARM_DB_BACKEND=sqlite (and optionally
+KARM_DB_PATH) to use the durable SQLite backend instead.
 """
-from datetime import datetime
-from typing import Dict, List, Optional
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..models.student import StudentProfile, AttractorState
 from ..models.drift import DriftNudge
 from ..models.event import CampusEvent, DiscoverySlot
-from ..models.fingerprint import SerendipityFingerprint, FingerprintAxes
+from ..models.fingerprint import SerendipityFingerprint
+from .repository import Repository
 
 
-class InMemoryDB:
+class InMemoryDB(Repository):
     def __init__(self):
         self.students: Dict[str, StudentProfile] = {}
         self.attractors: Dict[str, AttractorState] = {}
@@ -18,106 +21,149 @@ class InMemoryDB:
         self.fingerprints: Dict[str, SerendipityFingerprint] = {}
         self.events: List[CampusEvent] = []
         self.discovery_slots: List[DiscoverySlot] = []
+        # id -> list position, kept in step with the lists by save_events/save_slots
+        self._event_positions: Dict[str, int] = {}
+        self._slot_positions: Dict[str, int] = {}
+        self.pregenerated: Dict[Tuple[str, date], DriftNudge] = {}
         self._seed_data()
 
-    def _seed_data(self):
-        """Seed with demo data."""
-        # Demo student
-        demo = StudentProfile(
-            id='stu-001',
-            name='Aryan Sharma',
-            department='Computer Science',
-            year=2,
-            skills=['Python', 'React', 'Machine Learning'],
-            interests=['AI', 'Music', 'Photography', 'Startups'],
-            time_budget_minutes=45,
-            free_only=False,
-            drift_score=247,
-            drift_streak=4
-        )
-        self.students[demo.id] = demo
-
-        self.attractors[demo.id] = AttractorState(
-            student_id=demo.id,
-            departments_visited=['CS', 'Mathematics'],
-            canteen_counters_used=['Counter 2', 'Counter 5'],
-            event_types_attended=['Technical Talk'],
-            new_connections_count=0,
-            content_domains_explored=['Programming', 'AI/ML', 'Web Dev']
-        )
-
-        self.fingerprints[demo.id] = SerendipityFingerprint(
-            student_id=demo.id,
-            axes=FingerprintAxes(
-                cross_departmental=35,
-                spontaneous=45,
-                social=20,
-                creative=40,
-                exploratory=30,
-                timing_flexibility=60
-            ),
-            total_drifts=12,
-            meaningful_drifts=3,
-            meaningful_rate=0.25,
-            best_drift_type='canteen',
-            best_time_of_day='Lunch (12-2PM)'
-        )
-
-        self.student_drifts[demo.id] = []
-
-        # Sample events
-        self.events = [
-            CampusEvent(
-                id='evt-001',
-                title='Open Mic Night',
-                department='Music',
-                type='performance',
-                location='Music Department Hall',
-                start_time=datetime(2026, 2, 28, 19, 30),
-                duration_minutes=120,
-                is_free=True,
-                expected_attendees=['Music', 'Arts', 'Literature'],
-                discovery_slot=True
-            ),
-            CampusEvent(
-                id='evt-002',
-                title='Startup Pitch Practice',
-                department='Business',
-                type='social',
-                location='Entrepreneurship Cell',
-                start_time=datetime(2026, 3, 1, 16, 0),
-                duration_minutes=90,
-                is_free=True,
-                expected_attendees=['Business', 'CS', 'Design'],
-                discovery_slot=True
-            ),
-            CampusEvent(
-                id='evt-003',
-                title='Life Drawing Session',
-                department='Fine Arts',
-                type='workshop',
-                location='Fine Arts Studio 3',
-                start_time=datetime(2026, 3, 1, 14, 0),
-                duration_minutes=120,
-                is_free=True,
-                expected_attendees=['Fine Arts', 'Design', 'Architecture'],
-                discovery_slot=False
-            ),
-        ]
+    # ── Students ──
+
+    def get_student(self, student_id: str) -> Optional[StudentProfile]:
+        return self.students.get(student_id)
+
+    def get_students(self, student_ids: Iterable[str]) -> Dict[str, StudentProfile]:
+        return {sid: self.students[sid] for sid in student_ids if sid in self.students}
+
+    def save_students(self, students: Iterable[StudentProfile]):
+        students = list(students)
+        for student in students:
+            self.students[student.id] = student
+            self.student_drifts.setdefault(student.id, [])
+        self._students_changed(s.id for s in students)
+
+    def list_students(self) -> List[StudentProfile]:
+        return list(self.students.values())
+
+    def count_students(self) -> int:
+        return len(self.students)
+
+    # ── Attractors ──
+
+    def get_attractor(self, student_id: str) -> Optional[AttractorState]:
+        return self.attractors.get(student_id)
+
+    def save_attractors(self, attractors: Iterable[AttractorState]):
+        attractors = list(attractors)
+        for attractor in attractors:
+            self.attractors[attractor.student_id] = attractor
+        self._students_changed(a.student_id for a in attractors)
+
+    def list_attractors(self) -> Dict[str, AttractorState]:
+        return dict(self.attractors)
+
+    # ── Fingerprints ──
+
+    def get_fingerprint(self, student_id: str) -> Optional[SerendipityFingerprint]:
+        return self.fingerprints.get(student_id)
+
+    def save_fingerprints(self, fingerprints: Iterable[SerendipityFingerprint]):
+        for fingerprint in fingerprints:
+            self.fingerprints[fingerprint.student_id] = fingerprint
+
+    def list_fingerprints(self) -> Dict[str, SerendipityFingerprint]:
+        return dict(self.fingerprints)
+
+    # ── Drifts ──
+
+    def get_drift(self, drift_id: str) -> Optional[DriftNudge]:
+        return self.drifts.get(drift_id)
 
-        self.discovery_slots = [
-            DiscoverySlot(
-                id='ds-001',
-                organizer_id='club-photo',
-                organizer_type='club',
-                name='Photography Club — Portfolio Reviews',
-                location='Building C, Room 204',
-                available_times=[datetime(2026, 3, 1, 15, 0)],
-                description='Get your portfolio reviewed.',
-                tags=['creative', 'portfolio', 'photography']
-            ),
+    def save_drifts(self, drifts: Iterable[DriftNudge]):
+        for drift in drifts:
+            if drift.id not in self.drifts:
+                self.student_drifts.setdefault(drift.student_id, []).append(drift.id)
+            self.drifts[drift.id] = drift
+
+    def get_student_drifts(self, student_id: str) -> List[DriftNudge]:
+        return [
+            self.drifts[did] for did in self.student_drifts.get(student_id, [])
+            if did in self.drifts
         ]
 
+    def count_drifts(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self.drifts)
+        return sum(1 for d in self.drifts.values() if d.status == status)
+
+    # ── Pre-generated daily drifts ──
+
+    def save_pregenerated(self, day: date, drifts: Iterable[DriftNudge]):
+        for drift in drifts:
+            self.pregenerated[(drift.student_id, day)] = drift
+
+    def pop_pregenerated(self, student_id: str, day: date) -> Optional[DriftNudge]:
+        return self.pregenerated.pop((student_id, day), None)
+
+    def count_pregenerated(self, day: date) -> int:
+        return sum(1 for (_, d) in self.pregenerated if d == day)
+
+    # ── Events & discovery slots ──
+
+    def list_events(self) -> List[CampusEvent]:
+        return list(self.events)
+
+    def save_events(self, events: Iterable[CampusEvent]):
+        events = list(events)
+        self._index_events(events)  # first: a rejected batch must not reach the list
+        for event in events:
+            position = self._event_positions.get(event.id)
+            if position is not None:
+                self.events[position] = event
+            else:
+                self._event_positions[event.id] = len(self.events)
+                self.events.append(event)
+
+    def list_slots(self) -> List[DiscoverySlot]:
+        return list(self.discovery_slots)
+
+    def save_slots(self, slots: Iterable[DiscoverySlot]):
+        slots = list(slots)
+        for slot in slots:
+            position = self._slot_positions.get(slot.id)
+            if position is not None:
+                self.discovery_slots[position] = slot
+            else:
+                self._slot_positions[slot.id] = len(self.discovery_slots)
+                self.discovery_slots.append(slot)
+        self._index_slots(slots)
+
+    # ── Memory accounting ──
+
+    def memory_collections(self) -> Dict[str, object]:
+        return {
+            "students": self.students,
+            "attractors": self.attractors,
+            "drifts": self.drifts,
+            "student_drifts": self.student_drifts,
+            "fingerprints": self.fingerprints,
+            "events": self.events,
+            "discovery_slots": self.discovery_slots,
+            "event_positions": self._event_positions,
+            "slot_positions": self._slot_positions,
+            "pregenerated": self.pregenerated,
+            **super().memory_collections(),
+        }
+
+
+def create_db() -> Repository:
+    """Pick the storage backend from KARM_DB_BACKEND (memory | sqlite)."""
+    backend = os.environ.get("KARM_DB_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        from .sqlite import SQLiteDB
+        return SQLiteDB(os.environ.get("KARM_DB_PATH", "karm.db"))
+    return InMemoryDB()
+
 
 # Singleton instance
-db = InMemoryDB()
+db = create_db()
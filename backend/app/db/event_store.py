@@ -0,0 +1,260 @@
+"""
+Indexed event store — sorted start-time index plus bitmap indexes on type,
+normalized department and is_free, with opaque cursor pagination.
+"""
+import base64
+from collections import defaultdict
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.event import CampusEvent
+
+
+class EventStore:
+    """
+    Each event id owns one slot: a replacement clears the old event's bits
+    and reuses the slot, so the slot table and the bitmaps grow with the
+    number of distinct events rather than with writes. Each index maps a
+    key to an int bitmap over slot positions, so filters combine with `&`
+    and time windows are two bisects over (start_time, slot) tuples.
+    """
+
+    # Batches up to this size are insort-ed; larger ones are merged with one sort
+    INSORT_BATCH = 16
+
+    def __init__(self, events: Iterable[CampusEvent] = ()):
+        self._events: List[Optional[CampusEvent]] = []
+        self._slot_of: Dict[str, int] = {}
+        self._time_index: List[Tuple[datetime, int]] = []
+        self._by_type: Dict[str, int] = {}
+        self._by_department: Dict[str, int] = {}
+        self._free = 0
+        self._live = 0
+        self.version = 0
+        self.add_many(events)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    @staticmethod
+    def normalize_department(department: str) -> str:
+        return department.strip().lower()
+
+    # ── Writes ──
+
+    def add_many(self, events: Iterable[CampusEvent]):
+        """
+        Insert or replace events (the last of duplicate ids wins). The batch
+        is checked before anything changes, so a rejected batch leaves the
+        store as it was.
+        """
+        batch = {event.id: event for event in events}
+        if not batch:
+            return
+        if any(event.start_time.tzinfo is not None for event in batch.values()):
+            raise ValueError("event start_time must be naive UTC")
+
+        if len(batch) <= self.INSORT_BATCH:
+            for event in batch.values():
+                slot = self._release(event.id)
+                if slot is not None:
+                    old = self._events[slot]
+                    self._time_index.pop(bisect_left(self._time_index, (old.start_time, slot)))
+                slot = self._place(event, slot)
+                insort(self._time_index, (event.start_time, slot))
+        else:
+            self._add_bulk(batch.values())
+        self.version += len(batch)
+
+    def add(self, event: CampusEvent):
+        self.add_many([event])
+
+    def _add_bulk(self, events: Iterable[CampusEvent]):
+        """
+        add_many for large batches: bitmap changes are collected per key and
+        applied with one mask per key, and the batch is merged into the time
+        index in one pass, instead of per-event work linear in the store size.
+        """
+        cleared: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        added: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        replaced = set()
+        keys = []
+        for event in events:
+            slot = self._slot_of.get(event.id)
+            if slot is None:
+                slot = len(self._events)
+                self._events.append(event)
+                self._slot_of[event.id] = slot
+            else:
+                old = self._events[slot]
+                self._events[slot] = event
+                replaced.add(slot)
+                for key in self._keys(old):
+                    cleared[key].append(slot)
+            for key in self._keys(event):
+                added[key].append(slot)
+            keys.append((event.start_time, slot))
+
+        for key in cleared.keys() | added.keys():
+            kind, value = key
+            bitmap = self._bitmap(kind, value) & ~self._mask(cleared.get(key, ())) | self._mask(added.get(key, ()))
+            if kind == "type":
+                self._by_type[value] = bitmap
+            elif kind == "department":
+                self._by_department[value] = bitmap
+            elif kind == "free":
+                self._free = bitmap
+            else:
+                self._live = bitmap
+
+        index = self._time_index
+        if replaced:
+            index = [key for key in index if key[1] not in replaced]
+        # Merge the sorted batch in: a bisect per new key and C-level slice
+        # copies of the runs between them, not a comparison per stored key
+        keys.sort()
+        merged: List[Tuple[datetime, int]] = []
+        lo = 0
+        for key in keys:
+            at = bisect_left(index, key, lo)
+            merged.extend(index[lo:at])
+            merged.append(key)
+            lo = at
+        merged.extend(index[lo:])
+        self._time_index = merged
+
+    def _keys(self, event: CampusEvent) -> List[Tuple[str, str]]:
+        keys = [("type", event.type), ("department", self.normalize_department(event.department)), ("live", "")]
+        if event.is_free:
+            keys.append(("free", ""))
+        return keys
+
+    def _bitmap(self, kind: str, value: str) -> int:
+        if kind == "type":
+            return self._by_type.get(value, 0)
+        if kind == "department":
+            return self._by_department.get(value, 0)
+        return self._free if kind == "free" else self._live
+
+    @staticmethod
+    def _mask(slots: Iterable[int]) -> int:
+        """Bitmap of `slots`, built in a bytearray rather than by repeated big-int ORs."""
+        slots = list(slots)
+        if not slots:
+            return 0
+        bits = bytearray(max(slots) // 8 + 1)
+        for slot in slots:
+            bits[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(bits, "little")
+
+    def _release(self, event_id: str) -> Optional[int]:
+        """Clear the bits of a stored event; returns its slot for reuse (None if new)."""
+        slot = self._slot_of.get(event_id)
+        if slot is None:
+            return None
+        event = self._events[slot]
+        mask = ~(1 << slot)
+        self._by_type[event.type] &= mask
+        dept = self.normalize_department(event.department)
+        self._by_department[dept] &= mask
+        self._free &= mask
+        self._live &= mask
+        return slot
+
+    def _place(self, event: CampusEvent, slot: Optional[int]) -> int:
+        """Store `event` in `slot` (a new slot when None) and set its bits."""
+        if slot is None:
+            slot = len(self._events)
+            self._events.append(event)
+        else:
+            self._events[slot] = event
+        self._slot_of[event.id] = slot
+        bit = 1 << slot
+        self._by_type[event.type] = self._by_type.get(event.type, 0) | bit
+        dept = self.normalize_department(event.department)
+        self._by_department[dept] = self._by_department.get(dept, 0) | bit
+        if event.is_free:
+            self._free |= bit
+        self._live |= bit
+        return slot
+
+    # ── Reads ──
+
+    def get(self, event_id: str) -> Optional[CampusEvent]:
+        slot = self._slot_of.get(event_id)
+        return self._events[slot] if slot is not None else None
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        department: Optional[str] = None,
+        free_only: bool = False,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[CampusEvent], Optional[str]]:
+        """
+        Events ordered by start time, filtered by type / department / free,
+        within [start, end). Returns (page, next_cursor); next_cursor is None
+        on the last page.
+        """
+        mask = self._live
+        if event_type:
+            mask &= self._by_type.get(event_type, 0)
+        if department:
+            mask &= self._by_department.get(self.normalize_department(department), 0)
+        if free_only:
+            mask &= self._free
+
+        lo = bisect_left(self._time_index, (start,)) if start else 0
+        if cursor:
+            lo = max(lo, bisect_right(self._time_index, self._decode_cursor(cursor)))
+        hi = bisect_left(self._time_index, (end,)) if end else len(self._time_index)
+        want = limit + 1 if limit else None  # one extra to know if there's a next page
+
+        if lo >= hi:
+            page = []
+        elif mask.bit_count() < hi - lo:
+            # Selective filter: walk the matching slots instead of the time range
+            first, last = self._time_index[lo], self._time_index[hi - 1]
+            keys = sorted(
+                key for key in (
+                    (self._events[slot].start_time, slot) for slot in self._slots(mask)
+                )
+                if first <= key <= last
+            )
+            page = keys[:want] if want else keys
+        else:
+            page = []
+            for key in self._time_index[lo:hi]:
+                if mask >> key[1] & 1:
+                    page.append(key)
+                    if want and len(page) == want:
+                        break
+
+        next_cursor = None
+        if want and len(page) == want:
+            page = page[:limit]
+            next_cursor = self._encode_cursor(page[-1])
+        return [self._events[slot] for _, slot in page], next_cursor
+
+    @staticmethod
+    def _slots(mask: int) -> Iterable[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    @staticmethod
+    def _encode_cursor(key: Tuple[datetime, int]) -> str:
+        raw = f"{key[0].isoformat()}|{key[1]}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            start, slot = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(start), int(slot)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError("Invalid cursor") from e
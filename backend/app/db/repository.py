@@ -0,0 +1,354 @@
+"""
+Storage interface used by the routes. InMemoryDB (tests/demo) and SQLiteDB
+(durable, multi-worker) implement it; routes never touch backend internals.
+
+Objects returned by get_* may be copies — call the matching save_* after
+mutating them.
+
+The indexes and version counters below live in each process. Backends
+shared by several processes override _refresh() to replay the other
+processes' writes before any of them is read.
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..models.student import StudentProfile, AttractorState
+from ..models.drift import DriftNudge
+from ..models.event import CampusEvent, DiscoverySlot
+from ..models.fingerprint import SerendipityFingerprint, FingerprintAxes
+from .event_store import EventStore
+from .slot_index import SlotIndex
+
+
+class Repository(ABC):
+
+    _event_store: Optional[EventStore] = None
+    _slot_index: Optional[SlotIndex] = None
+    _campus_version: int = 0
+    _student_revisions: Optional[Dict[str, int]] = None
+    _change_log: Optional[List[str]] = None
+    _change_base: int = 0
+    _revision_base: int = 0
+
+    CHANGE_LOG_SIZE = 50_000
+
+    # ── Students ──
+
+    @abstractmethod
+    def get_student(self, student_id: str) -> Optional[StudentProfile]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_students(self, students: Iterable[StudentProfile]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_students(self) -> List[StudentProfile]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_students(self) -> int:
+        raise NotImplementedError
+
+    def save_student(self, student: StudentProfile):
+        self.save_students([student])
+
+    def get_students(self, student_ids: Iterable[str]) -> Dict[str, StudentProfile]:
+        """The stored students among `student_ids`, by id (unknown ids are left out)."""
+        students = (self.get_student(sid) for sid in student_ids)
+        return {s.id: s for s in students if s is not None}
+
+    def student_revision(self, student_id: str) -> int:
+        """Bumped on every write to the student's profile or attractor."""
+        self._refresh()
+        return self._revision_base + (self._student_revisions or {}).get(student_id, 0)
+
+    def _students_changed(self, student_ids: Iterable[str]):
+        if self._student_revisions is None:
+            self._student_revisions = {}
+            self._change_log = []
+        for student_id in student_ids:
+            self._student_revisions[student_id] = self._student_revisions.get(student_id, 0) + 1
+            self._change_log.append(student_id)
+        if len(self._change_log) > 2 * self.CHANGE_LOG_SIZE:
+            drop = len(self._change_log) - self.CHANGE_LOG_SIZE
+            del self._change_log[:drop]
+            self._change_base += drop
+
+    def _forget_students(self):
+        """
+        Invalidate every student at once, for when the writes themselves are
+        unknown: all revisions move and callers of students_changed_since
+        rebuild from scratch.
+        """
+        self._revision_base += 1
+        self._change_base = self._change_base + len(self._change_log or ()) + 1
+        self._change_log = []
+        if self._student_revisions is None:
+            self._student_revisions = {}
+
+    @property
+    def change_seq(self) -> int:
+        """Position in the student/attractor change log."""
+        self._refresh()
+        return self._change_base + len(self._change_log or ())
+
+    def students_changed_since(self, seq: int) -> Optional[Tuple[Set[str], int]]:
+        """
+        Ids whose profile or attractor was written after change_seq `seq`,
+        plus the new position. None when the log was trimmed past `seq` and
+        the caller has to rebuild from scratch.
+        """
+        self._refresh()
+        if seq < self._change_base:
+            return None
+        return set((self._change_log or [])[seq - self._change_base:]), self.change_seq
+
+    # ── Attractors ──
+
+    @abstractmethod
+    def get_attractor(self, student_id: str) -> Optional[AttractorState]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_attractors(self, attractors: Iterable[AttractorState]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_attractors(self) -> Dict[str, AttractorState]:
+        raise NotImplementedError
+
+    def save_attractor(self, attractor: AttractorState):
+        self.save_attractors([attractor])
+
+    # ── Fingerprints ──
+
+    @abstractmethod
+    def get_fingerprint(self, student_id: str) -> Optional[SerendipityFingerprint]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_fingerprints(self, fingerprints: Iterable[SerendipityFingerprint]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_fingerprints(self) -> Dict[str, SerendipityFingerprint]:
+        raise NotImplementedError
+
+    def save_fingerprint(self, fingerprint: SerendipityFingerprint):
+        self.save_fingerprints([fingerprint])
+
+    # ── Drifts ──
+
+    @abstractmethod
+    def get_drift(self, drift_id: str) -> Optional[DriftNudge]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_drifts(self, drifts: Iterable[DriftNudge]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_student_drifts(self, student_id: str) -> List[DriftNudge]:
+        """A student's drifts, oldest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_drifts(self, status: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    def save_drift(self, drift: DriftNudge):
+        self.save_drifts([drift])
+
+    # ── Pre-generated daily drifts (keyed by student + day) ──
+
+    @abstractmethod
+    def save_pregenerated(self, day: date, drifts: Iterable[DriftNudge]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def pop_pregenerated(self, student_id: str, day: date) -> Optional[DriftNudge]:
+        """Take (and remove) a student's pre-generated drift for the day."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_pregenerated(self, day: date) -> int:
+        raise NotImplementedError
+
+    # ── Events & discovery slots ──
+
+    @abstractmethod
+    def list_events(self) -> List[CampusEvent]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_events(self, events: Iterable[CampusEvent]):
+        raise NotImplementedError
+
+    @property
+    def event_store(self) -> EventStore:
+        """Indexed view of all events, built on first use and kept current by save_events."""
+        self._refresh()
+        if self._event_store is None:
+            self._event_store = EventStore(self.list_events())
+        return self._event_store
+
+    @property
+    def campus_version(self) -> int:
+        """Bumped on every event or discovery-slot write; keys derived caches."""
+        self._refresh()
+        return self._campus_version
+
+    def _index_events(self, events: List[CampusEvent]):
+        if self._event_store is not None:
+            self._event_store.add_many(events)
+        self._campus_version += 1
+
+    @abstractmethod
+    def list_slots(self) -> List[DiscoverySlot]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_slots(self, slots: Iterable[DiscoverySlot]):
+        raise NotImplementedError
+
+    def save_slot(self, slot: DiscoverySlot):
+        self.save_slots([slot])
+
+    @property
+    def slot_index(self) -> SlotIndex:
+        """Active-slot index, built on first use and kept current by save_slots."""
+        self._refresh()
+        if self._slot_index is None:
+            self._slot_index = SlotIndex(self.list_slots())
+        return self._slot_index
+
+    def _index_slots(self, slots: List[DiscoverySlot]):
+        if self._slot_index is not None:
+            self._slot_index.add_many(slots)
+        self._campus_version += 1
+
+    # ── Cross-process refresh ──
+
+    def _refresh(self):
+        """Apply writes made by other processes to the indexes and versions above."""
+
+    # ── Bulk loading ──
+
+    @contextmanager
+    def bulk_load(self):
+        """Wrap large batches of save_* calls (backends may relax durability inside)."""
+        yield self
+
+    # ── Memory accounting ──
+
+    def memory_collections(self) -> Dict[str, object]:
+        """In-process structures sized by the admin memory report (indexes only once built)."""
+        collections: Dict[str, object] = {}
+        if self._event_store is not None:
+            collections["event_store"] = self._event_store
+        if self._slot_index is not None:
+            collections["slot_index"] = self._slot_index
+        if self._student_revisions is not None:
+            collections["student_revisions"] = self._student_revisions
+            collections["change_log"] = self._change_log
+        return collections
+
+    # ── Seed data ──
+
+    def _seed_data(self):
+        """Seed with demo data."""
+        # Demo student
+        demo = StudentProfile(
+            id='stu-001',
+            name='Aryan Sharma',
+            department='Computer Science',
+            year=2,
+            skills=['Python', 'React', 'Machine Learning'],
+            interests=['AI', 'Music', 'Photography', 'Startups'],
+            time_budget_minutes=45,
+            free_only=False,
+            drift_score=247,
+            drift_streak=4
+        )
+        self.save_student(demo)
+
+        self.save_attractor(AttractorState(
+            student_id=demo.id,
+            departments_visited=['CS', 'Mathematics'],
+            canteen_counters_used=['Counter 2', 'Counter 5'],
+            event_types_attended=['Technical Talk'],
+            new_connections_count=0,
+            content_domains_explored=['Programming', 'AI/ML', 'Web Dev']
+        ))
+
+        self.save_fingerprint(SerendipityFingerprint(
+            student_id=demo.id,
+            axes=FingerprintAxes(
+                cross_departmental=35,
+                spontaneous=45,
+                social=20,
+                creative=40,
+                exploratory=30,
+                timing_flexibility=60
+            ),
+            total_drifts=12,
+            meaningful_drifts=3,
+            meaningful_rate=0.25,
+            best_drift_type='canteen',
+            best_time_of_day='Lunch (12-2PM)'
+        ))
+
+        # Sample events
+        self.save_events([
+            CampusEvent(
+                id='evt-001',
+                title='Open Mic Night',
+                department='Music',
+                type='performance',
+                location='Music Department Hall',
+                start_time=datetime(2026, 2, 28, 19, 30),
+                duration_minutes=120,
+                is_free=True,
+                expected_attendees=['Music', 'Arts', 'Literature'],
+                discovery_slot=True
+            ),
+            CampusEvent(
+                id='evt-002',
+                title='Startup Pitch Practice',
+                department='Business',
+                type='social',
+                location='Entrepreneurship Cell',
+                start_time=datetime(2026, 3, 1, 16, 0),
+                duration_minutes=90,
+                is_free=True,
+                expected_attendees=['Business', 'CS', 'Design'],
+                discovery_slot=True
+            ),
+            CampusEvent(
+                id='evt-003',
+                title='Life Drawing Session',
+                department='Fine Arts',
+                type='workshop',
+                location='Fine Arts Studio 3',
+                start_time=datetime(2026, 3, 1, 14, 0),
+                duration_minutes=120,
+                is_free=True,
+                expected_attendees=['Fine Arts', 'Design', 'Architecture'],
+                discovery_slot=False
+            ),
+        ])
+
+        self.save_slots([
+            DiscoverySlot(
+                id='ds-001',
+                organizer_id='club-photo',
+                organizer_type='club',
+                name='Photography Club — Portfolio Reviews',
+                location='Building C, Room 204',
+                available_times=[datetime(2026, 3, 1, 15, 0)],
+                description='Get your portfolio reviewed.',
+                tags=['creative', 'portfolio', 'photography']
+            ),
+        ])
@@ -0,0 +1,170 @@
+"""
+Active discovery-slot index — slots ordered by their next available time,
+with lazy heap-based expiry of past times and inverted indexes on tags and
+location words.
+"""
+import heapq
+import re
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..models.event import DiscoverySlot
+
+WORD = re.compile(r"\w+")
+
+
+class SlotIndex:
+    """
+    Each timed slot sits once in `_order`, a sorted list of
+    (next_time, slot_id), so a `within` window is a bisect. A min-heap of
+    (next_time, slot_id) drives expiry: on each read, entries whose time has
+    passed are popped and the slot is advanced to its next future time (or
+    dropped once none are left). Heap entries that no longer match the
+    slot's current next time are stale and skipped.
+
+    Slots without any available_times are treated as always open.
+    `version` moves on every write and every expiry that changes the
+    active set.
+    """
+
+    def __init__(self, slots: Iterable[DiscoverySlot] = ()):
+        self._slots: Dict[str, DiscoverySlot] = {}
+        self._times: Dict[str, List[datetime]] = {}
+        self._next: Dict[str, datetime] = {}
+        self._order: List[Tuple[datetime, str]] = []
+        self._heap: List[Tuple[datetime, str]] = []
+        self._untimed: Set[str] = set()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_word: Dict[str, Set[str]] = {}
+        self._expired_at: Optional[datetime] = None
+        self.version = 0
+        self.add_many(slots)
+
+    def __len__(self) -> int:
+        return len(self._next) + len(self._untimed)
+
+    @staticmethod
+    def normalize_tag(tag: str) -> str:
+        return tag.strip().lower()
+
+    @staticmethod
+    def location_words(location: str) -> Set[str]:
+        return set(WORD.findall(location.lower()))
+
+    # ── Writes ──
+
+    def add_many(self, slots: Iterable[DiscoverySlot]):
+        for slot in slots:
+            self._remove(slot.id)
+            self._slots[slot.id] = slot
+            for tag in slot.tags:
+                self._by_tag.setdefault(self.normalize_tag(tag), set()).add(slot.id)
+            for word in self.location_words(slot.location):
+                self._by_word.setdefault(word, set()).add(slot.id)
+            times = sorted(slot.available_times)
+            if not times:
+                self._untimed.add(slot.id)
+                continue
+            self._times[slot.id] = times
+            start = bisect_left(times, self._expired_at) if self._expired_at else 0
+            if start < len(times):
+                self._schedule(slot.id, times[start])
+        self.version += 1
+
+    def add(self, slot: DiscoverySlot):
+        self.add_many([slot])
+
+    def _schedule(self, slot_id: str, when: datetime):
+        self._next[slot_id] = when
+        insort(self._order, (when, slot_id))
+        heapq.heappush(self._heap, (when, slot_id))
+
+    def _unschedule(self, slot_id: str):
+        when = self._next.pop(slot_id, None)
+        if when is not None:
+            self._order.pop(bisect_left(self._order, (when, slot_id)))
+
+    def _remove(self, slot_id: str):
+        slot = self._slots.pop(slot_id, None)
+        if slot is None:
+            return
+        for tag in slot.tags:
+            self._by_tag.get(self.normalize_tag(tag), set()).discard(slot_id)
+        for word in self.location_words(slot.location):
+            self._by_word.get(word, set()).discard(slot_id)
+        self._untimed.discard(slot_id)
+        self._times.pop(slot_id, None)
+        self._unschedule(slot_id)  # its heap entries become stale
+
+    def expire(self, now: datetime):
+        """Advance every slot whose next time is before `now`."""
+        if self._expired_at is None or now > self._expired_at:
+            self._expired_at = now
+        while self._heap and self._heap[0][0] < now:
+            when, slot_id = heapq.heappop(self._heap)
+            if self._next.get(slot_id) != when:
+                continue  # stale: slot was replaced or already advanced
+            self._unschedule(slot_id)
+            self.version += 1
+            times = self._times[slot_id]
+            i = bisect_left(times, now)
+            if i < len(times):
+                self._schedule(slot_id, times[i])
+
+    # ── Reads ──
+
+    def between(self, start: datetime, end: datetime) -> List[DiscoverySlot]:
+        """
+        Slots with an available time in [start, end), without expiring
+        anything (so `start` may be in the future). Untimed slots are excluded.
+        """
+        out = []
+        for slot_id, times in self._times.items():
+            i = bisect_left(times, start)
+            if i < len(times) and times[i] < end:
+                out.append(self._slots[slot_id])
+        return out
+
+    def get(self, slot_id: str) -> Optional[DiscoverySlot]:
+        return self._slots.get(slot_id)
+
+    def next_time(self, slot_id: str) -> Optional[datetime]:
+        return self._next.get(slot_id)
+
+    def active(
+        self,
+        now: datetime,
+        tags: Iterable[str] = (),
+        location: Optional[str] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[DiscoverySlot]:
+        """
+        Slots with an upcoming time (or no times at all), ordered by next
+        available time. Filters: all of `tags`, every word of `location`,
+        next time before `until` (untimed slots are excluded then).
+        """
+        self.expire(now)
+        allowed = self._filter(tags, location)
+        hi = bisect_right(self._order, (until,)) if until else len(self._order)
+        if allowed is not None and len(allowed) < hi:
+            # Fewer matches than the window: sort the matches instead of scanning
+            timed = sorted((self._next[sid], sid) for sid in allowed if sid in self._next)
+            ids = (sid for when, sid in timed if until is None or when < until)
+        else:
+            ids = (sid for _, sid in islice(self._order, hi) if allowed is None or sid in allowed)
+        out = [self._slots[sid] for sid in islice(ids, limit or None)]
+        if until is None and not (limit and len(out) == limit):
+            untimed = self._untimed if allowed is None else self._untimed & allowed
+            out.extend(self._slots[sid] for sid in sorted(untimed))
+        return out[:limit] if limit else out
+
+    def _filter(self, tags: Iterable[str], location: Optional[str]) -> Optional[Set[str]]:
+        keys = [self._by_tag.get(self.normalize_tag(t), set()) for t in tags]
+        if location:
+            keys += [self._by_word.get(w, set()) for w in self.location_words(location)]
+        if not keys:
+            return None
+        keys.sort(key=len)
+        return set(keys[0]).intersection(*keys[1:])
@@ -0,0 +1,375 @@
+"""
+SQLite storage backend (WAL mode) for durable, multi-worker deployments.
+
+Models are stored as JSON blobs next to the columns we filter on
+(student_id, drift status, event start time). All SQL strings are module
+constants so sqlite3's per-connection statement cache reuses the prepared
+statements; bulk save_* calls go through executemany in one transaction.
+
+Every write also appends (kind, key) rows to the `changes` table in its
+transaction. Each process remembers how far it has applied that table and,
+when PRAGMA data_version shows another connection committed, replays the
+rest into its event/slot indexes and student change log, so versions and
+the caches keyed on them stay current across workers.
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from ..models.student import StudentProfile, AttractorState
+from ..models.drift import DriftNudge
+from ..models.event import CampusEvent, DiscoverySlot
+from ..models.fingerprint import SerendipityFingerprint
+from .repository import Repository
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id TEXT PRIMARY KEY,
+    department TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_students_department ON students(department);
+
+CREATE TABLE IF NOT EXISTS attractors (
+    student_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    student_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS drifts (
+    id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drifts_student ON drifts(student_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_drifts_status ON drifts(status);
+
+CREATE TABLE IF NOT EXISTS pregenerated_drifts (
+    student_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (student_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_pregenerated_day ON pregenerated_drifts(day);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_time);
+
+CREATE TABLE IF NOT EXISTS discovery_slots (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+"""
+
+GET_STUDENT = "SELECT data FROM students WHERE id = ?"
+UPSERT_STUDENT = (
+    "INSERT INTO students (id, department, year, data) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET department = excluded.department, "
+    "year = excluded.year, data = excluded.data"
+)
+STUDENTS_BY_ID = "SELECT data FROM students WHERE id IN (SELECT value FROM json_each(?))"
+LIST_STUDENTS = "SELECT data FROM students ORDER BY rowid"
+COUNT_STUDENTS = "SELECT COUNT(*) FROM students"
+
+GET_ATTRACTOR = "SELECT data FROM attractors WHERE student_id = ?"
+UPSERT_ATTRACTOR = (
+    "INSERT INTO attractors (student_id, data) VALUES (?, ?) "
+    "ON CONFLICT(student_id) DO UPDATE SET data = excluded.data"
+)
+LIST_ATTRACTORS = "SELECT student_id, data FROM attractors"
+
+GET_FINGERPRINT = "SELECT data FROM fingerprints WHERE student_id = ?"
+UPSERT_FINGERPRINT = (
+    "INSERT INTO fingerprints (student_id, data) VALUES (?, ?) "
+    "ON CONFLICT(student_id) DO UPDATE SET data = excluded.data"
+)
+LIST_FINGERPRINTS = "SELECT student_id, data FROM fingerprints"
+
+GET_DRIFT = "SELECT data FROM drifts WHERE id = ?"
+UPSERT_DRIFT = (
+    "INSERT INTO drifts (id, student_id, status, created_at, data) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET status = excluded.status, data = excluded.data"
+)
+STUDENT_DRIFTS = "SELECT data FROM drifts WHERE student_id = ? ORDER BY created_at, rowid"
+COUNT_DRIFTS = "SELECT COUNT(*) FROM drifts"
+COUNT_DRIFTS_BY_STATUS = "SELECT COUNT(*) FROM drifts WHERE status = ?"
+
+UPSERT_PREGENERATED = (
+    "INSERT INTO pregenerated_drifts (student_id, day, data) VALUES (?, ?, ?) "
+    "ON CONFLICT(student_id, day) DO UPDATE SET data = excluded.data"
+)
+POP_PREGENERATED = "DELETE FROM pregenerated_drifts WHERE student_id = ? AND day = ? RETURNING data"
+COUNT_PREGENERATED = "SELECT COUNT(*) FROM pregenerated_drifts WHERE day = ?"
+
+LIST_EVENTS = "SELECT data FROM events ORDER BY rowid"
+UPSERT_EVENT = (
+    "INSERT INTO events (id, start_time, data) VALUES (?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET start_time = excluded.start_time, data = excluded.data"
+)
+
+EVENTS_BY_ID = "SELECT data FROM events WHERE id IN (SELECT value FROM json_each(?))"
+
+LIST_SLOTS = "SELECT data FROM discovery_slots ORDER BY rowid"
+UPSERT_SLOT = (
+    "INSERT INTO discovery_slots (id, data) VALUES (?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET data = excluded.data"
+)
+SLOTS_BY_ID = "SELECT data FROM discovery_slots WHERE id IN (SELECT value FROM json_each(?))"
+
+DATA_VERSION = "PRAGMA data_version"
+RECORD_CHANGE = "INSERT INTO changes (kind, key) VALUES (?, ?)"
+LAST_CHANGE = "SELECT COALESCE(MAX(seq), 0) FROM changes"
+CHANGES_SINCE = "SELECT seq, kind, key FROM changes WHERE seq > ? ORDER BY seq"
+TRIM_CHANGES = "DELETE FROM changes WHERE seq <= ?"
+
+
+class SQLiteDB(Repository):
+
+    # Rows kept in `changes`; a process further behind than this reloads in full
+    CHANGE_TABLE_SIZE = 100_000
+
+    def __init__(self, path: str = "karm.db"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT in _transaction
+            cached_statements=256
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._data_version = self._one(DATA_VERSION, ())[0]
+        self._applied_seq = self._one(LAST_CHANGE, ())[0]
+        if self.count_students() == 0:
+            self._seed_data()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            applied = self._applied_seq
+            try:
+                # Holding the write lock: catch up first, so the rows this
+                # transaction records are the only ones after _applied_seq
+                self._catch_up()
+                applied = self._applied_seq
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._applied_seq = applied  # rolled-back sequence numbers are reused
+                raise
+            self._conn.execute("COMMIT")
+
+    def _record(self, conn: sqlite3.Connection, kind: str, keys: List[str]):
+        """Log this transaction's writes for the other processes (see _refresh)."""
+        conn.executemany(RECORD_CHANGE, [(kind, key) for key in keys])
+        self._applied_seq = conn.execute(LAST_CHANGE).fetchone()[0]
+        conn.execute(TRIM_CHANGES, (self._applied_seq - self.CHANGE_TABLE_SIZE,))
+
+    def _refresh(self):
+        with self._lock:
+            version = self._conn.execute(DATA_VERSION).fetchone()[0]
+            if version != self._data_version:
+                self._data_version = version
+                self._catch_up()
+
+    def _catch_up(self):
+        """Replay the `changes` rows after _applied_seq (other processes' writes)."""
+        rows = self._conn.execute(CHANGES_SINCE, (self._applied_seq,)).fetchall()
+        if not rows:
+            return
+        # Sequence numbers are gapless, so a gap means rows this process
+        # needed were trimmed: reload everything instead
+        if rows[0][0] != self._applied_seq + 1:
+            self._reload()
+        else:
+            keys: Dict[str, List[str]] = {"student": [], "event": [], "slot": []}
+            for _, kind, key in rows:
+                keys[kind].append(key)
+            if keys["student"]:
+                self._students_changed(keys["student"])
+            if keys["event"]:
+                loaded = self._event_store is not None
+                self._index_events(self._by_id(EVENTS_BY_ID, CampusEvent, keys["event"]) if loaded else [])
+            if keys["slot"]:
+                loaded = self._slot_index is not None
+                self._index_slots(self._by_id(SLOTS_BY_ID, DiscoverySlot, keys["slot"]) if loaded else [])
+        self._applied_seq = rows[-1][0]
+
+    def _reload(self):
+        # Reloaded into the existing indexes (never rebuilt) so their
+        # versions keep increasing; events and slots are never deleted
+        self._index_events(self.list_events() if self._event_store is not None else [])
+        self._index_slots(self.list_slots() if self._slot_index is not None else [])
+        self._forget_students()
+
+    def _by_id(self, sql: str, model, ids: List[str]) -> list:
+        return [model.model_validate_json(r[0]) for r in self._all(sql, (json.dumps(ids),))]
+
+    def _one(self, sql: str, params: tuple):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _all(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def bulk_load(self):
+        """No fsync while bulk loading: a crash mid-load loses the load, never older data (WAL)."""
+        with self._lock:
+            self._conn.execute("PRAGMA synchronous=OFF")
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── Students ──
+
+    def get_student(self, student_id: str) -> Optional[StudentProfile]:
+        row = self._one(GET_STUDENT, (student_id,))
+        return StudentProfile.model_validate_json(row[0]) if row else None
+
+    def get_students(self, student_ids: Iterable[str]) -> Dict[str, StudentProfile]:
+        return {s.id: s for s in self._by_id(STUDENTS_BY_ID, StudentProfile, list(set(student_ids)))}
+
+    def save_students(self, students: Iterable[StudentProfile]):
+        rows = [(s.id, s.department, s.year, s.model_dump_json()) for s in students]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_STUDENT, rows)
+            self._record(conn, "student", [r[0] for r in rows])
+        self._students_changed(r[0] for r in rows)
+
+    def list_students(self) -> List[StudentProfile]:
+        return [StudentProfile.model_validate_json(r[0]) for r in self._all(LIST_STUDENTS)]
+
+    def count_students(self) -> int:
+        return self._one(COUNT_STUDENTS, ())[0]
+
+    # ── Attractors ──
+
+    def get_attractor(self, student_id: str) -> Optional[AttractorState]:
+        row = self._one(GET_ATTRACTOR, (student_id,))
+        return AttractorState.model_validate_json(row[0]) if row else None
+
+    def save_attractors(self, attractors: Iterable[AttractorState]):
+        rows = [(a.student_id, a.model_dump_json()) for a in attractors]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_ATTRACTOR, rows)
+            self._record(conn, "student", [r[0] for r in rows])
+        self._students_changed(r[0] for r in rows)
+
+    def list_attractors(self) -> Dict[str, AttractorState]:
+        return {
+            sid: AttractorState.model_validate_json(data)
+            for sid, data in self._all(LIST_ATTRACTORS)
+        }
+
+    # ── Fingerprints ──
+
+    def get_fingerprint(self, student_id: str) -> Optional[SerendipityFingerprint]:
+        row = self._one(GET_FINGERPRINT, (student_id,))
+        return SerendipityFingerprint.model_validate_json(row[0]) if row else None
+
+    def save_fingerprints(self, fingerprints: Iterable[SerendipityFingerprint]):
+        rows = [(f.student_id, f.model_dump_json()) for f in fingerprints]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_FINGERPRINT, rows)
+
+    def list_fingerprints(self) -> Dict[str, SerendipityFingerprint]:
+        return {
+            sid: SerendipityFingerprint.model_validate_json(data)
+            for sid, data in self._all(LIST_FINGERPRINTS)
+        }
+
+    # ── Drifts ──
+
+    def get_drift(self, drift_id: str) -> Optional[DriftNudge]:
+        row = self._one(GET_DRIFT, (drift_id,))
+        return DriftNudge.model_validate_json(row[0]) if row else None
+
+    def save_drifts(self, drifts: Iterable[DriftNudge]):
+        rows = [
+            (d.id, d.student_id, d.status, d.created_at.isoformat(), d.model_dump_json())
+            for d in drifts
+        ]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_DRIFT, rows)
+
+    def get_student_drifts(self, student_id: str) -> List[DriftNudge]:
+        return [
+            DriftNudge.model_validate_json(r[0])
+            for r in self._all(STUDENT_DRIFTS, (student_id,))
+        ]
+
+    def count_drifts(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self._one(COUNT_DRIFTS, ())[0]
+        return self._one(COUNT_DRIFTS_BY_STATUS, (status,))[0]
+
+    # ── Pre-generated daily drifts ──
+
+    def save_pregenerated(self, day: date, drifts: Iterable[DriftNudge]):
+        rows = [(d.student_id, day.isoformat(), d.model_dump_json()) for d in drifts]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_PREGENERATED, rows)
+
+    def pop_pregenerated(self, student_id: str, day: date) -> Optional[DriftNudge]:
+        with self._transaction() as conn:
+            row = conn.execute(POP_PREGENERATED, (student_id, day.isoformat())).fetchone()
+        return DriftNudge.model_validate_json(row[0]) if row else None
+
+    def count_pregenerated(self, day: date) -> int:
+        return self._one(COUNT_PREGENERATED, (day.isoformat(),))[0]
+
+    # ── Events & discovery slots ──
+
+    def list_events(self) -> List[CampusEvent]:
+        return [CampusEvent.model_validate_json(r[0]) for r in self._all(LIST_EVENTS)]
+
+    def save_events(self, events: Iterable[CampusEvent]):
+        events = list(events)
+        rows = [(e.id, e.start_time.isoformat(), e.model_dump_json()) for e in events]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_EVENT, rows)
+            self._record(conn, "event", [r[0] for r in rows])
+            self._index_events(events)  # inside: a rejected batch rolls back
+
+    def list_slots(self) -> List[DiscoverySlot]:
+        return [DiscoverySlot.model_validate_json(r[0]) for r in self._all(LIST_SLOTS)]
+
+    def save_slots(self, slots: Iterable[DiscoverySlot]):
+        slots = list(slots)
+        rows = [(s.id, s.model_dump_json()) for s in slots]
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_SLOT, rows)
+            self._record(conn, "slot", [r[0] for r in rows])
+        self._index_slots(slots)
@@ -0,0 +1,109 @@
+"""
+Local stand-in for the OpenRouter chat completions API (tests, benchmarks).
+
+    uvicorn app.dev.openrouter_stub:app --port 8999
+    OPENROUTER_URL=http://localhost:8999/api/v1/chat/completions
+
+Behaviour is chosen per model: names containing "fail" return 500,
+"ratelimit" returns 429, "slow" sleeps SLOW_SECONDS, "think" wraps the
+answer in a <think> block, "die" breaks off mid-stream with an error
+chunk. Anything else answers after STUB_LATENCY_MS. Requests with
+"stream": true get SSE chunks of CHUNK_CHARS every STUB_TOKEN_MS.
+POST /_stub/config {"model": ..., "status": ..., "latency_ms": ...}
+overrides a model at runtime; GET /_stub/calls returns per-model counts.
+"""
+import asyncio
+import json
+import os
+from collections import Counter
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+app = FastAPI(title="OpenRouter stub")
+
+LATENCY_MS = float(os.environ.get("STUB_LATENCY_MS", "50"))
+TOKEN_MS = float(os.environ.get("STUB_TOKEN_MS", "10"))
+SLOW_SECONDS = 10.0
+CHUNK_CHARS = 6
+
+overrides: Dict[str, dict] = {}
+calls: Counter = Counter()
+
+
+class StubConfig(BaseModel):
+    model: str
+    status: int = 200
+    latency_ms: Optional[float] = None
+
+
+def _behaviour(model: str) -> dict:
+    if model in overrides:
+        return overrides[model]
+    if "fail" in model:
+        return {"status": 500, "latency_ms": LATENCY_MS}
+    if "ratelimit" in model:
+        return {"status": 429, "latency_ms": LATENCY_MS}
+    if "slow" in model:
+        return {"status": 200, "latency_ms": SLOW_SECONDS * 1000}
+    return {"status": 200, "latency_ms": LATENCY_MS}
+
+
+def _answer(model: str, body: dict) -> str:
+    query = body.get("messages", [{}])[-1].get("content", "")
+    answer = f"Stub answer from {model} to: {query[:80]}"
+    if "think" in model:
+        answer = f"<think>reasoning about {query[:20]}</think>{answer}"
+    return answer
+
+
+@app.post("/api/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "")
+    calls[model] += 1
+    behaviour = _behaviour(model)
+    await asyncio.sleep((behaviour.get("latency_ms") or LATENCY_MS) / 1000)
+    if behaviour["status"] != 200:
+        return JSONResponse({"error": {"code": behaviour["status"]}}, status_code=behaviour["status"])
+    if body.get("stream"):
+        return StreamingResponse(_stream(model, _answer(model, body)), media_type="text/event-stream")
+    return {
+        "id": "stub",
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": _answer(model, body)}}],
+    }
+
+
+async def _stream(model: str, answer: str):
+    yield ": OPENROUTER PROCESSING\n\n"
+    cut = len(answer) // 2 if "die" in model else len(answer)
+    for i in range(0, cut, CHUNK_CHARS):
+        chunk = {"id": "stub", "model": model,
+                 "choices": [{"index": 0, "delta": {"content": answer[i:min(i + CHUNK_CHARS, cut)]}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(TOKEN_MS / 1000)
+    if cut < len(answer):
+        yield f"data: {json.dumps({'error': {'code': 502, 'message': 'provider disconnected'}})}\n\n"
+        return
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/_stub/config")
+async def configure(config: StubConfig):
+    overrides[config.model] = {"status": config.status, "latency_ms": config.latency_ms}
+    return overrides[config.model]
+
+
+@app.get("/_stub/calls")
+async def get_calls():
+    return dict(calls)
+
+
+@app.post("/_stub/reset")
+async def reset():
+    overrides.clear()
+    calls.clear()
+    return {"status": "ok"}
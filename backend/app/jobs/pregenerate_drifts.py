@@ -0,0 +1,158 @@
+"""
+Nightly batch job — pre-generates every student's daily drift across a
+process pool and stores it keyed by (student, day). POST /api/drift/generate
+then serves the stored drift in O(1) and only generates on demand for
+students who joined after the batch ran.
+
+    python -m app.jobs.pregenerate_drifts --date 2026-03-01 --workers 8
+    python -m app.jobs.pregenerate_drifts --shard 0 --shards 4
+
+The CLI writes to the configured storage backend, so run it against SQLite
+(KARM_DB_BACKEND=sqlite); with the in-memory backend use the internal
+POST /api/drift/batch/pregenerate endpoint instead.
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.bandit import DriftBandit, drift_bandit
+from ..core.candidate_pool import CandidatePool, candidate_pools
+from ..core.logs import log_pipeline
+from ..core.nudge_engine import NudgeEngine
+from ..db.repository import Repository
+from ..models.drift import DriftNudge
+from ..models.fingerprint import SerendipityFingerprint
+from ..models.student import StudentProfile, AttractorState
+
+# Not __name__, which is __main__ under python -m
+logger = logging.getLogger("app.jobs.pregenerate_drifts")
+
+CHUNK_SIZE = 500
+
+Task = Tuple[StudentProfile, AttractorState, SerendipityFingerprint, str]
+
+_engine: Optional[NudgeEngine] = None
+
+
+def shard_of(student_id: str, shards: int) -> int:
+    """Stable shard assignment (independent of PYTHONHASHSEED)."""
+    return zlib.crc32(student_id.encode()) % shards
+
+
+def _generate_chunk(tasks: List[Task], pool: Optional[CandidatePool] = None) -> List[DriftNudge]:
+    """Worker entry point: one NudgeEngine per process, reused across chunks."""
+    global _engine
+    if _engine is None:
+        _engine = NudgeEngine()
+    drifts = []
+    for student, attractor, fingerprint, drift_type in tasks:
+        drift = _engine.generate_daily_drift(
+            student, attractor, fingerprint, drift_type=drift_type, pool=pool
+        )
+        drift.id = f"drift-{uuid.uuid4().hex[:8]}"
+        drifts.append(drift)
+    return drifts
+
+
+def pregenerate(
+    repo: Repository,
+    day: date,
+    shard: int = 0,
+    shards: int = 1,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict:
+    """
+    Generate `day`'s drift for every student in `shard` of `shards` and
+    store them with repo.save_pregenerated. workers <= 1 runs inline.
+    Drift types come from one batched bandit call in this process (pooled
+    over time-of-day, since the serve time isn't known yet).
+    """
+    started = time.perf_counter()
+    attractors = repo.list_attractors()
+    fingerprints = repo.list_fingerprints()
+    selected = []
+    for student in repo.list_students():
+        if shards > 1 and shard_of(student.id, shards) != shard:
+            continue
+        attractor = attractors.get(student.id)
+        if attractor is None:
+            continue
+        fingerprint = fingerprints.get(student.id) or SerendipityFingerprint(student_id=student.id)
+        selected.append((student, attractor, fingerprint))
+
+    pool = candidate_pools.get(repo, day)
+    # Arms with a live candidate for each student's budget (all arms when none has one)
+    masks = [pool.available(student.time_budget_minutes, student.free_only) for student, _, _ in selected]
+    available = np.array([
+        mask if mask is not None else np.ones(len(DriftBandit.ARMS), dtype=bool) for mask in masks
+    ]).reshape(len(selected), len(DriftBandit.ARMS))
+    drift_types = drift_bandit.select(
+        [student.id for student, _, _ in selected],
+        preferred=[fingerprint.best_drift_type for _, _, fingerprint in selected],
+        available=available,
+        load_history=repo.get_student_drifts
+    )
+    tasks: List[Task] = [(*task, drift_type) for task, drift_type in zip(selected, drift_types)]
+    generate = partial(_generate_chunk, pool=pool)
+
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    generated = 0
+    if workers is not None and workers <= 1:
+        for chunk in chunks:
+            drifts = generate(chunk)
+            repo.save_pregenerated(day, drifts)
+            generated += len(drifts)
+    else:
+        # spawn: never fork a process that may be running an event loop
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for drifts in pool.map(generate, chunks):
+                repo.save_pregenerated(day, drifts)
+                generated += len(drifts)
+
+    result = {
+        "date": day.isoformat(),
+        "shard": shard,
+        "shards": shards,
+        "students": len(tasks),
+        "generated": generated,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("drifts pregenerated", extra=result)
+    return result
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Pre-generate daily drifts for all students.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Day to generate for (YYYY-MM-DD, default: today UTC)")
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Process pool size (default: CPU count, 1 = inline)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    if args.shards < 1 or not 0 <= args.shard < args.shards:
+        parser.error("--shard must be >= 0 and < --shards")
+
+    from ..db.database import db
+    day = args.date or datetime.utcnow().date()
+    log_pipeline.start()
+    try:
+        print(pregenerate(db, day, args.shard, args.shards, args.workers, args.chunk_size))
+    finally:
+        log_pipeline.stop()
+
+
+if __name__ == "__main__":
+    main()
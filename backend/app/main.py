@@ -3,21 +3,38 @@ Karm AI — FastAPI Entry Point
 Structured Serendipity Engine for College Students
 """
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load .env from backend directory
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.routes import drift, profile, bubble, events, discovery_slots, chat
+from .api.middleware import MetricsMiddleware, ProfilingMiddleware, RequestIdMiddleware
+from .api.routes import drift, profile, bubble, events, discovery_slots, chat, collision, imports, admin
+from .core.logs import log_pipeline
+from .core.metrics import CONTENT_TYPE, metrics
+from .core.profiler import profiling_settings, profile_store, stack_sampler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_pipeline.start()
+    # One pooled OpenRouter client per worker instead of one per request
+    await chat.llm_client.start()
+    yield
+    await chat.llm_client.close()
+    log_pipeline.stop()
+
 
 app = FastAPI(
     title="Karm AI API",
     description="Anti-recommendation engine that engineers conditions for unexpected, meaningful experiences.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS — allow frontend dev server
@@ -28,6 +45,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+if profiling_settings.enabled:
+    # Outside Metrics/CORS, so a profile covers them as well
+    app.add_middleware(
+        ProfilingMiddleware,
+        sampler=stack_sampler,
+        store=profile_store,
+        sample_rate=profiling_settings.sample_rate,
+        token=admin.ADMIN_TOKEN
+    )
+# Outermost, so everything below (profiles included) sees the request id
+app.add_middleware(RequestIdMiddleware)
 
 # Include routers
 app.include_router(drift.router, prefix="/api")
@@ -36,6 +65,9 @@ app.include_router(bubble.router, prefix="/api")
 app.include_router(events.router, prefix="/api")
 app.include_router(discovery_slots.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
+app.include_router(collision.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 
 @app.get("/")
@@ -46,3 +78,9 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
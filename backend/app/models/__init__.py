@@ -1,4 +1,4 @@
-from .student import StudentProfile, AttractorState, StudentProfileCreate, StudentProfileUpdate
-from .drift import DriftNudge, DriftReasoning, DriftOutcome, DriftOutcomeRequest, DriftGenerateRequest, CollisionScore
-from .event import CampusEvent, DiscoverySlot, DiscoverySlotCreate
-from .fingerprint import SerendipityFingerprint, FingerprintAxes
+from .student import StudentProfile, AttractorState, AttractorMetrics, StudentProfileCreate, StudentProfileUpdate, StudentImport
+from .drift import DriftNudge, DriftReasoning, DriftOutcome, DriftOutcomeRequest, DriftGenerateRequest, DriftBatchRequest, CollisionScore, CollisionPartner
+from .event import CampusEvent, DiscoverySlot, DiscoverySlotCreate, AttendanceRecord
+from .fingerprint import SerendipityFingerprint, FingerprintAxes, FingerprintCounters
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date as Date, datetime
 from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 import uuid
@@ -48,9 +48,23 @@ class DriftGenerateRequest(BaseModel):
     student_id: str
 
 
+class DriftBatchRequest(BaseModel):
+    date: Optional[Date] = None  # default: today (UTC); Date, as `date` is the field name
+    shard: int = Field(0, ge=0)
+    shards: int = Field(1, ge=1)
+    workers: Optional[int] = Field(None, ge=1)
+
+
 class CollisionScore(BaseModel):
     overall: float
     skill_complementarity: float
     shared_hidden_interests: float
     timing_alignment: float
     gap_profile_match: float
+
+
+class CollisionPartner(BaseModel):
+    student_id: str
+    name: str
+    department: str
+    score: CollisionScore
@@ -1,16 +1,27 @@
-from datetime import datetime
-from typing import List, Literal
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Annotated, List, Literal, Optional
+from pydantic import AfterValidator, BaseModel, Field
 import uuid
 
 
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Campus times are stored as naive UTC; aware inputs are converted."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Indexes compare times across records, which mixed naive/aware values break
+UTCDateTime = Annotated[datetime, AfterValidator(naive_utc)]
+
+
 class CampusEvent(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
     department: str
     type: str  # 'talk', 'workshop', 'performance', 'social', 'sports'
     location: str
-    start_time: datetime
+    start_time: UTCDateTime
     duration_minutes: int
     is_free: bool = True
     expected_attendees: List[str] = Field(default_factory=list)
@@ -23,7 +34,7 @@ class DiscoverySlot(BaseModel):
     organizer_type: Literal['club', 'vendor', 'event']
     name: str
     location: str
-    available_times: List[datetime]
+    available_times: List[UTCDateTime]
     description: str
     tags: List[str] = Field(default_factory=list)
 
@@ -33,6 +44,13 @@ class DiscoverySlotCreate(BaseModel):
     organizer_type: Literal['club', 'vendor', 'event']
     name: str
     location: str
-    available_times: List[datetime]
+    available_times: List[UTCDateTime]
     description: str
     tags: List[str] = Field(default_factory=list)
+
+
+class AttendanceRecord(BaseModel):
+    """One NDJSON line of POST /api/import/attendance."""
+    student_id: str
+    event_id: str
+    attended_at: Optional[UTCDateTime] = None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +12,18 @@ class FingerprintAxes(BaseModel):
     timing_flexibility: float = 40
 
 
+class FingerprintCounters(BaseModel):
+    """Running per-axis numerators/denominators behind FingerprintAxes."""
+    total: int = 0
+    meaningful: int = 0
+    spontaneous: int = 0
+    cross_departmental: int = 0
+    social: int = 0
+    creative: int = 0
+    accepted_types: Dict[str, int] = Field(default_factory=dict)
+    meaningful_types: Dict[str, int] = Field(default_factory=dict)
+
+
 class SerendipityFingerprint(BaseModel):
     student_id: str
     axes: FingerprintAxes = Field(default_factory=FingerprintAxes)
@@ -20,3 +33,4 @@ class SerendipityFingerprint(BaseModel):
     best_drift_type: str = "canteen"
     best_time_of_day: str = "Lunch (12-2PM)"
     last_updated: datetime = Field(default_factory=datetime.utcnow)
+    counters: Optional[FingerprintCounters] = None  # None until backfilled from history
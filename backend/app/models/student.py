@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, NamedTuple, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
 import uuid
 
 
@@ -19,6 +19,13 @@ class StudentProfile(BaseModel):
     drift_streak: int = 0
 
 
+class AttractorMetrics(NamedTuple):
+    bubble_percentage: float
+    departments_ratio: str
+    canteen_variety_score: float
+    event_diversity_score: float
+
+
 class AttractorState(BaseModel):
     student_id: str
     departments_visited: List[str] = Field(default_factory=list)
@@ -28,23 +35,41 @@ class AttractorState(BaseModel):
     content_domains_explored: List[str] = Field(default_factory=list)
     last_updated: datetime = Field(default_factory=datetime.utcnow)
 
+    # (collection sizes, metrics) — the metrics only depend on the sizes, so a
+    # changed size signature marks the cache dirty (covers append and reassignment)
+    _metrics: Optional[Tuple[Tuple[int, int, int, int], AttractorMetrics]] = PrivateAttr(default=None)
+
+    def counts(self) -> Tuple[int, int, int, int]:
+        return (
+            len(self.departments_visited),
+            len(self.canteen_counters_used),
+            len(self.event_types_attended),
+            len(self.content_domains_explored),
+        )
+
+    @property
+    def metrics(self) -> AttractorMetrics:
+        counts = self.counts()
+        if self._metrics is None or self._metrics[0] != counts:
+            from ..core.attractor_mapper import AttractorMapper
+            self._metrics = (counts, AttractorMapper.metrics_from_counts(*counts))
+        return self._metrics[1]
+
     @property
     def bubble_percentage(self) -> float:
-        from ..core.attractor_mapper import AttractorMapper
-        mapper = AttractorMapper()
-        return mapper.compute_bubble_percentage(self)
+        return self.metrics.bubble_percentage
 
     @property
     def departments_ratio(self) -> str:
-        return f"{len(self.departments_visited)} of 14"
+        return self.metrics.departments_ratio
 
     @property
     def canteen_variety_score(self) -> float:
-        return round(len(self.canteen_counters_used) / 8 * 100, 1)
+        return self.metrics.canteen_variety_score
 
     @property
     def event_diversity_score(self) -> float:
-        return round(len(self.event_types_attended) / 8 * 100, 1)
+        return self.metrics.event_diversity_score
 
 
 class StudentProfileCreate(BaseModel):
@@ -58,6 +83,11 @@ class StudentProfileCreate(BaseModel):
     accessibility: List[str] = Field(default_factory=list)
 
 
+class StudentImport(StudentProfileCreate):
+    """One NDJSON line of POST /api/import/students; a known id updates the profile."""
+    id: Optional[str] = None
+
+
 class StudentProfileUpdate(BaseModel):
     name: Optional[str] = None
     department: Optional[str] = None
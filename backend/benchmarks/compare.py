@@ -0,0 +1,50 @@
+"""
+Diff two benchmark result files:
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+
+Exits non-zero when any scenario's p95 regressed by more than --threshold.
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression, percent")
+    args = parser.parse_args(argv)
+
+    base, head = (json.loads(p.read_text()) for p in (args.base, args.head))
+    print(f"base {base['meta']['commit']} ({base['meta']['target']})  ->  "
+          f"head {head['meta']['commit']} ({head['meta']['target']})")
+    print(f"{'scenario':<18}" + "".join(f"{m:>30}" for m in METRICS))
+
+    regressions = []
+    for name, after in head["scenarios"].items():
+        before = base["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<18} (new)")
+            continue
+        cells = [f"{before[m]:>9.2f} → {after[m]:>8.2f} {_change(before[m], after[m])}" for m in METRICS]
+        print(f"{name:<18}" + "".join(f"{c:>30}" for c in cells))
+        if before["p95_ms"] and (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        raise SystemExit(f"p95 regressed > {args.threshold}%: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
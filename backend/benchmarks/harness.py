@@ -0,0 +1,185 @@
+"""
+Load loop, latency statistics and the two targets (in-process ASGI and a
+local uvicorn) shared by the benchmark scenarios.
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STUB_KEY = "bench-key"
+
+
+@dataclass
+class Result:
+    name: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+    @staticmethod
+    def _percentile(ordered: List[float], q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+    def summary(self) -> Dict:
+        ordered = sorted(self.latencies)
+        ms = lambda s: round(s * 1000, 3)
+        return {
+            "requests": len(ordered) + self.errors,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "seconds": round(self.seconds, 3),
+            "throughput_rps": round(len(ordered) / self.seconds, 1) if self.seconds else 0.0,
+            "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+            "p50_ms": ms(self._percentile(ordered, 0.50)),
+            "p95_ms": ms(self._percentile(ordered, 0.95)),
+            "p99_ms": ms(self._percentile(ordered, 0.99)),
+            "max_ms": ms(ordered[-1]) if ordered else 0.0,
+        }
+
+
+async def run_load(
+    name: str,
+    client: httpx.AsyncClient,
+    request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+    warmup: int = 0
+) -> Result:
+    """Fire `total` requests (request(client, i)) from `concurrency` workers; time each one."""
+    for i in range(warmup):
+        await request(client, -1 - i)
+
+    result = Result(name, concurrency)
+    next_index = iter(range(total))
+
+    async def worker():
+        for i in next_index:
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            if ok:
+                result.latencies.append(elapsed)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+# ── Targets ──
+
+def configure_inprocess_stub(stub_latency_ms: Optional[float] = None):
+    """Point the in-process chat routes at the OpenRouter stub app."""
+    from app.api.routes import chat
+    from app.dev import openrouter_stub
+
+    if stub_latency_ms is not None:
+        openrouter_stub.LATENCY_MS = stub_latency_ms
+    chat.OPENROUTER_API_KEY = STUB_KEY
+    chat.llm_client.api_key = STUB_KEY
+    chat.llm_client.url = "http://openrouter-stub/api/v1/chat/completions"
+    chat.llm_client.transport = httpx.ASGITransport(app=openrouter_stub.app)
+
+
+@contextlib.asynccontextmanager
+async def asgi_client(stub_latency_ms: Optional[float] = None, campus=None):
+    """
+    httpx client driving app.main:app in-process (lifespan included).
+    `campus` (a synthetic_campus.CampusSpec) is bulk-loaded into the app's db first.
+    """
+    configure_inprocess_stub(stub_latency_ms)
+    from app.main import app
+    if campus is not None:
+        from app.db.database import db
+        from app.dev.synthetic_campus import load
+        print(f"synthetic campus: {load(db, campus)}")
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn(module_app: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module_app, "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env={**os.environ, **env}
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            with contextlib.suppress(httpx.HTTPError):
+                if (await client.get(url)).status_code < 500:
+                    return
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(stub_latency_ms: Optional[float] = None, campus=None):
+    """
+    Start the OpenRouter stub and the app under local uvicorn processes.
+    With `campus`, the app serves a temporary SQLite db preloaded with it.
+    """
+    stub_port, app_port = _free_port(), _free_port()
+    app_env = {
+        "OPENROUTER_API_KEY": STUB_KEY,
+        "OPENROUTER_URL": f"http://127.0.0.1:{stub_port}/api/v1/chat/completions",
+    }
+    workdir = None
+    if campus is not None:
+        from app.db.sqlite import SQLiteDB
+        from app.dev.synthetic_campus import load
+        workdir = tempfile.TemporaryDirectory(prefix="karm-bench-")
+        path = os.path.join(workdir.name, "campus.db")
+        repo = SQLiteDB(path)
+        print(f"synthetic campus: {load(repo, campus)}")
+        repo.close()
+        app_env.update(KARM_DB_BACKEND="sqlite", KARM_DB_PATH=path)
+
+    stub_env = {"STUB_LATENCY_MS": str(stub_latency_ms)} if stub_latency_ms is not None else {}
+    stub = _spawn("app.dev.openrouter_stub:app", stub_port, stub_env)
+    server = _spawn("app.main:app", app_port, app_env)
+    try:
+        await _wait_ready(f"http://127.0.0.1:{stub_port}/_stub/calls")
+        await _wait_ready(f"http://127.0.0.1:{app_port}/health")
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", timeout=60, limits=limits) as client:
+            yield client
+    finally:
+        for proc in (server, stub):
+            proc.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                proc.wait(timeout=10)
+        if workdir is not None:
+            workdir.cleanup()
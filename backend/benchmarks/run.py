@@ -0,0 +1,122 @@
+"""
+Load and latency benchmarks for the Karm AI API.
+
+    python -m benchmarks.run                                 # all scenarios, in-process
+    python -m benchmarks.run --target uvicorn -c 32 -n 2000
+    python -m benchmarks.run --scenarios events,bubble --out results/main.json
+    python -m benchmarks.run --campus-students 100000 --campus-drifts 1000000
+    python -m benchmarks.compare benchmarks/results/a.json benchmarks/results/b.json
+
+Run from backend/. The in-process target drives app.main:app through
+httpx.ASGITransport; the uvicorn target starts the app and the OpenRouter
+stub (app.dev.openrouter_stub) as local processes. Chat always goes to the
+stub. Results are written as JSON (default: benchmarks/results/<commit>-<target>.json).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from app.dev.synthetic_campus import CampusSpec, SyntheticCampus
+
+from .harness import BACKEND_DIR, asgi_client, run_load, uvicorn_client
+from .scenarios import SCENARIOS, Context, create_students
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> Dict:
+    names: List[str] = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (have: {', '.join(SCENARIOS)})")
+
+    client_factory = asgi_client if args.target == "asgi" else uvicorn_client
+    ctx = Context(rng=random.Random(args.seed))
+    campus = None
+    if args.campus_students:
+        campus = CampusSpec(
+            students=args.campus_students, drifts=args.campus_drifts,
+            events=args.campus_events, slots=args.campus_events // 4, seed=args.seed
+        )
+    results = {}
+    async with client_factory(args.stub_latency_ms, campus) as client:
+        await create_students(client, ctx, args.students)
+        if campus:
+            ctx.students += [SyntheticCampus.student_id(i) for i in range(campus.students)]
+        for name in names:
+            scenario = SCENARIOS[name]
+            if scenario.prepare:
+                await scenario.prepare(client, ctx, args.requests)
+            request = lambda c, i, s=scenario: s.request(c, ctx, max(i, 0))
+            result = await run_load(name, client, request, args.requests, args.concurrency,
+                                    warmup=0 if scenario.prepare else args.warmup)
+            results[name] = result.summary()
+            print(f"{name:<18} {results[name]['throughput_rps']:>9.1f} req/s  "
+                  f"p50 {results[name]['p50_ms']:>8.2f} ms  p95 {results[name]['p95_ms']:>8.2f} ms  "
+                  f"p99 {results[name]['p99_ms']:>8.2f} ms  errors {results[name]['errors']}")
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "students": args.students,
+            "campus": {
+                "students": args.campus_students,
+                "drifts": args.campus_drifts,
+                "events": args.campus_events,
+            } if campus else None,
+            "seed": args.seed,
+            "stub_latency_ms": args.stub_latency_ms,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the Karm AI API.")
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--scenarios", default="", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-n", "--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--students", type=int, default=50, help="Students created before the run")
+    parser.add_argument("--campus-students", type=int, default=0,
+                        help="Bulk-load a seeded synthetic campus of this many students first")
+    parser.add_argument("--campus-drifts", type=int, default=0, help="Historical drifts in the synthetic campus")
+    parser.add_argument("--campus-events", type=int, default=200, help="Events in the synthetic campus")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-latency-ms", type=float, default=20.0, help="OpenRouter stub latency")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    out = args.out or RESULTS_DIR / f"{report['meta']['commit']}-{args.target}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
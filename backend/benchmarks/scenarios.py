@@ -0,0 +1,115 @@
+"""
+Benchmark scenarios: one HTTP request per call, plus untimed preparation
+(students to act as, pending drifts to accept/skip/log) done over HTTP so
+the same scenarios work in-process and against uvicorn.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.attractor_mapper import AttractorMapper
+from app.core.collision_scorer import CollisionScorer
+
+SKILLS = sorted(CollisionScorer.DOMAIN_MAP)
+INTERESTS = ['AI', 'Music', 'Photography', 'Startups', 'Theatre', 'Climate', 'Gaming', 'Poetry', 'Robotics', 'Film']
+
+
+@dataclass
+class Context:
+    rng: random.Random
+    students: List[str] = field(default_factory=list)
+    drifts: Dict[str, List[Dict]] = field(default_factory=dict)  # scenario -> pending drifts
+
+    def student(self) -> str:
+        return self.rng.choice(self.students)
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[httpx.AsyncClient, Context, int], Awaitable[httpx.Response]]
+    prepare: Optional[Callable[[httpx.AsyncClient, Context, int], Awaitable[None]]] = None
+
+
+async def create_students(client: httpx.AsyncClient, ctx: Context, n: int):
+    for i in range(n):
+        response = await client.post("/api/profile/create", json={
+            "name": f"Bench Student {i}",
+            "department": ctx.rng.choice(AttractorMapper.ALL_DEPARTMENTS),
+            "year": ctx.rng.randint(1, 4),
+            "skills": ctx.rng.sample(SKILLS, 3),
+            "interests": ctx.rng.sample(INTERESTS, 4),
+            "time_budget_minutes": ctx.rng.choice([30, 45, 60, 90]),
+        })
+        response.raise_for_status()
+        ctx.students.append(response.json()["id"])
+
+
+def _pending_drifts(scenario: str):
+    async def prepare(client: httpx.AsyncClient, ctx: Context, n: int):
+        drifts = ctx.drifts.setdefault(scenario, [])
+        for _ in range(n):
+            response = await client.post("/api/drift/generate", json={"student_id": ctx.student()})
+            response.raise_for_status()
+            drifts.append(response.json())
+    return prepare
+
+
+async def drift_generate(client, ctx, i):
+    return await client.post("/api/drift/generate", json={"student_id": ctx.student()})
+
+
+async def drift_accept(client, ctx, i):
+    drift = ctx.drifts["drift_accept"][i]
+    return await client.post(f"/api/drift/{drift['id']}/accept", params={"student_id": drift["student_id"]})
+
+
+async def drift_skip(client, ctx, i):
+    drift = ctx.drifts["drift_skip"][i]
+    return await client.post(f"/api/drift/{drift['id']}/skip", params={"student_id": drift["student_id"]})
+
+
+async def drift_outcome(client, ctx, i):
+    drift = ctx.drifts["drift_outcome"][i]
+    return await client.post(f"/api/drift/{drift['id']}/outcome", json={
+        "was_interesting": ctx.rng.random() < 0.4, "description": "bench"
+    })
+
+
+async def bubble(client, ctx, i):
+    return await client.get(f"/api/bubble/{ctx.student()}")
+
+
+async def bubble_campus(client, ctx, i):
+    return await client.get("/api/bubble/campus/stats")
+
+
+async def events(client, ctx, i):
+    return await client.get("/api/events/", params={"limit": 50})
+
+
+async def chat_ask(client, ctx, i):
+    # Distinct queries: every request misses the response cache and hits the (stub) upstream
+    return await client.post("/api/chat/ask", json={
+        "query": f"what's on tonight for someone into {ctx.rng.choice(INTERESTS)} #{i}",
+        "student_id": ctx.student(),
+    })
+
+
+async def chat_ask_cached(client, ctx, i):
+    return await client.post("/api/chat/ask", json={"query": "any free events?", "student_id": ctx.students[0]})
+
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in [
+    Scenario("drift_generate", drift_generate),
+    Scenario("drift_accept", drift_accept, _pending_drifts("drift_accept")),
+    Scenario("drift_skip", drift_skip, _pending_drifts("drift_skip")),
+    Scenario("drift_outcome", drift_outcome, _pending_drifts("drift_outcome")),
+    Scenario("bubble", bubble),
+    Scenario("bubble_campus", bubble_campus),
+    Scenario("events", events),
+    Scenario("chat_ask", chat_ask),
+    Scenario("chat_ask_cached", chat_ask_cached),
+]}
@@ -0,0 +1,22 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from app.core.feature_store import FeatureStore
+from app.dev.synthetic_campus import CampusSpec, SyntheticCampus
+from app.models.student import AttractorState, StudentProfile
+
+
+def synthetic_students(n: int, seed: int = 7) -> Tuple[List[StudentProfile], Dict[str, AttractorState]]:
+    """n seeded synthetic students and their attractors (no drift history)."""
+    students, attractors = [], {}
+    for batch in SyntheticCampus(CampusSpec(students=n, events=0, slots=0, drifts=0, seed=seed)).batches():
+        students.extend(batch.students)
+        attractors.update((a.student_id, a) for a in batch.attractors)
+    return students, attractors
+
+
+@pytest.fixture
+def features() -> FeatureStore:
+    """A private feature store, so tests don't share interned state with the app singleton."""
+    return FeatureStore()
@@ -0,0 +1,54 @@
+from collections import Counter
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.api.routes import drift as drift_routes
+from app.core.bandit import DriftBandit
+from app.main import app
+
+NOON_UTC = datetime(2030, 1, 1, 12, 0)
+
+
+def test_rewarded_arm_wins():
+    bandit = DriftBandit(seed=3)
+    for _ in range(30):
+        for arm in DriftBandit.ARMS:
+            bandit.pull("stu", arm, NOON_UTC)
+        bandit.reward("stu", "route", NOON_UTC, 1.0)
+    picks = Counter(bandit.select(["stu"] * 200, when=NOON_UTC))
+    assert picks.most_common(1)[0][0] == "route"
+    assert picks["route"] > 150
+    assert Counter(bandit.select(["stu"] * 200, when=NOON_UTC, strategy="ucb"))["route"] == 200
+
+
+def test_available_mask_excludes_arms():
+    bandit = DriftBandit(seed=3)
+    bandit.pull("stu", "route", NOON_UTC)
+    bandit.reward("stu", "route", NOON_UTC, 1.0)
+    mask = np.array([True, True, False, False])  # canteen, event only
+    assert set(bandit.select(["stu"] * 50, when=NOON_UTC, available=mask)) <= {"canteen", "event"}
+
+
+def test_contexts_follow_the_campus_clock():
+    kolkata = DriftBandit(tz=ZoneInfo("Asia/Kolkata"))
+    # 13:00 UTC is 18:30 in Kolkata: evening there, afternoon in UTC
+    assert kolkata.context_of(datetime(2030, 1, 1, 13, 0)) == DriftBandit.CONTEXTS.index("evening")
+    assert DriftBandit(tz=ZoneInfo("UTC")).context_of(datetime(2030, 1, 1, 13, 0)) == 1
+
+
+def test_only_the_first_outcome_is_rewarded(monkeypatch):
+    bandit = DriftBandit(seed=1)
+    monkeypatch.setattr(drift_routes, "drift_bandit", bandit)
+    client = TestClient(app)
+    drift = client.post("/api/drift/generate", json={"student_id": "stu-001"}).json()
+    for interesting in (True, True, False):
+        response = client.post(f"/api/drift/{drift['id']}/outcome", json={"was_interesting": interesting})
+        assert response.status_code == 200
+
+    arms = client.get("/api/drift/bandit/stu-001").json()["arms"]
+    rewards = sum(arm["rewards"] for context in arms.values() for arm in context.values())
+    assert rewards == 1
+    assert arms[DriftBandit.CONTEXTS[bandit.context_of(datetime.fromisoformat(drift["created_at"]))]][drift["type"]]["rewards"] == 1
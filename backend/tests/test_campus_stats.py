@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from app.core.campus_stats import CampusBubbleStats
+from app.db.database import InMemoryDB
+from app.db.sqlite import SQLiteDB
+from app.dev.synthetic_campus import DEPARTMENTS
+
+from .conftest import synthetic_students
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repos(request, tmp_path):
+    """(writer, reader): the same repo in memory; two SQLite workers on one file."""
+    if request.param == "memory":
+        repo = InMemoryDB()
+        yield repo, repo
+        return
+    path = str(tmp_path / "karm.db")
+    writer, reader = SQLiteDB(path), SQLiteDB(path)
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+
+def _full(repo) -> dict:
+    stats = CampusBubbleStats()
+    stats.rebuild(repo)
+    return stats.stats()
+
+
+def test_incremental_sync_matches_a_full_recompute(repos):
+    writer, reader = repos
+    students, attractors = synthetic_students(300, seed=21)
+    writer.save_students(students[:250])
+    writer.save_attractors(attractors[s.id] for s in students[:250])
+
+    incremental = CampusBubbleStats()
+    incremental.sync(reader)
+    assert incremental.stats() == _full(reader)
+
+    def no_rebuild(repo):
+        raise AssertionError("sync fell back to a full rebuild")
+    incremental.rebuild = no_rebuild
+
+    rng = random.Random(4)
+    for round_ in range(5):
+        # Profile moves (department, year)
+        moved = [s.model_copy(update={"department": rng.choice(DEPARTMENTS), "year": rng.randint(1, 4)})
+                 for s in rng.sample(students[:250], 20)]
+        writer.save_students(moved)
+        # Attractor updates: more departments visited, new connections
+        updated = []
+        for s in rng.sample(students[:250], 30):
+            a = writer.get_attractor(s.id)
+            visited = sorted(set(a.departments_visited) | set(rng.sample(DEPARTMENTS, 2)))
+            updated.append(a.model_copy(update={
+                "departments_visited": visited, "new_connections_count": a.new_connections_count + 1
+            }))
+        writer.save_attractors(updated)
+        # New students, the last of them without an attractor yet
+        joining = students[250 + 10 * round_:260 + 10 * round_]
+        writer.save_students(joining)
+        writer.save_attractors(attractors[s.id] for s in joining[:-1])
+
+        incremental.sync(reader)
+        assert incremental.stats() == _full(reader), round_
+
+    # A late attractor brings the student in
+    writer.save_attractors([attractors[students[259].id]])
+    incremental.sync(reader)
+    assert incremental.stats() == _full(reader)
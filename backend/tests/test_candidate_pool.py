@@ -0,0 +1,67 @@
+import random
+from datetime import datetime, timedelta
+
+from app.core.candidate_pool import CandidatePool
+from app.models.event import CampusEvent
+
+
+def _pool() -> CandidatePool:
+    return CandidatePool([
+        CampusEvent(id=f"evt-{i}", title=f"Event {i}", department="Music", type="talk", location="Hall",
+                    start_time=datetime(2030, 1, 1, 9 + i % 8), duration_minutes=15 * (1 + i % 6),
+                    is_free=i % 3 != 0)
+        for i in range(60)
+    ])
+
+
+def test_eligible_shares_the_partitions():
+    pool = _pool()
+    views = pool.eligible("event", 45, free_only=False)
+    assert len(views) == 2
+    assert all(items is pool._partitions[("event", free)][1] for (items, _), free in zip(views, (True, False)))
+
+
+def test_pick_respects_budget_and_free_only():
+    pool, rng = _pool(), random.Random(3)
+    picks = [pool.pick("event", 45, free_only=True, rng=rng) for _ in range(300)]
+    assert all(p["time_required_minutes"] <= 45 and p["is_free"] for p in picks)
+    # every eligible candidate is reachable
+    eligible = {c["source_id"] for items, n in pool.eligible("event", 45, True) for c in items[:n]}
+    assert {p["source_id"] for p in picks} == eligible
+    assert pool.pick("event", 10, free_only=False) is None
+
+
+def test_todays_pool_leaves_out_what_has_started():
+    from app.core.candidate_pool import CandidatePools
+    from app.db.database import InMemoryDB
+    from app.models.event import DiscoverySlot
+
+    day = datetime(2030, 1, 1)
+    repo = InMemoryDB()
+    repo.save_events([
+        CampusEvent(id=f"evt-{hour}", title=f"At {hour}", department="Music", type="talk", location="Hall",
+                    start_time=day.replace(hour=hour), duration_minutes=30)
+        for hour in (9, 21)
+    ])
+    repo.save_slots([DiscoverySlot(
+        id="ds-day", organizer_id="club", organizer_type="club", name="Studio", location="Room 2",
+        description="Drop in", available_times=[day.replace(hour=10), day.replace(hour=22)],
+    )])
+    pools = CandidatePools()
+
+    evening = pools.get(repo, day.date(), now=day.replace(hour=20, minute=15))
+    picks = {evening.pick(t, 120, False)["source_id"] for t in ("event", "space") for _ in range(20)}
+    assert picks == {"evt-21", "ds-day"}
+    assert evening.pick("space", 120, False)["time"] == "10:00 PM"
+
+    # A pool for a later day (pregeneration) starts at midnight
+    assert len(pools.get(repo, day.date(), now=day.replace(hour=8) - timedelta(days=1))) == 3
+    # Today's pool is re-keyed per hour, not per call
+    assert pools.get(repo, day.date(), now=day.replace(hour=8, minute=59)) is pools.get(
+        repo, day.date(), now=day.replace(hour=8))
+
+
+def test_available_marks_the_types_with_a_fitting_candidate():
+    pool = _pool()
+    assert pool.available(45, free_only=False).tolist() == [False, True, False, False]
+    assert pool.available(10, free_only=False) is None
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.core.collision_engine import CollisionEngine
+from app.core.collision_scorer import CollisionScorer
+
+from .conftest import synthetic_students
+
+
+@pytest.fixture
+def campus(features):
+    students, attractors = synthetic_students(120)
+    # A few students without an attractor exercise the Γ fallback
+    for student in students[::17]:
+        attractors.pop(student.id)
+    engine = CollisionEngine(features).fit(students, attractors)
+    return students, attractors, engine, CollisionScorer(features)
+
+
+def test_one_vs_all_matches_scalar_scorer(campus):
+    # CollisionScore rounds components to 3 places and overall to 0.1 points
+    students, attractors, engine, scorer = campus
+    for a in students[:20]:
+        comps = engine.score_one_vs_all(a.id)
+        for j, b in enumerate(students):
+            expected = scorer.score(a, b, attractors.get(a.id), attractors.get(b.id), expected=True)
+            assert comps['skill_complementarity'][j] == pytest.approx(expected.skill_complementarity, abs=5.01e-4)
+            assert comps['shared_hidden_interests'][j] == pytest.approx(expected.shared_hidden_interests, abs=5.01e-4)
+            assert comps['gap_profile_match'][j] == pytest.approx(expected.gap_profile_match, abs=5.01e-4)
+            assert round(float(comps['overall'][j]) * 100, 1) == pytest.approx(expected.overall, abs=0.051)
+
+
+def test_all_pairs_blocks_match_one_vs_all(campus):
+    students, _, engine, _ = campus
+    for rows, comps in engine.score_all_pairs(block_size=32):
+        for offset, row in enumerate(range(rows.start, rows.stop)):
+            single = engine.score_one_vs_all(students[row].id)
+            np.testing.assert_allclose(comps['overall'][offset], single['overall'])
+
+
+def test_top_k_is_the_best_k_by_scalar_score(campus):
+    students, attractors, engine, scorer = campus
+    a = students[0]
+    top = engine.top_k_partners(a.id, k=10)
+    assert len(top) == 10 and a.id not in {pid for pid, _ in top}
+    assert [s.overall for _, s in top] == sorted((s.overall for _, s in top), reverse=True)
+
+    scalar = sorted(
+        (scorer.score(a, b, attractors.get(a.id), attractors.get(b.id), expected=True).overall
+         for b in students if b.id != a.id),
+        reverse=True
+    )
+    assert [s.overall for _, s in top] == pytest.approx(scalar[:10], abs=0.051)
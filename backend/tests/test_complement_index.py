@@ -0,0 +1,39 @@
+import pytest
+
+from app.core.collision_engine import CollisionEngine
+from app.core.complement_index import ComplementIndex
+
+from .conftest import synthetic_students
+
+
+@pytest.fixture(scope="module")
+def campus():
+    return synthetic_students(1000, seed=11)
+
+
+def test_recall_lower_bound_on_synthetic_campus(campus, features):
+    students, attractors = campus
+    engine = CollisionEngine(features)
+    engine.fit(students, attractors)
+    index = ComplementIndex(features)
+    for student in students:
+        index.insert(student, attractors.get(student.id))
+    by_id = {s.id: s for s in students}
+
+    result = index.recall([s.id for s in students[:100]], 10, engine.top_k_partners, by_id.get, attractors.get)
+
+    # Measured 0.61 / 0.97 with a 200-candidate shortlist (20% of this campus)
+    assert result["mean_shortlist"] <= index.shortlist
+    assert result["recall"] >= 0.5
+    assert result["score_recall"] >= 0.85
+
+
+def test_shortlist_is_capped_and_ranked(campus, features):
+    students, attractors = campus
+    index = ComplementIndex(features, shortlist=25)
+    for student in students:
+        index.insert(student, attractors.get(student.id))
+    query = students[0]
+    shortlist = index.candidates(query, attractors.get(query.id))
+    assert len(shortlist) == 25 and query.id not in shortlist
+    assert shortlist == index.candidates(query, attractors.get(query.id))
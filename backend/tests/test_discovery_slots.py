@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.sqlite import SQLiteDB
+from app.main import app
+from app.models.event import DiscoverySlot
+
+
+def _slot_json(when: str) -> dict:
+    return {
+        "organizer_id": "club-tz",
+        "organizer_type": "club",
+        "name": "Timezone Club",
+        "location": "Quad",
+        "available_times": [when],
+        "description": "Regression slot",
+        "tags": ["tz-regression"],
+    }
+
+
+def test_create_slot_with_aware_time_is_stored_as_naive_utc():
+    client = TestClient(app)
+    response = client.post("/api/discovery-slots/create", json=_slot_json("2030-01-01T10:00:00+02:00"))
+    assert response.status_code == 200
+    assert response.json()["available_times"] == ["2030-01-01T08:00:00"]
+
+    active = client.get("/api/discovery-slots/active", params={"tag": "tz-regression"})
+    assert active.status_code == 200
+    assert response.json()["id"] in [s["id"] for s in active.json()]
+
+
+def test_index_builds_over_stored_aware_times(tmp_path):
+    # A row written before times were normalized must not break the index on restart
+    path = str(tmp_path / "slots.db")
+    repo = SQLiteDB(path)
+    when = (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    aware = {"id": "ds-aware", **_slot_json(when)}
+    repo._conn.execute(
+        "INSERT INTO discovery_slots (id, data) VALUES (?, ?)", ("ds-aware", DiscoverySlot(**aware).model_dump_json())
+    )
+    repo._conn.execute(
+        "UPDATE discovery_slots SET data = replace(data, ?, ?) WHERE id = 'ds-aware'", (when[:-1], when)
+    )
+    repo.close()
+
+    reopened = SQLiteDB(path)
+    try:
+        ids = [s.id for s in reopened.slot_index.active(datetime.utcnow())]
+        assert "ds-aware" in ids
+    finally:
+        reopened.close()
+
+
+def test_active_matches_a_full_scan_on_both_filter_paths():
+    import random
+
+    from app.db.slot_index import SlotIndex
+
+    rng = random.Random(3)
+    base = datetime(2030, 1, 1)
+    slots = [
+        DiscoverySlot(
+            id=f"ds-{i}", organizer_id="club", organizer_type="club", name=f"Slot {i}",
+            location=rng.choice(["North Quad", "Library Lawn", "South Quad"]),
+            available_times=[base + timedelta(hours=rng.randrange(200)) for _ in range(rng.randrange(4))],
+            description="", tags=[rng.choice(["music", "chess", "food"]) for _ in range(2)],
+        )
+        for i in range(300)
+    ]
+    index = SlotIndex(slots)
+    now = base + timedelta(hours=50)
+
+    def expected(tags, location, until, limit):
+        words = SlotIndex.location_words(location or "")
+        hits = []
+        for slot in slots:
+            if not set(tags) <= set(slot.tags) or not words <= SlotIndex.location_words(slot.location):
+                continue
+            upcoming = sorted(t for t in slot.available_times if t >= now)
+            if upcoming and (until is None or upcoming[0] < until):
+                hits.append((0, upcoming[0], slot.id))
+            elif not slot.available_times and until is None:
+                hits.append((1, None, slot.id))
+        ids = [sid for *_, sid in sorted(hits, key=lambda h: (h[0], h[1] or base, h[2]))]
+        return ids[:limit] if limit else ids
+
+    for tags, location in [((), None), (("music",), None), (("chess", "food"), "quad"), ((), "library")]:
+        for until in (None, now + timedelta(hours=10), now + timedelta(hours=200)):
+            for limit in (None, 1, 5):
+                got = [s.id for s in index.active(now, tags, location, until, limit)]
+                assert got == expected(tags, location, until, limit), (tags, location, until, limit)
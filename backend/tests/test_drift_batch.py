@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import admin, drift
+from app.jobs import pregenerate_drifts
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_pregenerate_is_hidden_without_an_admin_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    assert client.post("/api/drift/batch/pregenerate", json={}).status_code == 404
+
+
+def test_pregenerate_rejects_a_wrong_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    response = client.post("/api/drift/batch/pregenerate", json={}, headers={"X-Admin-Token": "guess"})
+    assert response.status_code == 403
+
+
+def test_pregenerate_caps_workers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(drift, "pregenerate", lambda *args: calls.append(args) or {})
+    response = client.post(
+        "/api/drift/batch/pregenerate", json={"workers": 10_000}, headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert calls[0][-1] == drift.MAX_PREGENERATE_WORKERS
+    bad = client.post("/api/drift/batch/pregenerate", json={"workers": 0}, headers={"X-Admin-Token": "secret"})
+    assert bad.status_code == 422
+
+
+def test_pregenerate_accepts_an_explicit_date(monkeypatch):
+    calls = []
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(drift, "pregenerate", lambda *args: calls.append(args) or {})
+    response = client.post(
+        "/api/drift/batch/pregenerate", json={"date": "2026-03-01", "workers": 1},
+        headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert calls[0][1] == date(2026, 3, 1)
+
+
+def test_pregenerate_rejects_a_shard_outside_shards(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    response = client.post(
+        "/api/drift/batch/pregenerate", json={"shard": 2, "shards": 2}, headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 422
+
+
+def test_cli_rejects_a_shard_outside_shards():
+    with pytest.raises(SystemExit):
+        pregenerate_drifts.main(["--shard", "4", "--shards", "4"])
@@ -0,0 +1,81 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.event_store import EventStore
+from app.models.event import CampusEvent
+
+ORIGIN = datetime(2030, 1, 1)
+
+
+def _events(n: int, seed: int = 3, prefix: str = "ev"):
+    rng = random.Random(seed)
+    return [
+        CampusEvent(
+            id=f"{prefix}-{i}",
+            title=f"Event {i}",
+            department=rng.choice(["CS", "Music", "Design"]),
+            type=rng.choice(["talk", "workshop", "social"]),
+            location="Hall",
+            start_time=ORIGIN + timedelta(minutes=rng.randint(0, 10_000)),
+            duration_minutes=60,
+            is_free=rng.random() < 0.5,
+        )
+        for i in range(n)
+    ]
+
+
+def _brute(events, event_type=None, free_only=False, start=None):
+    return sorted(
+        (e for e in events
+         if (event_type is None or e.type == event_type)
+         and (not free_only or e.is_free)
+         and (start is None or e.start_time >= start)),
+        key=lambda e: e.start_time
+    )
+
+
+@pytest.mark.parametrize("batch", [1, 500])  # insort and merge paths
+def test_replacements_reuse_slots_and_clear_old_bits(batch):
+    store = EventStore()
+    current = {e.id: e for e in _events(200)}
+    store.add_many(current.values())
+    for round_ in range(5):
+        changed = _events(200, seed=10 + round_)
+        for i in range(0, len(changed), batch):
+            store.add_many(changed[i:i + batch])
+        current.update((e.id, e) for e in changed)
+
+    assert len(store) == 200
+    assert len(store._events) == 200
+    assert len(store._time_index) == 200
+    assert max(store._live, store._free, *store._by_type.values()).bit_length() <= 200
+    for event_type in (None, "talk", "social"):
+        for free_only in (False, True):
+            got, _ = store.query(event_type=event_type, free_only=free_only)
+            assert [e.id for e in got] == [e.id for e in _brute(current.values(), event_type, free_only)]
+
+
+def test_pagination_over_bulk_load():
+    events = _events(1000)
+    store = EventStore(events)
+    start = ORIGIN + timedelta(minutes=5000)
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.query(start=start, limit=37, cursor=cursor)
+        seen.extend(e.id for e in page)
+        if cursor is None:
+            break
+    assert seen == [e.id for e in _brute(events, start=start)]
+
+
+def test_aware_times_are_rejected_without_changes():
+    store = EventStore(_events(50))
+    before = (store.version, list(store._time_index), store._live)
+    bad = _events(20, seed=9, prefix="new")
+    bad[-1] = bad[-1].model_copy(update={"start_time": datetime(2030, 1, 2, tzinfo=timezone.utc)})
+    with pytest.raises(ValueError):
+        store.add_many(bad)
+    assert (store.version, store._time_index, store._live) == before
+    assert store.get("new-0") is None
@@ -0,0 +1,69 @@
+import random
+
+from app.core.fingerprint_builder import FingerprintBuilder
+from app.models.drift import DriftNudge, DriftOutcome, DriftReasoning
+from app.models.fingerprint import SerendipityFingerprint
+
+TYPES = ('canteen', 'event', 'route', 'space')
+TAGS = ('creative', 'social', 'connection', 'collaboration', 'cross-departmental', 'cross-dept')
+
+
+def _drift(rng: random.Random, i: int) -> DriftNudge:
+    return DriftNudge(
+        id=f"drift-{i}", student_id="stu-fp", type=rng.choice(TYPES), title="t", description="d",
+        location="l", time="Anytime", collision_potential_score=80,
+        reasoning=DriftReasoning(
+            gap_description="g", days_since_intersection=3, skills_complementarity=70,
+            shared_interests_score=70, timing_alignment=70, gap_profile_match=70, scenario_chips=[]
+        ),
+        time_required_minutes=rng.choice((5, 15, 30, 60)),
+    )
+
+
+def _outcome(rng: random.Random, drift: DriftNudge) -> DriftOutcome:
+    return DriftOutcome(
+        drift_id=drift.id, was_interesting=rng.random() < 0.6,
+        fingerprint_tags=rng.sample(TAGS, rng.randint(0, 3)),
+    )
+
+
+def test_delta_updates_match_a_full_rebuild():
+    builder = FingerprintBuilder()
+    rng = random.Random(13)
+    history = []
+    fingerprint = SerendipityFingerprint(student_id="stu-fp")
+    seen = set()
+
+    for step in range(40):
+        action = "generate" if len(history) < 3 else rng.choice(
+            ("generate", "accept", "skip", "outcome", "outcome", "skip_accepted")
+        )
+        if action == "generate":
+            drift, before = _drift(rng, step), None
+            history.append(drift)
+        else:
+            accepted = [d for d in history if d.status == 'accepted']
+            if action == "skip_accepted" and not accepted:
+                action = "skip"
+            drift = rng.choice(accepted if action == "skip_accepted" else history)
+            before = builder.contribution(drift)
+            if action == "accept":
+                drift.status = 'accepted'
+            elif action in ("skip", "skip_accepted"):
+                drift.status = 'skipped'
+            else:
+                if drift.outcome is not None:
+                    seen.add("relog")  # re-scores the same drift (interest and tags may change)
+                drift.outcome = _outcome(rng, drift)
+                drift.status = 'accepted'
+        seen.add(action)
+
+        fingerprint = builder.apply(fingerprint, before, drift, lambda: list(history))
+        assert fingerprint.axes == builder.build(history), (step, action)
+        assert fingerprint.counters == builder.counters_from_history(history), (step, action)
+        assert fingerprint.total_drifts == len(history)
+        assert fingerprint.meaningful_drifts == sum(
+            1 for d in history if d.outcome and d.outcome.was_interesting
+        )
+
+    assert seen == {"generate", "accept", "skip", "outcome", "relog", "skip_accepted"}
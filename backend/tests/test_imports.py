@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.database import InMemoryDB
+from app.main import app
+from app.models.event import CampusEvent
+from app.models.student import StudentProfile
+
+from .conftest import synthetic_students
+
+
+def _event(event_id: str, start: str) -> dict:
+    return {
+        "id": event_id, "title": "Import test", "department": "Music", "type": "talk",
+        "location": "Hall", "start_time": start, "duration_minutes": 45,
+    }
+
+
+def test_event_import_normalizes_offsets_and_reports_bad_lines():
+    body = "\n".join([
+        json.dumps(_event("imp-tz-1", "2029-06-01T12:00:00Z")),
+        json.dumps(_event("imp-tz-2", "2029-06-01T12:00:00+02:00")),
+        json.dumps({"id": "imp-tz-3", "title": "missing fields"}),
+    ])
+    client = TestClient(app)
+    response = client.post("/api/import/events", content=body)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["imported"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["line"] == 3
+
+    listed = client.get("/api/events/", params={"start": "2029-01-01T00:00:00", "limit": 500}).json()
+    times = {e["id"]: e["start_time"] for e in listed}
+    assert times["imp-tz-1"] == "2029-06-01T12:00:00"
+    assert times["imp-tz-2"] == "2029-06-01T10:00:00"
+
+
+def test_rejected_event_batch_changes_neither_list_nor_index():
+    repo = InMemoryDB()
+    store = repo.event_store
+    before = (list(repo.events), len(store), store.version)
+    good = CampusEvent(**_event("atomic-1", "2029-06-01T12:00:00"))
+    # model_construct skips the normalizing validator, as a bulk loader might
+    aware = CampusEvent.model_construct(**{**good.model_dump(), "id": "atomic-2",
+                                           "start_time": datetime(2029, 6, 1, tzinfo=timezone.utc)})
+    with pytest.raises(ValueError):
+        repo.save_events([good, aware])
+    assert (list(repo.events), len(store), store.version) == before
+    assert store.get("atomic-1") is None
+
+
+def _student(student_id, name: str, year: int = 2) -> dict:
+    return {"id": student_id, "name": name, "department": "Physics", "year": year, "skills": ["python"]}
+
+
+def test_student_import_looks_up_existing_ids_once_per_chunk(monkeypatch):
+    from app.api.routes import imports
+
+    db = imports.db
+    db.save_students([StudentProfile(**_student("imp-known", "Before"), drift_score=40)])
+    lookups = []
+    real = db.get_students
+    monkeypatch.setattr(db, "get_students", lambda ids: lookups.append(list(ids)) or real(lookups[-1]))
+    monkeypatch.setattr(db, "get_student", lambda sid: pytest.fail("per-line lookup"))
+
+    body = "\n".join(json.dumps(line) for line in [
+        _student("imp-known", "After"),
+        _student("imp-new", "New", year=1),
+        _student("imp-new", "New again", year=3),  # repeated id in the same chunk
+        _student(None, "No id"),
+    ])
+    response = TestClient(app).post("/api/import/students", content=body)
+    assert response.json()["imported"] == 4
+    assert lookups == [["imp-known", "imp-new", "imp-new"]]
+
+    monkeypatch.undo()
+    known, new = db.get_student("imp-known"), db.get_student("imp-new")
+    assert (known.name, known.drift_score) == ("After", 40)
+    assert (new.name, new.year) == ("New again", 3)
+    assert db.get_attractor("imp-new") is not None
+
+
+def test_get_students_skips_unknown_ids(tmp_path):
+    from app.db.sqlite import SQLiteDB
+
+    repo = SQLiteDB(str(tmp_path / "karm.db"))
+    try:
+        some, _ = synthetic_students(2)
+        repo.save_students(some)
+        found = repo.get_students([some[0].id, "nobody", some[1].id, some[0].id])
+        assert found == {s.id: s for s in some}
+    finally:
+        repo.close()
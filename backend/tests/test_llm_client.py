@@ -0,0 +1,154 @@
+"""OpenRouterClient failover and hedging against the in-process OpenRouter stub."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.llm_client import OpenRouterClient, ThinkFilter, UpstreamError
+from app.dev import openrouter_stub
+
+
+@pytest.fixture(autouse=True)
+def stub(monkeypatch):
+    monkeypatch.setattr(openrouter_stub, "LATENCY_MS", 1.0)
+    monkeypatch.setattr(openrouter_stub, "TOKEN_MS", 0.0)
+    openrouter_stub.overrides.clear()
+    openrouter_stub.calls.clear()
+    yield openrouter_stub
+    openrouter_stub.overrides.clear()
+    openrouter_stub.calls.clear()
+
+
+def _client(*models: str) -> OpenRouterClient:
+    return OpenRouterClient(
+        "stub-key", "http://openrouter-stub/api/v1/chat/completions", list(models),
+        transport=httpx.ASGITransport(app=openrouter_stub.app)
+    )
+
+
+def _payload(model: str) -> dict:
+    return {"model": model, "messages": [{"role": "user", "content": "hi"}]}
+
+
+def _run(client: OpenRouterClient, call):
+    async def main():
+        try:
+            return await call(client)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+def test_fails_over_to_the_next_model(stub):
+    client, errors = _client("a-fail", "b-ok"), []
+    model, content = _run(client, lambda c: c.complete(_payload, errors.append))
+    assert model == "b-ok" and content.startswith("Stub answer from b-ok")
+    assert [(e.model, e.status_code) for e in errors] == [("a-fail", 500)]
+    assert client.breakers["a-fail"].failures == 1
+
+
+def test_rate_limit_opens_the_breaker_and_skips_the_model(stub):
+    client = _client("a-ratelimit", "b-ok")
+
+    async def twice(c):
+        first = await c.complete(_payload)
+        second = await c.complete(_payload)
+        return first, second
+
+    first, second = _run(client, twice)
+    assert first[0] == second[0] == "b-ok"
+    assert client.breakers["a-ratelimit"].state == "open"
+    assert stub.calls["a-ratelimit"] == 1
+
+
+def test_every_model_failing_returns_none(stub):
+    errors = []
+    assert _run(_client("a-fail", "b-ratelimit"), lambda c: c.complete(_payload, errors.append)) is None
+    assert sorted(e.status_code for e in errors) == [429, 500]
+
+
+def test_hedges_a_slow_model_and_cancels_it(stub):
+    client = _client("a-slow", "b-ok")
+    client.DEFAULT_HEDGE_DELAY = 0.05
+    started = time.perf_counter()
+    model, _ = _run(client, lambda c: c.complete(_payload))
+    assert model == "b-ok"
+    assert time.perf_counter() - started < openrouter_stub.SLOW_SECONDS / 2
+    # The cancelled loser counts as neither success nor failure
+    assert client.breakers["a-slow"].failures == 0 and client.breakers["a-slow"].state == "closed"
+
+
+def test_hedge_losers_finish_unwinding_before_the_winner_returns(stub):
+    client = _client("a-slow", "b-ok")
+    client.DEFAULT_HEDGE_DELAY = 0.01
+    unwound = []
+
+    async def start(model):
+        if model == "b-ok":
+            return model
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0.01)  # e.g. closing the upstream response
+            unwound.append(model)
+
+    async def hedged(c):
+        winner = await c._hedged(start, c.latency)
+        return winner, list(unwound)
+
+    assert _run(client, hedged) == ("b-ok", ["a-slow"])
+
+
+def test_stream_fails_over_before_the_first_token(stub):
+    async def collect(c):
+        stream = await c.stream(_payload)
+        try:
+            return stream.model, "".join([delta async for delta in stream])
+        finally:
+            await stream.aclose()
+
+    model, text = _run(_client("a-fail", "b-ok"), collect)
+    assert model == "b-ok" and text.startswith("Stub answer from b-ok")
+
+
+def test_stream_dying_mid_way_raises_and_counts_as_a_failure(stub):
+    client = _client("a-die")
+
+    async def collect(c):
+        stream = await c.stream(_payload)
+        try:
+            return "".join([delta async for delta in stream])
+        finally:
+            await stream.aclose()
+
+    with pytest.raises(UpstreamError) as raised:
+        _run(client, collect)
+    assert raised.value.status_code == 502
+    assert client.breakers["a-die"].failures == 1
+
+
+def _streamed(chunks) -> str:
+    think = ThinkFilter()
+    return "".join(think.feed(c) for c in chunks) + think.flush()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("<think>plan</think>Answer", "Answer"),
+    ("Before <think>a</think>mid<think>b</think> after", "Before mid after"),
+    ("x < y and <th is not a tag", "x < y and <th is not a tag"),
+    ("ends with <", "ends with <"),
+    ("ends with </think", "ends with </think"),
+])
+def test_think_filter_handles_tags_split_at_every_boundary(text, expected):
+    for i in range(len(text) + 1):
+        for j in range(i, len(text) + 1):
+            assert _streamed([text[:i], text[i:j], text[j:]]) == expected, (i, j)
+    assert _streamed(list(text)) == expected
+    assert ThinkFilter.strip(text) == expected
+
+
+def test_unclosed_think_drops_the_rest_when_streamed_and_not():
+    text = "Answer first <think>cut off mid-reasoning"
+    assert _streamed(["Answer first <thi", "nk>cut off", " mid-reasoning"]) == "Answer first "
+    assert ThinkFilter.strip(text) == "Answer first "
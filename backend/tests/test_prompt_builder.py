@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from app.core.prompt_builder import PromptBuilder
+from app.db.database import InMemoryDB
+from app.models.event import CampusEvent, DiscoverySlot
+
+NOW = datetime(2030, 5, 1, 10, 20)
+
+
+def _repo() -> InMemoryDB:
+    repo = InMemoryDB()
+    repo.save_events([
+        CampusEvent(id=f"evt-{name}", title=name, department="Music", type="talk", location="Hall",
+                    start_time=NOW + offset, duration_minutes=30)
+        for name, offset in (("Past", -timedelta(days=1)), ("Soon", timedelta(minutes=20)))
+    ])
+    repo.save_slots([DiscoverySlot(
+        id="ds-soon", organizer_id="club", organizer_type="club", name="Open studio", location="Room 2",
+        description="Drop in", available_times=[NOW - timedelta(days=1), NOW + timedelta(hours=2)],
+    )])
+    return repo
+
+
+def test_campus_prompt_lists_only_upcoming_events_and_active_slots():
+    prompt = PromptBuilder().campus_prompt(_repo(), NOW)
+    assert "Soon —" in prompt and "Past —" not in prompt
+    assert "Open studio" in prompt and "Portfolio Reviews" not in prompt  # seed slot is in 2026
+    assert "Apr 30" not in prompt  # the slot's past time is not offered
+
+
+def test_campus_prompt_is_rerendered_each_hour():
+    repo, builder = _repo(), PromptBuilder()
+    builder.campus_prompt(repo, NOW)
+    builder.campus_prompt(repo, NOW + timedelta(minutes=30))
+    assert builder.renders == 1
+    later = builder.campus_prompt(repo, NOW + timedelta(hours=1))
+    assert builder.renders == 2
+    assert "Soon —" not in later
@@ -0,0 +1,57 @@
+import pytest
+
+from app.core import response_cache
+from app.core.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("k", 1, "answer")
+    clock[0] += 59.9
+    assert cache.get("k", 1) == "answer"
+    clock[0] += 0.1
+    assert cache.get("k", 1) is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1, "A")
+    cache.put("b", 1, "B")
+    assert cache.get("a", 1) == "A"  # "b" is now the oldest use
+    cache.put("c", 1, "C")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == "A" and cache.get("c", 1) == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_total_bytes_stay_under_the_bound(clock):
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 1, "aaaa")
+    cache.put("b", 1, "bbbb")
+    cache.put("c", 1, "cccc")  # 12 bytes: "a" goes
+    assert cache.get("a", 1) is None
+    assert cache.stats()["bytes"] == 8
+    cache.put("big", 1, "x" * 11)  # larger than the whole cache: not stored, nothing evicted
+    assert cache.get("big", 1) is None and cache.stats()["entries"] == 2
+    cache.put("b", 1, "é" * 3)  # replacing counts the new size in bytes, not characters
+    assert cache.stats()["bytes"] == 10
+
+
+def test_a_newer_campus_version_drops_everything(clock):
+    cache = ResponseCache()
+    cache.put("a", 1, "A")
+    cache.put("b", 1, "B")
+    assert cache.get("a", 2) is None
+    assert cache.get("b", 2) is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["entries"] == 0 and stats["campus_version"] == 2
+    cache.put("a", 2, "A2")
+    assert cache.get("a", 2) == "A2"
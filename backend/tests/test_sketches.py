@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import admin, drift
+from app.core.sketches import KLLSketch, LiveMetrics
+from app.main import app
+
+client = TestClient(app)
+
+QS = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def _rank_errors(sketch: KLLSketch, exact: np.ndarray):
+    """|rank(estimate)/n − q| for each of QS, against the sorted data."""
+    estimates = sketch.quantiles(QS)
+    return [abs(np.searchsorted(exact, v, side="right") / len(exact) - q) for q, v in zip(QS, estimates)]
+
+
+@pytest.mark.parametrize("draw", [
+    lambda rng, n: rng.uniform(0, 100, n),
+    lambda rng, n: rng.normal(50, 15, n),
+    lambda rng, n: rng.exponential(30, n),
+])
+def test_quantiles_stay_within_rank_error(draw):
+    values = draw(np.random.default_rng(7), 100_000)
+    sketch = KLLSketch(seed=1)
+    for v in values:
+        sketch.update(float(v))
+    assert sketch.n == len(values)
+    assert max(_rank_errors(sketch, np.sort(values))) < 0.02
+
+
+def test_merged_shards_match_the_exact_quantiles_of_the_union():
+    rng = np.random.default_rng(11)
+    # Shards with different distributions, so a bad merge shows up as skew
+    shards = [rng.normal(mu, 5, 20_000) for mu in (10, 40, 70, 100)]
+    merged = KLLSketch(seed=0)
+    for i, shard in enumerate(shards):
+        sketch = KLLSketch(seed=i + 1)
+        for v in shard:
+            sketch.update(float(v))
+        merged.merge(KLLSketch.from_dict(sketch.to_dict()))
+
+    union = np.sort(np.concatenate(shards))
+    assert merged.n == len(union)
+    assert merged.min == union[0] and merged.max == union[-1]
+    assert max(_rank_errors(merged, union)) < 0.02
+
+
+@pytest.mark.parametrize("values", [(2.9, 25.1), (23.6, 64.8), (5.0, 5.0)])
+def test_histogram_counts_the_max(values):
+    # lo + 10·step rounds below the max for (23.6, 64.8)
+    metrics = LiveMetrics()
+    for v in values:
+        metrics.observe("drift_score", v)
+    summary = metrics.summary()["drift_score"]
+    assert summary["count"] == 2
+    assert sum(summary["histogram"]["counts"]) == 2
+
+
+def test_merge_route_is_admin_only(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    assert client.post("/api/drift/stats/live/merge", json=[]).status_code == 404
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    assert client.post("/api/drift/stats/live/merge", json=[], headers={"X-Admin-Token": "guess"}).status_code == 403
+
+
+def test_merge_route_caps_the_number_of_states(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(drift, "MAX_MERGE_STATES", 2)
+    headers = {"X-Admin-Token": "secret"}
+    state = LiveMetrics().export()
+    assert client.post("/api/drift/stats/live/merge", json=[state] * 2, headers=headers).status_code == 200
+    assert client.post("/api/drift/stats/live/merge", json=[state] * 3, headers=headers).status_code == 413
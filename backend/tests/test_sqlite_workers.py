@@ -0,0 +1,93 @@
+"""Two SQLiteDB instances on one file stand in for two worker processes."""
+from datetime import datetime
+
+import pytest
+
+from app.core.feature_store import FeatureStore
+from app.db.sqlite import SQLiteDB
+from app.models.event import CampusEvent, DiscoverySlot
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "karm.db")
+    a, b = SQLiteDB(path), SQLiteDB(path)
+    yield a, b
+    a.close()
+    b.close()
+
+
+def _event(event_id: str, title: str = "Talk") -> CampusEvent:
+    return CampusEvent(
+        id=event_id, title=title, department="Physics", type="talk",
+        location="Hall", start_time=datetime(2030, 1, 1, 12), duration_minutes=60,
+    )
+
+
+def test_event_and_slot_writes_reach_the_other_worker(workers):
+    a, b = workers
+    store = b.event_store
+    slots = b.slot_index
+    version, events_version = b.campus_version, store.version
+
+    a.save_events([_event("evt-w1")])
+    a.save_slots([DiscoverySlot(
+        id="ds-w1", organizer_id="club", organizer_type="club", name="Slot",
+        location="Room 1", description="Drop in", available_times=[datetime(2030, 1, 1, 9)],
+    )])
+
+    assert b.campus_version > version
+    assert b.event_store is store and store.version > events_version
+    assert store.get("evt-w1").title == "Talk"
+    assert "ds-w1" in {s.id for s in slots.active(datetime(2029, 12, 31))}
+
+    a.save_events([_event("evt-w1", "Renamed")])
+    assert b.event_store.get("evt-w1").title == "Renamed"
+
+
+def test_student_writes_move_revisions_and_the_change_log(workers):
+    a, b = workers
+    student = a.get_student("stu-001")
+    seq, revision = b.change_seq, b.student_revision("stu-001")
+
+    a.save_student(student.model_copy(update={"year": 3}))
+
+    assert b.student_revision("stu-001") > revision
+    changed, _ = b.students_changed_since(seq)
+    assert changed == {"stu-001"}
+
+
+def test_own_writes_are_not_replayed(workers):
+    a, _ = workers
+    store = a.event_store
+    a.save_events([_event("evt-own")])
+    version = store.version
+    a._refresh()
+    assert store.version == version
+
+
+def test_a_worker_behind_the_trimmed_log_reloads(workers, monkeypatch):
+    a, b = workers
+    store = b.event_store
+    seq = b.change_seq
+    monkeypatch.setattr(SQLiteDB, "CHANGE_TABLE_SIZE", 1)
+    a.save_events([_event("evt-t1")])
+    a.save_events([_event("evt-t2")])
+
+    assert b.event_store.get("evt-t1") is not None and store.get("evt-t2") is not None
+    assert b.students_changed_since(seq) is None
+
+
+def test_feature_store_sync_invalidates_other_workers_writes(workers):
+    a, b = workers
+    features = FeatureStore()
+    assert features.sync(b) is None
+    student = b.get_student("stu-001")
+    before = features.get(student)
+
+    a.save_student(student.model_copy(update={"skills": ["Welding"]}))
+
+    assert features.sync(b) == {"stu-001"}
+    after = features.get(b.get_student("stu-001"))
+    assert after.revision > before.revision
+    assert after.skills == {features.skills.lookup("welding")}
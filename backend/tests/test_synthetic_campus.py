@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+from app.dev import synthetic_campus
+from app.dev.synthetic_campus import CampusSpec, SyntheticCampus
+
+
+def _flatten(campus: SyntheticCampus, size: int):
+    students, attractors, drifts = [], [], []
+    for batch in campus.batches(size):
+        assert len(batch.students) <= size
+        assert {d.student_id for d in batch.drifts} <= {s.id for s in batch.students}
+        students += [s.model_dump() for s in batch.students]
+        attractors += [a.model_dump() for a in batch.attractors]
+        drifts += [d.model_dump() for d in batch.drifts]
+    return students, attractors, drifts
+
+
+def test_batch_size_does_not_change_the_campus():
+    spec = CampusSpec(students=2500, drifts=8000, seed=5, day=date(2030, 1, 1))
+    reference = _flatten(SyntheticCampus(spec), 5000)
+    assert len(reference[0]) == 2500 and len(reference[2]) == 8000
+    for size in (7, 999, 1000, 1300):
+        assert _flatten(SyntheticCampus(spec), size) == reference
+
+
+def test_cli_rejects_a_non_positive_batch_size():
+    with pytest.raises(SystemExit):
+        synthetic_campus.main(["--batch-size", "0"])